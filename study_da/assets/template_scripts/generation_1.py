@@ -40,6 +40,10 @@ def build_collider(config_mad):
     # Build object for generating collider from mad
     mc = MadCollider(config_mad)
 
+    # Reuse the collider built with the same configuration, if cached
+    if mc.retrieve_collider_from_cache():
+        return
+
     # Build mad model
     mad_b1b2, mad_b4 = mc.prepare_mad_collider()
 
@@ -19,7 +19,7 @@ import numpy as np
 import pandas as pd
 
 # Import user-defined modules
-from study_da.generate import XsuiteCollider, XsuiteTracking
+from study_da.generate import ParticlesDistribution, XsuiteCollider, XsuiteTracking
 from study_da.utils import (
     load_dic_from_path,
     set_item_in_dic,
@@ -119,13 +119,18 @@ def track_particles(full_configuration, collider, fingerprint):
     n_emitt_y = full_configuration["config_collider"]["config_beambeam"]["nemitt_y"]
     xst = XsuiteTracking(full_configuration["config_simulation"], n_emitt_x, n_emitt_y)
 
-    # Prepare particle distribution
-    particles, particle_id, l_amplitude, l_angle = xst.prepare_particle_distribution_for_tracking(
-        collider
-    )
+    # Track, refining the distribution around the DA boundary in adaptive mode
+    if full_configuration["config_particles"].get("distribution_mode", "grid") == "adaptive":
+        distr = ParticlesDistribution(full_configuration["config_particles"])
+        particles_dict, particle_id, l_amplitude, l_angle = xst.track_adaptive(collider, distr)
+    else:
+        # Prepare particle distribution
+        particles, particle_id, l_amplitude, l_angle = (
+            xst.prepare_particle_distribution_for_tracking(collider)
+        )
 
-    # Track
-    particles_dict = xst.track(collider, particles)
+        # Track
+        particles_dict = xst.track(collider, particles)
 
     # Convert particles to dataframe
     particles_df = pd.DataFrame(particles_dict)
@@ -146,12 +151,16 @@ def track_particles(full_configuration, collider, fingerprint):
     particles_df.attrs["fingerprint"] = fingerprint
     particles_df.attrs["configuration"] = full_configuration
     particles_df.attrs["date"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    particles_df.attrs["n_turns_tracked"] = xst.n_turns_tracked
 
     # Save output
     particles_df.to_parquet(
         full_configuration["config_simulation"]["path_distribution_file_output"]
     )
 
+    # Remove the tracking checkpoint, now that the output is saved
+    xst.remove_checkpoint()
+
 
 def clean():
     # Remote the correction folder, and potential C files remaining
@@ -18,16 +18,23 @@ import itertools
 import logging
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Optional
 
 # Import third-party modules
 import numpy as np
 import ruamel.yaml as yaml
 from black import FileMode, format_str
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 
 # Import user-defined modules
-from study_da.utils import clean_dic, load_dic_from_path, nested_set
+from study_da.utils import (
+    clean_dic,
+    load_dic_from_path,
+    nested_get,
+    nested_set,
+    write_dic_to_path,
+)
 
 from .parameter_space import (
     convert_for_subvariables,
@@ -35,6 +42,56 @@ from .parameter_space import (
     list_values_path,
     logspace,
 )
+from .tree_writer import StreamingTreeWriter
+
+# ==================================================================================================
+# --- Template cache
+# ==================================================================================================
+
+# Compiled templates, keyed by template path and by whether the template has been formatted with
+# black, along with the modification time of the template when it was compiled. Defined at module
+# level so that each worker of a pool has its own cache.
+_dic_template_cache: dict[tuple[str, bool], tuple[float, Template]] = {}
+_dic_template_cache_stats: dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def _get_template(template_path: str, format_template: bool = False) -> Template:
+    """
+    Returns the compiled template from the cache, compiling it if it's not in the cache or if the
+    template file has been modified since it was compiled.
+
+    Args:
+        template_path (str): The path to the template file.
+        format_template (bool, optional): Whether to format the template with black before
+            compiling it. Defaults to False.
+
+    Returns:
+        Template: The compiled template.
+    """
+    template_path = os.path.abspath(template_path)
+    mtime = os.path.getmtime(template_path)
+    key = (template_path, format_template)
+    if key in _dic_template_cache and _dic_template_cache[key][0] == mtime:
+        _dic_template_cache_stats["hits"] += 1
+        return _dic_template_cache[key][1]
+
+    # Compile the template
+    _dic_template_cache_stats["misses"] += 1
+    environment = Environment(
+        loader=FileSystemLoader(os.path.dirname(template_path)),
+        variable_start_string="{}  ###---",
+        variable_end_string="---###",
+        keep_trailing_newline=True,
+    )
+    if format_template:
+        # The placeholders are valid python (comments and strings), so black leaves them untouched
+        with open(template_path, "r", encoding="utf-8") as fid:
+            template_str = format_str(fid.read(), mode=FileMode())
+        template = environment.from_string(template_str)
+    else:
+        template = environment.get_template(os.path.basename(template_path))
+    _dic_template_cache[key] = (mtime, template)
+    return template
 
 
 # ==================================================================================================
@@ -49,12 +106,22 @@ class GenerateScan:
         config (dict): The configuration dictionary.
         ryaml (yaml.YAML): The YAML parser.
         dic_common_parameters (dict): Dictionary of common parameters across generations.
+        n_workers (int): Number of processes used to render and write the generation files.
+        formatting_strategy (str): How the generation files are formatted ("black", "template"
+            or "none").
+        l_render_write_tasks (list): Render and write tasks waiting to be processed in parallel.
+        template_cache_hits (int): Number of template cache hits during the last study creation.
+        set_existing_files (set[str]): Generation files of the existing tree, which are not
+            rendered again when updating a study incrementally.
+        dic_incremental_report (dict[str, list[str]]): The jobs added, removed and unchanged
+            during the last incremental update of the study.
 
     Methods:
         __init__(): Initializes the generation scan with a configuration file or dictionary.
         render(): Renders the study file using a template.
         write(): Writes the study file to disk.
         generate_render_write(): Generates, renders, and writes the study file.
+        render_write_in_parallel(): Renders and writes the pending study files with a process pool.
         get_dic_parametric_scans(): Retrieves dictionaries of parametric scan values.
         parse_parameter_space(): Parses the parameter space for a given parameter.
         browse_and_collect_parameter_space(): Browses and collects the parameter space for a given
@@ -62,11 +129,14 @@ class GenerateScan:
         postprocess_parameter_lists(): Postprocesses the parameter lists.
         create_scans(): Creates study files for parametric scans.
         complete_tree(): Completes the tree structure of the study dictionary.
-        write_tree(): Writes the study tree structure to a YAML file.
+        get_parameters_current_gen(): Gets the external parameter lists for a given generation.
+        browse_and_stream_study(): Creates the study depth first, writing the tree on the fly.
+        merge_with_existing_tree(): Merges the tree of the study with the tree of an existing study.
+        write_tree(): Writes the study tree structure to a YAML (or JSON lines) file.
         create_study_for_current_gen(): Creates study files for the current generation.
         create_study(): Creates study files for the entire study.
-        eval_conditions(): Evaluates the conditions to filter out some parameter values.
-        filter_for_concomitant_parameters(): Filters the conditions for concomitant parameters.
+        get_indices_to_keep(): Returns the indices of the parameter values satisfying the
+            conditions, without building the dense cartesian product.
     """
 
     def __init__(
@@ -105,13 +175,28 @@ class GenerateScan:
         # Path to the tree file
         self.path_tree = self.config["name"] + "/" + "tree.yaml"
 
+        # Parallel rendering (tasks are only deferred if more than one worker is requested)
+        self.n_workers: int = 1
+
+        # Formatting of the generation files
+        self.formatting_strategy: str = "black"
+        self.l_render_write_tasks: list[tuple[str, dict[str, Any], bool]] = []
+
+        # Number of times a compiled template was reused during the last study creation
+        self.template_cache_hits: int = 0
+
+        # Incremental update of an existing study
+        self.set_existing_files: set[str] = set()
+        self.dic_incremental_report: dict[str, list[str]] = {}
+
+    @staticmethod
     def render(
-        self,
         str_parameters: str,
         template_path: str,
         path_main_configuration: str,
         study_path: Optional[str] = None,
         str_dependencies: Optional[dict[str, str]] = None,
+        format_template: bool = False,
     ) -> str:
         """
         Renders the study file using a template.
@@ -122,6 +207,8 @@ class GenerateScan:
             path_main_configuration (str): The path to the main configuration file.
             study_path (str, optional): The path to the root of the study. Defaults to None.
             dependencies (dict[str, str], optional): The dictionary of dependencies. Defaults to {}.
+            format_template (bool, optional): Whether to render from the template formatted with
+                black. Defaults to False.
 
         Returns:
             str: The rendered study file.
@@ -133,15 +220,8 @@ class GenerateScan:
         if study_path is None:
             study_path = ""
 
-        # Generate generations from template
-        directory_path = os.path.dirname(template_path)
-        template_name = os.path.basename(template_path)
-        environment = Environment(
-            loader=FileSystemLoader(directory_path),
-            variable_start_string="{}  ###---",
-            variable_end_string="---###",
-        )
-        template = environment.get_template(template_name)
+        # Generate generations from template (compiled only once per template)
+        template = _get_template(template_path, format_template=format_template)
 
         # Better not to render the dependencies path this way, as it becomes too cumbersome to
         # handle the paths when using clusters
@@ -153,7 +233,8 @@ class GenerateScan:
             # dependencies = str_dependencies,
         )
 
-    def write(self, study_str: str, file_path: str, format_with_black: bool = True):
+    @staticmethod
+    def write(study_str: str, file_path: str, format_with_black: bool = True):
         """
         Writes the study file to disk.
 
@@ -214,6 +295,13 @@ class GenerateScan:
                 str_parameters += f"'{key}' : {value}, "
         str_parameters += "}"
 
+        # Format the (small) dictionary of parameters alone, since black won't be run on the file.
+        # The trailing comma makes black write one parameter per line, whatever the context.
+        if self.formatting_strategy == "template":
+            str_parameters = (
+                format_str(f"_ = {str_parameters}", mode=FileMode()).removeprefix("_ = ").rstrip()
+            )
+
         # Adapt the dict of dependencies to the current generation
         dic_dependencies = self.config["dependencies"] if "dependencies" in self.config else {}
 
@@ -245,18 +333,72 @@ class GenerateScan:
             str_dependencies += f"'{key}' : '{value}', "
         str_dependencies += "}"
 
-        # Render and write the study file
-        study_str = self.render(
-            str_parameters,
-            template_path=template_path,
-            path_main_configuration=path_main_configuration,
-            study_path=os.path.abspath(self.config["name"]),
-            str_dependencies=str_dependencies,
-        )
+        # Don't render again the files of an existing study being updated
+        if file_path_gen in self.set_existing_files:
+            logging.info(f'Generation "{file_path_gen}" already exists. Skipping.')
+            return [directory_path_gen]
+
+        # Render and write the study file, or defer it to the pool of workers
+        dic_render = {
+            "str_parameters": str_parameters,
+            "template_path": template_path,
+            "path_main_configuration": path_main_configuration,
+            "study_path": os.path.abspath(self.config["name"]),
+            "str_dependencies": str_dependencies,
+            "format_template": self.formatting_strategy == "template",
+        }
+        task = (file_path_gen, dic_render, self.formatting_strategy == "black")
+        if self.n_workers > 1:
+            self.l_render_write_tasks.append(task)
+        else:
+            self._render_and_write(task)
 
-        self.write(study_str, file_path_gen)
         return [directory_path_gen]
 
+    @staticmethod
+    def _render_and_write(task: tuple[str, dict[str, Any], bool]) -> int:
+        """
+        Renders and writes a single study file. Defined as a static method so that it can be sent
+        to the workers of a process pool.
+
+        Args:
+            task (tuple[str, dict[str, Any], bool]): The path of the study file, the keyword
+                arguments of the render method, and whether to format the file with black.
+
+        Returns:
+            int: The number of template cache hits during the rendering.
+        """
+        file_path_gen, dic_render, format_with_black = task
+        hits_before = _dic_template_cache_stats["hits"]
+        study_str = GenerateScan.render(**dic_render)
+        GenerateScan.write(study_str, file_path_gen, format_with_black=format_with_black)
+        return _dic_template_cache_stats["hits"] - hits_before
+
+    def render_write_in_parallel(self) -> None:
+        """
+        Renders and writes all the pending study files with a pool of processes. The tasks are
+        created in order while browsing the generations, so the study paths (and therefore the
+        tree) do not depend on the order in which the workers process them.
+        """
+        if not self.l_render_write_tasks:
+            return
+
+        logging.info(
+            f"Rendering and writing {len(self.l_render_write_tasks)} study files with "
+            f"{self.n_workers} workers"
+        )
+        # Send the tasks by chunks to limit the inter-process communication overhead
+        chunksize = max(1, len(self.l_render_write_tasks) // (4 * self.n_workers))
+        with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+            # Consume the iterator to raise potential errors from the workers, and gather the
+            # template cache hits of the workers
+            for n_hits in executor.map(
+                self._render_and_write, self.l_render_write_tasks, chunksize=chunksize
+            ):
+                _dic_template_cache_stats["hits"] += n_hits
+
+        self.l_render_write_tasks = []
+
     def get_dic_parametric_scans(
         self, generation: str
     ) -> tuple[dict[str, Any], dict[str, Any], np.ndarray | None]:
@@ -269,7 +411,8 @@ class GenerateScan:
         Returns:
             tuple[dict[str, Any], dict[str, Any], np.ndarray|None]: The dictionaries of parametric
                 scan values, another dictionnary with better naming for the tree creation, and an
-                array of conditions to filter out some parameter values.
+                array with the indices (in the cartesian product of the parameters) of the
+                parameter values satisfying the conditions.
         """
 
         if generation == "base":
@@ -290,8 +433,7 @@ class GenerateScan:
         ):
             dic_parameter_lists = {"": [generation]}
             dic_parameter_lists_for_naming = {"": [generation]}
-            array_conditions = None
-            ll_concomitant_parameters = []
+            array_idx_to_keep = None
         else:
             # Browse and collect the parameter space for the generation
             (
@@ -302,18 +444,10 @@ class GenerateScan:
                 l_conditions,
             ) = self.browse_and_collect_parameter_space(generation)
 
-            # Get the dimension corresponding to each parameter
-            dic_dimension_indices = {
-                parameter: idx for idx, parameter in enumerate(dic_parameter_lists)
-            }
-
-            # Generate array of conditions to filter out some of the values later
-            # Is an array of True values if no conditions are present
-            array_conditions = self.eval_conditions(l_conditions, dic_parameter_lists)
-
-            # Filter for concomitant parameters
-            array_conditions = self.filter_for_concomitant_parameters(
-                array_conditions, ll_concomitant_parameters, dic_dimension_indices
+            # Get the indices of the parameter values satisfying the conditions and the
+            # concomitant parameters, without building the dense cartesian product
+            array_idx_to_keep = self.get_indices_to_keep(
+                l_conditions, dic_parameter_lists, ll_concomitant_parameters
             )
 
             # Postprocess the parameter lists and update the dictionaries
@@ -324,7 +458,7 @@ class GenerateScan:
         return (
             dic_parameter_lists,
             dic_parameter_lists_for_naming,
-            array_conditions,
+            array_idx_to_keep,
         )
 
     def parse_parameter_space(
@@ -511,14 +645,14 @@ class GenerateScan:
         """
         if dic_parameter_lists is None:
             # Get dictionnary of parametric values being scanned
-            dic_parameter_lists, dic_parameter_lists_for_naming, array_conditions = (
+            dic_parameter_lists, dic_parameter_lists_for_naming, array_idx_to_keep = (
                 self.get_dic_parametric_scans(generation)
             )
             apply_cartesian_product = True
         else:
             if dic_parameter_lists_for_naming is None:
                 dic_parameter_lists_for_naming = copy.deepcopy(dic_parameter_lists)
-            array_conditions = None
+            array_idx_to_keep = None
             apply_cartesian_product = False
 
         # Generate render write for the parameters parameters
@@ -527,29 +661,37 @@ class GenerateScan:
             logging.info(
                 f"Now generation cartesian product of all parameters for generation: {generation}"
             )
-            array_param_values = itertools.product(*dic_parameter_lists.values())
-            array_param_values_for_naming = itertools.product(
-                *dic_parameter_lists_for_naming.values()
-            )
-            array_idx = itertools.product(*[range(len(x)) for x in dic_parameter_lists.values()])
+            if array_idx_to_keep is None:
+                array_param_values = itertools.product(*dic_parameter_lists.values())
+                array_param_values_for_naming = itertools.product(
+                    *dic_parameter_lists_for_naming.values()
+                )
+            else:
+                # Only browse the parameter values that have been kept
+                l_parameter_lists = list(dic_parameter_lists.values())
+                l_parameter_lists_for_naming = list(dic_parameter_lists_for_naming.values())
+                array_param_values = (
+                    [parameter_list[idx] for parameter_list, idx in zip(l_parameter_lists, l_idx)]
+                    for l_idx in array_idx_to_keep
+                )
+                array_param_values_for_naming = (
+                    [
+                        parameter_list[idx]
+                        for parameter_list, idx in zip(l_parameter_lists_for_naming, l_idx)
+                    ]
+                    for l_idx in array_idx_to_keep
+                )
         else:
             logging.info(f"Now generation parameters for generation: {generation}")
             array_param_values = [list(x) for x in zip(*dic_parameter_lists.values())]
             array_param_values_for_naming = [
                 list(x) for x in zip(*dic_parameter_lists_for_naming.values())
             ]
-            array_idx = range(len(array_param_values))
 
         # Loop over the parameters
-        to_disk_len = np.sum(array_conditions) if array_conditions is not None else 1
+        to_disk_len = len(array_idx_to_keep) if array_idx_to_keep is not None else 1
         to_disk_idx = 0
-        for idx, (l_values, l_values_for_naming, l_idx) in enumerate(
-            zip(array_param_values, array_param_values_for_naming, array_idx)
-        ):
-            # Check the idx to keep if conditions are present
-            if array_conditions is not None and not array_conditions[l_idx]:
-                continue
-
+        for l_values, l_values_for_naming in zip(array_param_values, array_param_values_for_naming):
             # Create the path for the study
             dic_mutated_parameters = dict(zip(dic_parameter_lists.keys(), l_values))
             dic_mutated_parameters_for_naming = dict(
@@ -627,13 +769,102 @@ class GenerateScan:
 
         return dictionary_tree
 
+    @staticmethod
+    def get_jobs_in_tree(
+        dictionary_tree: dict, l_keys: Optional[list[str]] = None
+    ) -> dict[str, list[str]]:
+        """
+        Gets all the jobs (generation files) of a study tree.
+
+        Args:
+            dictionary_tree (dict): The dictionary representing the study tree structure.
+            l_keys (Optional[list[str]]): The keys leading to the current level of the tree.
+                Defaults to None.
+
+        Returns:
+            dict[str, list[str]]: A dictionary mapping the generation files to the keys of the
+                corresponding job in the tree.
+        """
+        if l_keys is None:
+            l_keys = []
+
+        dic_jobs = {}
+        for key, value in dictionary_tree.items():
+            if isinstance(value, dict):
+                dic_jobs |= GenerateScan.get_jobs_in_tree(value, l_keys + [key])
+            elif key == "file":
+                dic_jobs[value] = l_keys
+        return dic_jobs
+
+    def merge_with_existing_tree(self, dictionary_tree: dict, dic_existing_tree: dict) -> dict:
+        """
+        Merges the tree of the study with the tree of an existing study. The jobs present in both
+        trees keep their existing state (status, configuration, etc.), the new jobs are added, and
+        the jobs that are not part of the study anymore are removed from the tree (but not from the
+        disk).
+
+        Args:
+            dictionary_tree (dict): The dictionary representing the study tree structure.
+            dic_existing_tree (dict): The dictionary representing the existing study tree.
+
+        Returns:
+            dict: The merged dictionary representing the study tree structure.
+        """
+        dic_jobs = self.get_jobs_in_tree(dictionary_tree)
+        dic_existing_jobs = self.get_jobs_in_tree(dic_existing_tree)
+
+        # Keep the state of the jobs that were already in the study
+        for job, l_keys in dic_jobs.items():
+            if job in dic_existing_jobs:
+                nested_set(
+                    dictionary_tree, l_keys, nested_get(dic_existing_tree, dic_existing_jobs[job])
+                )
+
+        # Keep the global properties of the study (python environment, status, etc.)
+        for key, value in dic_existing_tree.items():
+            if not isinstance(value, dict):
+                dictionary_tree[key] = value
+
+        # Report the changes
+        self.dic_incremental_report = {
+            "added": [job for job in dic_jobs if job not in dic_existing_jobs],
+            "removed": [job for job in dic_existing_jobs if job not in dic_jobs],
+            "unchanged": [job for job in dic_jobs if job in dic_existing_jobs],
+        }
+        logging.info(
+            f"Study updated: {len(self.dic_incremental_report['added'])} jobs added, "
+            f"{len(self.dic_incremental_report['removed'])} jobs removed, "
+            f"{len(self.dic_incremental_report['unchanged'])} jobs unchanged."
+        )
+        for job in self.dic_incremental_report["added"]:
+            logging.info(f"Job added: {job}")
+        for job in self.dic_incremental_report["removed"]:
+            logging.warning(f"Job removed from the tree (folder is kept on disk): {job}")
+
+        # New jobs must be configured before being submitted
+        if self.dic_incremental_report["added"] and dictionary_tree.get("configured", False):
+            logging.warning(
+                "New jobs have been added to a configured study. The jobs must be configured "
+                "again (already configured jobs can be skipped)."
+            )
+            dictionary_tree["configured"] = False
+            dictionary_tree["status"] = "to_finish"
+
+        return dictionary_tree
+
     def write_tree(self, dictionary_tree: dict):
         """
-        Writes the study tree structure to a YAML file.
+        Writes the study tree structure to a YAML file, or to a JSON lines file if the tree path
+        has a .jsonl extension.
 
         Args:
             dictionary_tree (dict): The dictionary representing the study tree structure.
         """
+        if self.path_tree.endswith(".jsonl"):
+            logging.info("Writing the tree structure to a JSON lines file.")
+            write_dic_to_path(dictionary_tree, self.path_tree)
+            return
+
         logging.info("Writing the tree structure to a YAML file.")
         ryaml = yaml.YAML()
         with open(self.path_tree, "w") as yaml_file:
@@ -716,20 +947,12 @@ class GenerateScan:
         for idx, generation in enumerate(l_generations):
             l_study_path_all_next_generation = []
             logging.info(f"Taking care of generation: {generation}")
+            dic_parameter_current_gen, dic_parameter_naming_current_gen = (
+                self.get_parameters_current_gen(
+                    generation, dic_parameter_all_gen, dic_parameter_all_gen_naming
+                )
+            )
             for study_path in l_study_path:
-                if dic_parameter_all_gen is None or generation not in dic_parameter_all_gen:
-                    dic_parameter_current_gen = None
-                    dic_parameter_naming_current_gen = None
-                else:
-                    dic_parameter_current_gen = dic_parameter_all_gen[generation]
-                    if (
-                        dic_parameter_all_gen_naming is not None
-                        and generation in dic_parameter_all_gen_naming
-                    ):
-                        dic_parameter_naming_current_gen = dic_parameter_all_gen_naming[generation]
-                    else:
-                        dic_parameter_naming_current_gen = None
-
                 # Get list of paths for the children of the current study
                 l_study_path_next_generation = self.create_study_for_current_gen(
                     generation,
@@ -751,6 +974,85 @@ class GenerateScan:
 
         return dictionary_tree
 
+    @staticmethod
+    def get_parameters_current_gen(
+        generation: str,
+        dic_parameter_all_gen: Optional[dict[str, dict[str, Any]]],
+        dic_parameter_all_gen_naming: Optional[dict[str, dict[str, Any]]],
+    ) -> tuple[Optional[dict[str, Any]], Optional[dict[str, Any]]]:
+        """
+        Gets the external parameter lists (and the corresponding lists for naming) of a generation.
+
+        Args:
+            generation (str): The name of the generation.
+            dic_parameter_all_gen (Optional[dict[str, dict[str, Any]]]): The dictionary of parameter
+                lists for all generations.
+            dic_parameter_all_gen_naming (Optional[dict[str, dict[str, Any]]]): The dictionary of
+                parameter lists for all generations for naming.
+
+        Returns:
+            tuple[Optional[dict[str, Any]], Optional[dict[str, Any]]]: The parameter lists and the
+                parameter lists for naming of the generation, or None if not provided.
+        """
+        if dic_parameter_all_gen is None or generation not in dic_parameter_all_gen:
+            return None, None
+        if dic_parameter_all_gen_naming is not None and generation in dic_parameter_all_gen_naming:
+            return dic_parameter_all_gen[generation], dic_parameter_all_gen_naming[generation]
+        return dic_parameter_all_gen[generation], None
+
+    def browse_and_stream_study(
+        self,
+        dic_parameter_all_gen: Optional[dict[str, dict[str, Any]]],
+        dic_parameter_all_gen_naming: Optional[dict[str, dict[str, Any]]],
+        add_prefix_to_folder_names: bool,
+        tree_writer: StreamingTreeWriter,
+    ) -> None:
+        """
+        Creates the study depth first, writing each job to the tree file as soon as it is created
+        instead of building the whole tree in memory. The resulting tree is the same as the one
+        built by browse_and_creat_study.
+
+        Args:
+            dic_parameter_all_gen (Optional[dict[str, dict[str, Any]]]): The dictionary of parameter
+                lists for all generations.
+            dic_parameter_all_gen_naming (Optional[dict[str, dict[str, Any]]]): The dictionary of
+                parameter lists for all generations for naming.
+            add_prefix_to_folder_names (bool): Whether to add a prefix to the folder names.
+            tree_writer (StreamingTreeWriter): The writer of the tree file.
+        """
+        l_generations = list(self.config["structure"].keys())
+
+        def browse_generation(study_path: str, idx: int) -> None:
+            generation = l_generations[idx]
+            dic_parameter_current_gen, dic_parameter_naming_current_gen = (
+                self.get_parameters_current_gen(
+                    generation, dic_parameter_all_gen, dic_parameter_all_gen_naming
+                )
+            )
+
+            # Get list of paths for the children of the current study
+            l_study_path_next_generation = self.create_study_for_current_gen(
+                generation,
+                study_path,
+                idx + 1,
+                dic_parameter_current_gen,
+                dic_parameter_naming_current_gen,
+                add_prefix_to_folder_names,
+            )
+
+            # Write each child to the tree before browsing its own children, to keep the tree order
+            for path_next in l_study_path_next_generation:
+                tree_writer.write_node(
+                    path_next.split("/")[1:-1] + [generation],
+                    {"file": f"{path_next}{generation}.py"},
+                )
+                if idx + 1 < len(l_generations):
+                    browse_generation(path_next, idx + 1)
+
+        logging.info(f"Creating the study and streaming the tree to {tree_writer.path_tree}")
+        browse_generation(self.config["name"] + "/", 0)
+        logging.info(f"Number of jobs written to the tree: {tree_writer.n_nodes}")
+
     def create_study(
         self,
         tree_file: bool = True,
@@ -758,6 +1060,11 @@ class GenerateScan:
         dic_parameter_all_gen: Optional[dict[str, dict[str, Any]]] = None,
         dic_parameter_all_gen_naming: Optional[dict[str, dict[str, Any]]] = None,
         add_prefix_to_folder_names: bool = False,
+        n_workers: int = 1,
+        formatting_strategy: str = "black",
+        incremental: bool = False,
+        tree_format: str = "yaml",
+        stream_tree: bool = False,
     ) -> None:
         """
         Creates study files for the entire study.
@@ -773,6 +1080,23 @@ class GenerateScan:
                 parameter lists for all generations for naming. Defaults to None.
             add_prefix_to_folder_names (bool): Whether to add a prefix to the folder names. Defaults
                 to False.
+            n_workers (int, optional): The number of processes used to render and write the
+                study files. The files are rendered in parallel if larger than 1. Defaults to 1.
+            formatting_strategy (str, optional): How to format the study files. "black" formats
+                every file with black, "template" formats each template only once and writes the
+                mutated parameters already formatted, and "none" doesn't format the files.
+                Defaults to "black".
+            incremental (bool, optional): Whether to update an existing study, only creating the
+                jobs that are not already in the tree, and keeping the state of the existing ones.
+                Can't be used with add_prefix_to_folder_names, as the prefixes are renumbered when
+                the parameter space changes (such that all the jobs would look new). Defaults to
+                False.
+            tree_format (str, optional): The format of the tree file, either "yaml" (tree.yaml)
+                or "jsonl" (tree.jsonl, JSON lines, more compact and faster to load for large
+                studies). Defaults to "yaml".
+            stream_tree (bool, optional): Whether to write the tree file while the study is being
+                created, instead of building the whole tree in memory first. Useful for very large
+                studies. Can't be used with incremental. Defaults to False.
 
         Returns:
             list[str]: The list of study file strings.
@@ -784,22 +1108,89 @@ class GenerateScan:
                 "If dic_parameter_all_gen_naming is defined, dic_parameter_all_gen must be defined."
             )
 
-        # Remove existing study if force_overwrite
+        # Ensure the formatting strategy is valid
+        if formatting_strategy not in ["black", "template", "none"]:
+            raise ValueError(
+                f"Formatting strategy {formatting_strategy} is not recognized. Please use "
+                "'black', 'template' or 'none'."
+            )
+
+        if incremental and force_overwrite:
+            raise ValueError("Only one of incremental and force_overwrite can be set to True.")
+        if incremental and add_prefix_to_folder_names:
+            raise ValueError(
+                "Prefixes can't be added to the folder names when updating a study incrementally, "
+                "as they are renumbered when the parameter space changes."
+            )
+
+        # Ensure the tree format is valid
+        if tree_format not in ["yaml", "jsonl"]:
+            raise ValueError(
+                f"Tree format {tree_format} is not recognized. Please use 'yaml' or 'jsonl'."
+            )
+        if incremental and stream_tree:
+            raise ValueError(
+                "The tree can't be streamed when updating a study incrementally, as the new tree "
+                "must be merged with the existing one."
+            )
+        self.path_tree = f"{self.config['name']}/tree.{tree_format}"
+
+        # Remove existing study if force_overwrite, or load its tree if incremental
+        dic_existing_tree = None
+        self.set_existing_files = set()
         if os.path.exists(self.config["name"]):
-            if not force_overwrite:
+            if incremental:
+                if not os.path.exists(self.path_tree):
+                    raise FileNotFoundError(
+                        f"Study {self.config['name']} has no tree file. It can't be updated "
+                        "incrementally."
+                    )
+                logging.info(f"Study {self.config['name']} already exists. Updating it.")
+                dic_existing_tree = load_dic_from_path(self.path_tree)[0]
+                self.set_existing_files = set(self.get_jobs_in_tree(dic_existing_tree))
+            elif not force_overwrite:
                 logging.info(
                     f"Study {self.config['name']} already exists. Set force_overwrite to True to "
                     "overwrite. Continuing without overwriting."
                 )
                 return
-            shutil.rmtree(self.config["name"])
+            else:
+                shutil.rmtree(self.config["name"])
+
+        # Set the number of workers and the formatting used to render and write the study files
+        self.n_workers = n_workers
+        self.formatting_strategy = formatting_strategy
+
+        # Keep track of the template cache hits during the study creation
+        template_cache_hits_before = _dic_template_cache_stats["hits"]
 
         # Browse through the generations and create the study
-        dictionary_tree = self.browse_and_creat_study(
-            dic_parameter_all_gen,
-            dic_parameter_all_gen_naming,
-            add_prefix_to_folder_names,
-        )
+        if tree_file and stream_tree:
+            with StreamingTreeWriter(self.path_tree, tree_format) as tree_writer:
+                self.browse_and_stream_study(
+                    dic_parameter_all_gen,
+                    dic_parameter_all_gen_naming,
+                    add_prefix_to_folder_names,
+                    tree_writer,
+                )
+            dictionary_tree = None
+        else:
+            dictionary_tree = self.browse_and_creat_study(
+                dic_parameter_all_gen,
+                dic_parameter_all_gen_naming,
+                add_prefix_to_folder_names,
+            )
+
+        # Render and write the study files if they have been deferred to the pool of workers
+        self.render_write_in_parallel()
+
+        # Keep the state of the existing jobs if the study is updated
+        if dic_existing_tree is not None:
+            dictionary_tree = self.merge_with_existing_tree(dictionary_tree, dic_existing_tree)
+
+        # Report the number of times a compiled template could be reused
+        self.template_cache_hits = _dic_template_cache_stats["hits"] - template_cache_hits_before
+        logging.info(f"Template cache hits during study creation: {self.template_cache_hits}")
 
         # Add dependencies to root of the study
         if "dependencies" in self.config:
@@ -817,72 +1208,77 @@ class GenerateScan:
                         path = path_template
                 shutil.copy2(path, self.config["name"])
 
-        if tree_file:
+        if tree_file and dictionary_tree is not None:
             self.write_tree(dictionary_tree)
 
     @staticmethod
-    def eval_conditions(l_condition: list[str], dic_parameter_lists: dict[str, Any]) -> np.ndarray:
-        """
-        Evaluates the conditions to filter out some parameter values.
-
-        Args:
-            l_condition (list[str]): The list of conditions.
-            dic_parameter_lists (dict[str: Any]): The dictionary of parameter lists.
-
-        Returns:
-            np.ndarray: The array of conditions.
-        """
-        # Initialize the array of parameters as a meshgrid of all parameters
-        l_parameters = list(dic_parameter_lists.values())
-        meshgrid = np.meshgrid(*l_parameters, indexing="ij")
-
-        # Associate the parameters to their names
-        dic_param_mesh = dict(zip(dic_parameter_lists.keys(), meshgrid))
-
-        # Evaluate the conditions and take the intersection of all conditions
-        array_conditions = np.ones_like(meshgrid[0], dtype=bool)
-        for condition in l_condition:
-            array_conditions = array_conditions & eval(condition, dic_param_mesh)
-
-        return array_conditions
-
-    @staticmethod
-    def filter_for_concomitant_parameters(
-        array_conditions: np.ndarray,
+    def get_indices_to_keep(
+        l_condition: list[str],
+        dic_parameter_lists: dict[str, Any],
         ll_concomitant_parameters: list[list[str]],
-        dic_dimension_indices: dict[str, int],
+        chunk_size: int = 1_000_000,
     ) -> np.ndarray:
         """
-        Filters the conditions for concomitant parameters.
+        Returns the indices of the parameter values satisfying all the conditions and lying on the
+        diagonal of the concomitant parameters. Concomitant parameters are scanned as a single
+        dimension, and the conditions are evaluated by chunks of the remaining cartesian product,
+        such that the dense grid of all parameters is never allocated.
 
         Args:
-            array_conditions (np.ndarray): The array of conditions.
+            l_condition (list[str]): The list of conditions.
+            dic_parameter_lists (dict[str: Any]): The dictionary of parameter lists.
             ll_concomitant_parameters (list[list[str]]): The list of concomitant parameters.
-            dic_dimension_indices (dict[str, int]): The dictionary of dimension indices.
+            chunk_size (int, optional): The number of points of the cartesian product evaluated
+                at once. Defaults to 1_000_000.
 
         Returns:
-            np.ndarray: The filtered array of conditions.
+            np.ndarray: The array of indices of shape (number of points kept, number of
+                parameters), in the order of the cartesian product.
         """
+        l_parameters = list(dic_parameter_lists.keys())
+
+        # Merge the concomitant parameters into groups, each group being a single dimension
+        dic_parent = {parameter: parameter for parameter in l_parameters}
+
+        def get_root(parameter: str) -> str:
+            while dic_parent[parameter] != parameter:
+                parameter = dic_parent[parameter]
+            return parameter
+
+        for concomitant_parameters in ll_concomitant_parameters:
+            for parameter in concomitant_parameters[1:]:
+                dic_parent[get_root(parameter)] = get_root(concomitant_parameters[0])
+
+        # Dimensions are ordered as the first parameter of each group, such that the lexicographic
+        # order of the dimensions is the same as the one of the full cartesian product
+        l_dimensions = list(dict.fromkeys(get_root(parameter) for parameter in l_parameters))
+        l_dimension_lengths = [len(dic_parameter_lists[dim]) for dim in l_dimensions]
+        l_dimension_of_parameter = [
+            l_dimensions.index(get_root(parameter)) for parameter in l_parameters
+        ]
 
-        # Return the array of conditions if no concomitant parameters
-        if not ll_concomitant_parameters:
-            return array_conditions
+        # Evaluate the conditions by chunks of the reduced cartesian product
+        n_points = int(np.prod(l_dimension_lengths))
+        l_array_idx = [np.empty((0, len(l_parameters)), dtype=int)]
+        for start in range(0, n_points, chunk_size):
+            l_idx_dimensions = np.unravel_index(
+                np.arange(start, min(start + chunk_size, n_points)), l_dimension_lengths
+            )
+            array_idx = np.stack(
+                [l_idx_dimensions[dim] for dim in l_dimension_of_parameter], axis=1
+            )
 
-        # Get the indices of the concomitant parameters
-        ll_idx_concomitant_parameters = [
-            [dic_dimension_indices[parameter] for parameter in concomitant_parameters]
-            for concomitant_parameters in ll_concomitant_parameters
-        ]
+            # Evaluate the conditions on the parameter values of the chunk
+            if l_condition:
+                dic_param_values = {
+                    parameter: np.asarray(dic_parameter_lists[parameter])[array_idx[:, idx]]
+                    for idx, parameter in enumerate(l_parameters)
+                }
+                array_conditions = np.ones(len(array_idx), dtype=bool)
+                for condition in l_condition:
+                    array_conditions = array_conditions & eval(condition, dic_param_values)
+                array_idx = array_idx[array_conditions]
+
+            l_array_idx.append(array_idx)
 
-        # Browse all the values of array_conditions
-        for idx, _ in np.ndenumerate(array_conditions):
-            # Check if the value is on the diagonal of the concomitant parameters
-            for l_idx_concomitant_parameter in ll_idx_concomitant_parameters:
-                if any(
-                    idx[i] != idx[j]
-                    for i, j in itertools.combinations(l_idx_concomitant_parameter, 2)
-                ):
-                    array_conditions[idx] = False
-                    break
-
-        return array_conditions
+        return np.concatenate(l_array_idx)
@@ -0,0 +1,385 @@
+"""
+This module provides a content-addressed cache of collider files, shared by the jobs running on
+the same machine (or filesystem).
+
+Each entry of the cache is a folder named after a key (usually a hash of everything the collider
+depends on), containing the collider file. Entries are written atomically (in a temporary folder
+renamed once complete), such that concurrent jobs never see a partially written collider, and the
+least recently used entries are evicted when the cache exceeds its maximum size.
+
+The cache is also used as a node-local staging area for the colliders loaded by sibling jobs (see
+XsuiteCollider.load_collider): the hashes of the source files are memoized in the cache (such that
+large files on a network filesystem are not read again by each job), and the population of an
+entry can be protected by a lock, such that a single job converts the source collider.
+
+Classes:
+    ColliderCache: A cache of collider files, with LRU eviction.
+
+Functions:
+    hash_dic(dic, l_excluded_keys=None) -> str:
+        Returns a hash of a (nested) dictionary, independent of the order of its keys.
+    hash_file(path_file) -> str:
+        Returns a hash of the content of a file.
+    hash_folder(path_folder) -> str:
+        Returns a hash of the content of the files of a folder.
+"""
+
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Callable, Optional
+
+# Import third-party modules
+from filelock import FileLock, SoftFileLock
+
+# Import user-defined modules
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Name of the lock file, at the root of the cache
+NAME_LOCK_FILE = ".lock"
+
+# Prefix of the folders of the entries being written
+PREFIX_TEMP_ENTRY = ".tmp_"
+
+# Name of the folder containing the memoized hashes of the source files
+NAME_HASHES_FOLDER = ".hashes"
+
+
+# ==================================================================================================
+# --- Function definition
+# ==================================================================================================
+def hash_dic(dic: dict, l_excluded_keys: Optional[list[str]] = None) -> str:
+    """
+    Returns a hash of a (nested) dictionary, independent of the order of its keys.
+
+    Args:
+        dic (dict): The dictionary to hash.
+        l_excluded_keys (Optional[list[str]], optional): Top-level keys not taken into account.
+            Defaults to None.
+
+    Returns:
+        str: The SHA-256 hash of the dictionary, as a hexadecimal string.
+    """
+    if l_excluded_keys is None:
+        l_excluded_keys = []
+    dic_hashed = {key: value for key, value in dic.items() if key not in l_excluded_keys}
+    return hashlib.sha256(
+        json.dumps(dic_hashed, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def hash_file(path_file: str) -> str:
+    """
+    Returns a hash of the content of a file, read by chunks.
+
+    Args:
+        path_file (str): The path to the file.
+
+    Returns:
+        str: The SHA-256 hash of the file, as a hexadecimal string.
+    """
+    hasher = hashlib.sha256()
+    with open(path_file, "rb") as fid:
+        for chunk in iter(lambda: fid.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_files_folder(path_folder: str) -> list[str]:
+    """
+    Returns the files of a folder (recursively), sorted. Hidden files and folders (e.g. .git) are
+    left out, as they don't change the content of the folder as seen by MAD-X.
+
+    Args:
+        path_folder (str): The path to the folder.
+
+    Returns:
+        list[str]: The paths to the files, relative to the folder.
+    """
+    l_files = []
+    for path_dir, l_dirs, l_names in os.walk(path_folder):
+        l_dirs[:] = sorted(name for name in l_dirs if not name.startswith("."))
+        l_files.extend(
+            os.path.relpath(os.path.join(path_dir, name), path_folder)
+            for name in l_names
+            if not name.startswith(".")
+        )
+    return sorted(l_files)
+
+
+def hash_folder(path_folder: str) -> str:
+    """
+    Returns a hash of the content of the files of a folder, with their paths relative to the
+    folder.
+
+    Args:
+        path_folder (str): The path to the folder.
+
+    Returns:
+        str: The SHA-256 hash of the folder, as a hexadecimal string.
+    """
+    return hashlib.sha256(
+        "\n".join(
+            f"{path_file}|{hash_file(os.path.join(path_folder, path_file))}"
+            for path_file in get_files_folder(path_folder)
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+# ==================================================================================================
+# --- Class definition
+# ==================================================================================================
+class ColliderCache:
+    """
+    A content-addressed cache of collider files, with least recently used (LRU) eviction.
+
+    Attributes:
+        path_cache (str): The path to the folder containing the cache.
+        max_size (float): The maximum size of the cache, in GB.
+
+    Methods:
+        get(key, path_output): Copies a cached collider to a given path.
+        get_path(key, name_file): Returns the path to a cached collider.
+        put(key, path_file, move=False): Adds a collider file to the cache.
+        get_lock_entry(key): Returns a lock protecting the population of an entry.
+        get_hash_file(path_file): Returns the (memoized) hash of the content of a file.
+        get_hash_folder(path_folder): Returns the (memoized) hash of the content of a folder.
+    """
+
+    def __init__(self, path_cache: str, max_size: float = 50.0):
+        """
+        Initializes the ColliderCache class, creating the cache folder if needed.
+
+        Args:
+            path_cache (str): The path to the folder containing the cache.
+            max_size (float, optional): The maximum size of the cache, in GB. Defaults to 50.
+        """
+        self.path_cache: str = os.path.abspath(os.path.expanduser(path_cache))
+        self.max_size: float = max_size
+        os.makedirs(self.path_cache, exist_ok=True)
+
+        # Lock to add and evict entries (softlock as the cache can be on a network filesystem)
+        self.lock = SoftFileLock(f"{self.path_cache}/{NAME_LOCK_FILE}", timeout=600)
+
+    def _get_path_entry(self, key: str) -> str:
+        """
+        Returns the path to the folder of an entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            str: The path to the folder of the entry.
+        """
+        return f"{self.path_cache}/{key}"
+
+    def get_path(self, key: str, name_file: str) -> Optional[str]:
+        """
+        Returns the path to the collider cached for a key, such that it can be loaded directly
+        from the cache. The entry is marked as recently used.
+
+        Args:
+            key (str): The key of the entry.
+            name_file (str): The name of the cached collider file.
+
+        Returns:
+            Optional[str]: The path to the cached collider, or None if it is not cached.
+        """
+        path_cached = f"{self._get_path_entry(key)}/{name_file}"
+        try:
+            # Mark the entry as recently used
+            os.utime(self._get_path_entry(key))
+        except FileNotFoundError:
+            return None
+        return path_cached if os.path.exists(path_cached) else None
+
+    def get(self, key: str, path_output: str) -> bool:
+        """
+        Copies the collider cached for a key to a given path. The entry is marked as recently
+        used. The file is not hard-linked, as the job could then modify the cached collider by
+        rewriting its own file.
+
+        Args:
+            key (str): The key of the entry.
+            path_output (str): The path where the collider must be available. The cached file
+                must have the same name.
+
+        Returns:
+            bool: True if the collider was cached, False otherwise.
+        """
+        path_cached = f"{self._get_path_entry(key)}/{os.path.basename(path_output)}"
+        try:
+            # Mark the entry as recently used
+            os.utime(self._get_path_entry(key))
+        except FileNotFoundError:
+            return False
+        if not os.path.exists(path_cached):
+            return False
+
+        if os.path.dirname(path_output):
+            os.makedirs(os.path.dirname(path_output), exist_ok=True)
+        if os.path.lexists(path_output):
+            os.remove(path_output)
+        try:
+            shutil.copyfile(path_cached, path_output)
+        except FileNotFoundError:
+            # Entry evicted in the meantime
+            return False
+        logging.info(f"Collider retrieved from the cache ({path_cached})")
+        return True
+
+    def put(self, key: str, path_file: str, move: bool = False) -> None:
+        """
+        Adds a collider file to the cache (if not already cached), and evicts the least recently
+        used entries if the cache exceeds its maximum size.
+
+        Args:
+            key (str): The key of the entry.
+            path_file (str): The path to the collider file.
+            move (bool, optional): If True, the file is moved to the cache instead of copied (it
+                must then be on the same filesystem as the cache). Defaults to False.
+        """
+        path_entry = self._get_path_entry(key)
+        if os.path.exists(f"{path_entry}/{os.path.basename(path_file)}"):
+            return
+
+        # Write the entry in a temporary folder, renamed once complete
+        path_temp = tempfile.mkdtemp(prefix=PREFIX_TEMP_ENTRY, dir=self.path_cache)
+        try:
+            if move:
+                os.replace(path_file, f"{path_temp}/{os.path.basename(path_file)}")
+            else:
+                shutil.copyfile(path_file, f"{path_temp}/{os.path.basename(path_file)}")
+            with self.lock:
+                if os.path.exists(path_entry):
+                    # Entry written by another job in the meantime (possibly with another file)
+                    os.replace(
+                        f"{path_temp}/{os.path.basename(path_file)}",
+                        f"{path_entry}/{os.path.basename(path_file)}",
+                    )
+                else:
+                    os.rename(path_temp, path_entry)
+                logging.info(f"Collider added to the cache ({path_entry})")
+                self._evict(key)
+        finally:
+            shutil.rmtree(path_temp, ignore_errors=True)
+
+    def get_lock_entry(self, key: str, timeout: float = 600) -> FileLock:
+        """
+        Returns a lock protecting the population of an entry, such that a single job builds the
+        collider of a given key while the others wait for it. As opposed to the lock of the cache,
+        this lock is released by the system if the job dies, but requires a filesystem supporting
+        file locking (e.g. a local disk).
+
+        Args:
+            key (str): The key of the entry.
+            timeout (float, optional): The maximum time to wait for the lock, in seconds. Defaults
+                to 600.
+
+        Returns:
+            FileLock: The lock of the entry.
+        """
+        return FileLock(f"{self.path_cache}/.{key}.lock", timeout=timeout)
+
+    def _get_hash_memoized(self, id_source: str, hash_source: Callable[[], str]) -> str:
+        """
+        Returns the hash of a source (file or folder), memoized in the cache for a given identifier
+        of the source (e.g. its path, size and modification time).
+
+        Args:
+            id_source (str): The identifier of the source.
+            hash_source (Callable[[], str]): The function hashing the source, only called if the
+                hash is not memoized yet.
+
+        Returns:
+            str: The hash of the source.
+        """
+        path_hash = f"{self.path_cache}/{NAME_HASHES_FOLDER}/{id_source}"
+        try:
+            with open(path_hash) as fid:
+                return fid.read().strip()
+        except FileNotFoundError:
+            pass
+
+        # Hash the source and write the result atomically
+        hash_content = hash_source()
+        os.makedirs(os.path.dirname(path_hash), exist_ok=True)
+        fd, path_temp = tempfile.mkstemp(prefix=PREFIX_TEMP_ENTRY, dir=os.path.dirname(path_hash))
+        with os.fdopen(fd, "w") as fid:
+            fid.write(hash_content)
+        os.replace(path_temp, path_hash)
+        return hash_content
+
+    def get_hash_file(self, path_file: str) -> str:
+        """
+        Returns the hash of the content of a file. The hash is memoized in the cache for a given
+        path, size and modification time, such that the file is only read once.
+
+        Args:
+            path_file (str): The path to the file.
+
+        Returns:
+            str: The SHA-256 hash of the file, as a hexadecimal string.
+        """
+        stat = os.stat(path_file)
+        id_file = hashlib.sha256(
+            f"{os.path.realpath(path_file)}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")
+        ).hexdigest()
+        return self._get_hash_memoized(id_file, lambda: hash_file(path_file))
+
+    def get_hash_folder(self, path_folder: str) -> str:
+        """
+        Returns the hash of the content of the files of a folder (see hash_folder). The hash is
+        memoized in the cache for a given path, and given paths, sizes and modification times of
+        the files, such that the files are only read again if one of them changed.
+
+        Args:
+            path_folder (str): The path to the folder.
+
+        Returns:
+            str: The SHA-256 hash of the folder, as a hexadecimal string.
+        """
+        l_stats = [os.path.realpath(path_folder)]
+        for path_file in get_files_folder(path_folder):
+            stat = os.stat(os.path.join(path_folder, path_file))
+            l_stats.append(f"{path_file}|{stat.st_size}|{stat.st_mtime_ns}")
+        id_folder = hashlib.sha256("\n".join(l_stats).encode("utf-8")).hexdigest()
+        return self._get_hash_memoized(id_folder, lambda: hash_folder(path_folder))
+
+    def _evict(self, key_kept: str) -> None:
+        """
+        Removes the least recently used entries until the cache is below its maximum size. Must be
+        called with the lock acquired.
+
+        Args:
+            key_kept (str): The key of an entry that must not be evicted (e.g. the one just added).
+        """
+        l_entries = []
+        total_size = 0
+        for entry in os.scandir(self.path_cache):
+            # Skip the entries being written and the memoized hashes
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(file.stat().st_size for file in os.scandir(entry.path) if file.is_file())
+            l_entries.append((entry.stat().st_mtime, entry.name, size))
+            total_size += size
+
+        # Remove the least recently used entries first
+        for _, key, size in sorted(l_entries):
+            if total_size <= self.max_size * 1024**3:
+                break
+            if key == key_kept:
+                continue
+            logging.info(f"Evicting collider {key} from the cache")
+            shutil.rmtree(self._get_path_entry(key), ignore_errors=True)
+            total_size -= size
@@ -5,9 +5,12 @@
 # ==================================================================================================
 
 # Import standard library modules
+import hashlib
 import logging
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
 from typing import Any
 
 # Import third-party modules
@@ -23,7 +26,23 @@ from ..version_specific_files.runIII import optics_specific_tools as ost_runIII
 from ..version_specific_files.runIII_ions import (
     optics_specific_tools as ost_runIII_ions,
 )
-from .utils import compress_and_write
+from .collider_cache import ColliderCache, hash_dic, hash_file, hash_folder
+from .utils import compress_and_write, get_path_binary_collider, write_collider_binary
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Keys of the configuration that don't change the collider built
+L_KEYS_NOT_HASHED = [
+    "links",
+    "sanity_checks",
+    "parallel_mad_build",
+    "path_collider_cache",
+    "max_size_collider_cache",
+]
+
+# Packages whose version changes the collider built
+L_PACKAGES_HASHED = ["cpymad", "xmask", "xsuite", "xtrack", "xpart", "xfields", "xobjects"]
 
 # ==================================================================================================
 # --- Class definition
@@ -50,10 +69,19 @@ class MadCollider:
         phasing (dict): Phasing configuration.
         path_collider_file_for_configuration_as_output (str): Path to save the collider.
         compress (bool): Flag to enable or disable compression of collider file.
+        collider_format (str): Format of the collider file, "json" or "binary".
+        path_collider_cache (str | None): Path to the cache of the colliders shared between
+            studies, or None if the cache is disabled.
+        max_size_collider_cache (float): Maximum size of the cache of the colliders, in GB.
+        parallel_mad_build (bool): Flag to build beam 1/2 and beam 4 at the same time.
 
     Methods:
         ost: Property to get the appropriate optics specific tools.
-        prepare_mad_collider() -> tuple[Madx, Madx]: Prepares the MAD-X collider environment.
+        get_cache_key() -> str | None: Returns the key of the collider in the cache.
+        retrieve_collider_from_cache() -> bool: Retrieves the collider from the cache, if cached.
+        store_collider_in_cache() -> None: Stores the collider written to disk in the cache.
+        prepare_mad_collider(parallel=None) -> tuple[Madx, Madx]: Prepares the MAD-X collider
+            environment.
         build_collider(mad_b1b2: Madx, mad_b4: Madx) -> xt.Multiline: Builds the xsuite collider.
         activate_RF_and_twiss(collider: xt.Multiline) -> None: Activates RF and performs twiss analysis.
         check_xsuite_lattices(line: xt.Line) -> None: Checks the xsuite lattices.
@@ -83,6 +111,14 @@ class MadCollider:
                 - phasing (dict): Configuration for phasing.
                 - path_collider_file_for_configuration_as_output (str): Path to the collider.
                 - compress (bool): Flag to enable or disable compression.
+                - collider_format (str, optional): Format of the collider file, "json" or "binary"
+                    (faster to write and load, see write_collider_binary). Defaults to "json".
+                - path_collider_cache (str, optional): Path to the cache of the colliders, shared
+                    by the studies with the same configuration. Defaults to None (no cache).
+                - max_size_collider_cache (float, optional): Maximum size of the cache, in GB.
+                    Defaults to 50.
+                - parallel_mad_build (bool, optional): Flag to build beam 1/2 and beam 4 at the
+                    same time, in two MAD-X processes. Defaults to False.
         """
         # Configuration variables
         self.sanity_checks: bool = configuration["sanity_checks"]
@@ -106,6 +142,21 @@ class MadCollider:
             "path_collider_file_for_configuration_as_output"
         ]
         self.compress = configuration["compress"]
+        self.collider_format: str = configuration.get("collider_format", "json")
+        if self.collider_format not in ["json", "binary"]:
+            raise ValueError(
+                f"Collider format {self.collider_format} is not recognized. Please use 'json' or "
+                "'binary'."
+            )
+
+        # Cache of the colliders (optional), the key depending on the whole configuration
+        self.configuration: dict = configuration
+        self.path_collider_cache: str | None = configuration.get("path_collider_cache")
+        self.max_size_collider_cache: float = configuration.get("max_size_collider_cache", 50.0)
+        self._cache_key: str | None = None
+
+        # Build of beam 1/2 and beam 4 at the same time
+        self.parallel_mad_build: bool = configuration.get("parallel_mad_build", False)
 
     @property
     def ost(self) -> Any:
@@ -141,35 +192,126 @@ class MadCollider:
 
         return self._ost
 
-    def prepare_mad_collider(self) -> tuple[Madx, Madx]:
-        # sourcery skip: extract-duplicate-method
+    @property
+    def path_collider_file_written(self) -> str:
         """
-        Prepares the MAD-X collider environment and sequences for beam 1/2 and beam 4.
+        Returns the path of the collider file written to disk (zipped or not, binary or not).
 
-        This method performs the following steps:
-        1. Creates the MAD-X environment using the provided links.
-        2. Initializes MAD-X instances for beam 1/2 and beam 4 with respective command logs.
-        3. Builds the sequences for both beams using the provided beam configuration.
-        4. Applies the specified optics to the beam 1/2 sequence.
-        5. Optionally performs sanity checks on the beam 1/2 sequence by running TWISS and checking
-            the MAD-X lattices.
-        6. Applies the specified optics to the beam 4 sequence.
-        7. Optionally performs sanity checks on the beam 4 sequence by running TWISS and checking
-            the MAD-X lattices.
+        Returns:
+            str: The path of the collider file.
+        """
+        if self.collider_format == "binary":
+            return get_path_binary_collider(
+                self.path_collider_file_for_configuration_as_output, self.compress
+            )
+        if self.compress:
+            return f"{self.path_collider_file_for_configuration_as_output}.zip"
+        return self.path_collider_file_for_configuration_as_output
+
+    def _get_path_optics_file(self) -> str:
+        """
+        Returns the path to the optics file, resolving the links (e.g. acc-models-lhc) that are
+        only created when the MAD-X environment is made.
 
         Returns:
-            tuple[Madx, Madx]: A tuple containing the MAD-X instances for beam 1/2 and beam 4.
+            str: The path to the optics file.
         """
-        # Make mad environment
-        xm.make_mad_environment(links=self.links)
+        for link, target in self.links.items():
+            if self.optics == link or self.optics.startswith(f"{link}/"):
+                return f"{target}{self.optics[len(link):]}"
+        return self.optics
 
-        # Start mad
-        mad_b1b2 = Madx(command_log="mad_collider.log")
-        mad_b4 = Madx(command_log="mad_b4.log")
+    def get_cache_key(self) -> str | None:
+        """
+        Returns the key of the collider in the cache: a hash of the configuration, of the content
+        of the optics file and of the linked folders (e.g. acc-models-lhc, containing the sequence
+        files), and of the versions of the packages used to build the collider. The hashes of the
+        files are memoized in the cache, such that they are only read again when they change.
+
+        Returns:
+            str | None: The key of the collider, or None if the optics file or the linked folders
+                can't be read.
+        """
+        if self._cache_key is None:
+            if self.path_collider_cache is not None:
+                collider_cache = ColliderCache(
+                    self.path_collider_cache, self.max_size_collider_cache
+                )
+                get_hash_file, get_hash_folder = (
+                    collider_cache.get_hash_file,
+                    collider_cache.get_hash_folder,
+                )
+            else:
+                get_hash_file, get_hash_folder = hash_file, hash_folder
 
-        # Build sequences
+            try:
+                l_hashes = [get_hash_file(self._get_path_optics_file())]
+                # The links are identified by their name, their target only locating the files
+                for link, target in sorted(self.links.items()):
+                    if os.path.isdir(target):
+                        l_hashes.append(f"{link}|{get_hash_folder(target)}")
+                    else:
+                        l_hashes.append(f"{link}|{get_hash_file(target)}")
+            except OSError:
+                logging.warning(
+                    "The optics file or the linked folders could not be read, the collider is not"
+                    " cached."
+                )
+                return None
+
+            l_versions = []
+            for package in L_PACKAGES_HASHED:
+                try:
+                    l_versions.append(f"{package}=={version(package)}")
+                except PackageNotFoundError:
+                    l_versions.append(f"{package} not installed")
+
+            self._cache_key = hashlib.sha256(
+                "\n".join(
+                    [hash_dic(self.configuration, L_KEYS_NOT_HASHED)] + l_hashes + l_versions
+                ).encode("utf-8")
+            ).hexdigest()
+        return self._cache_key
+
+    def retrieve_collider_from_cache(self) -> bool:
+        """
+        Retrieves the collider from the cache (as a copy), if a collider was built with
+        the same configuration, optics and packages versions.
+
+        Returns:
+            bool: True if the collider was retrieved, False otherwise (or if the cache is
+                disabled).
+        """
+        if self.path_collider_cache is None:
+            return False
+        cache_key = self.get_cache_key()
+        if cache_key is None:
+            return False
+        collider_cache = ColliderCache(self.path_collider_cache, self.max_size_collider_cache)
+        return collider_cache.get(cache_key, self.path_collider_file_written)
+
+    def store_collider_in_cache(self) -> None:
+        """
+        Stores the collider written to disk in the cache, if the cache is enabled.
+        """
+        if self.path_collider_cache is None:
+            return
+        cache_key = self.get_cache_key()
+        if cache_key is None:
+            return
+        collider_cache = ColliderCache(self.path_collider_cache, self.max_size_collider_cache)
+        collider_cache.put(cache_key, self.path_collider_file_written)
+
+    def _prepare_mad_b1b2(self) -> Madx:
+        """
+        Builds the MAD-X sequences for beam 1/2, applies the optics and optionally performs sanity
+        checks (TWISS and check of the MAD-X lattices).
+
+        Returns:
+            Madx: The MAD-X instance for beam 1/2.
+        """
+        mad_b1b2 = Madx(command_log="mad_collider.log")
         self.ost.build_sequence(mad_b1b2, mylhcbeam=1, beam_config=self.beam_config)
-        self.ost.build_sequence(mad_b4, mylhcbeam=4, beam_config=self.beam_config)
 
         # Apply optics (only for b1b2, b4 will be generated from b1b2)
         self.ost.apply_optics(mad_b1b2, optics_file=self.optics)
@@ -182,6 +324,19 @@ class MadCollider:
             mad_b1b2.twiss()
             self.ost.check_madx_lattices(mad_b1b2)
 
+        return mad_b1b2
+
+    def _prepare_mad_b4(self) -> Madx:
+        """
+        Builds the MAD-X sequence for beam 4, applies the optics and optionally performs sanity
+        checks (TWISS and check of the MAD-X lattices).
+
+        Returns:
+            Madx: The MAD-X instance for beam 4.
+        """
+        mad_b4 = Madx(command_log="mad_b4.log")
+        self.ost.build_sequence(mad_b4, mylhcbeam=4, beam_config=self.beam_config)
+
         # Apply optics (only for b4, just for check)
         self.ost.apply_optics(mad_b4, optics_file=self.optics)
         if self.sanity_checks:
@@ -193,7 +348,51 @@ class MadCollider:
             except AssertionError:
                 logging.warning("Some sanity checks have failed during the madx lattice check")
 
-        return mad_b1b2, mad_b4
+        return mad_b4
+
+    def prepare_mad_collider(self, parallel: bool | None = None) -> tuple[Madx, Madx]:
+        """
+        Prepares the MAD-X collider environment and sequences for beam 1/2 and beam 4.
+
+        This method performs the following steps:
+        1. Creates the MAD-X environment using the provided links.
+        2. Initializes MAD-X instances for beam 1/2 and beam 4 with respective command logs.
+        3. Builds the sequences for both beams using the provided beam configuration.
+        4. Applies the specified optics to the beam 1/2 sequence.
+        5. Optionally performs sanity checks on the beam 1/2 sequence by running TWISS and checking
+            the MAD-X lattices.
+        6. Applies the specified optics to the beam 4 sequence.
+        7. Optionally performs sanity checks on the beam 4 sequence by running TWISS and checking
+            the MAD-X lattices.
+
+        The two MAD-X instances are independent processes: they can be driven from two threads,
+        such that both are built at the same time.
+
+        Args:
+            parallel (bool | None, optional): Whether to build beam 1/2 and beam 4 at the same time.
+                Defaults to None, in which case the parallel_mad_build flag of the configuration
+                is used.
+
+        Returns:
+            tuple[Madx, Madx]: A tuple containing the MAD-X instances for beam 1/2 and beam 4.
+        """
+        if parallel is None:
+            parallel = self.parallel_mad_build
+
+        # Make mad environment
+        xm.make_mad_environment(links=self.links)
+
+        # Get the optics specific tools before starting the threads (raises if not available)
+        _ = self.ost
+
+        if not parallel:
+            return self._prepare_mad_b1b2(), self._prepare_mad_b4()
+
+        # Build both beams at the same time, MAD-X releasing the GIL while it computes
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_b1b2 = executor.submit(self._prepare_mad_b1b2)
+            future_b4 = executor.submit(self._prepare_mad_b4)
+            return future_b1b2.result(), future_b4.result()
 
     def build_collider(self, mad_b1b2: Madx, mad_b4: Madx) -> xt.Multiline:
         """
@@ -287,7 +486,7 @@ class MadCollider:
     def write_collider_to_disk(self, collider: xt.Multiline) -> None:
         """
         Writes the collider object to disk in JSON format and optionally compresses it into a ZIP
-        file.
+        file, or in binary format (optionally compressed with gzip).
 
         Args:
             collider (xt.Multiline): The collider object to be saved.
@@ -303,15 +502,24 @@ class MadCollider:
                 `self.path_collider_file_for_configuration_as_output` exists.
             - If `self.compress` is True, the JSON file is compressed into a ZIP file to reduce
                 storage usage.
+            - If the cache is enabled, the file written is also stored in the cache.
         """
         # Save collider to json, creating the folder if it does not exist
         if "/" in self.path_collider_file_for_configuration_as_output:
             os.makedirs(self.path_collider_file_for_configuration_as_output, exist_ok=True)
-        collider.to_json(self.path_collider_file_for_configuration_as_output)
-
-        # Compress the collider file to zip to ease the load on afs
-        if self.compress:
-            compress_and_write(self.path_collider_file_for_configuration_as_output)
+        if self.collider_format == "binary":
+            write_collider_binary(
+                collider, self.path_collider_file_for_configuration_as_output, self.compress
+            )
+        else:
+            collider.to_json(self.path_collider_file_for_configuration_as_output)
+
+            # Compress the collider file to zip to ease the load on afs
+            if self.compress:
+                compress_and_write(self.path_collider_file_for_configuration_as_output)
+
+        # Share the collider with the jobs using the same configuration
+        self.store_collider_in_cache()
 
     @staticmethod
     def clean_temporary_files() -> None:
@@ -5,7 +5,6 @@
 # ==================================================================================================
 
 # Import standard library modules
-import itertools
 import os
 
 # Import third-party modules
@@ -14,6 +13,19 @@ import pandas as pd
 
 # Import user-defined modules
 
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Columns of the distribution files
+L_COLUMNS_DISTRIBUTION = [
+    "particle_id",
+    "normalized amplitude in xy-plane",
+    "angle in xy-plane [deg]",
+]
+
+# Name of the distribution file, when all the parts are written in a single file
+NAME_SINGLE_FILE_DISTRIBUTION = "particles.parquet"
+
 
 # ==================================================================================================
 # --- Class definition
@@ -31,6 +43,11 @@ class ParticlesDistribution:
         n_angles (int): Number of angular points.
         n_split (int): Number of splits for parallelization.
         path_distribution_folder_output (str): Path to the folder where distributions will be saved.
+        distribution_mode (str): "grid" to track the full polar grid, or "adaptive" to track a
+            coarse radial grid, refined around the DA boundary during the tracking.
+        n_r_coarse (int): Number of radial points of the coarse grid, in adaptive mode.
+        single_file (bool): Whether the parts of the distribution are written as the row groups of
+            a single file, instead of separate files.
 
     Methods:
         __init__(configuration: dict):
@@ -43,14 +60,21 @@ class ParticlesDistribution:
         get_angular_list() -> np.ndarray:
             Generates a list of angular values.
 
+        get_coarse_radial_indices() -> np.ndarray:
+            Generates the indices of the radial points of the coarse grid (adaptive mode).
+
         return_distribution_as_list(split: bool = True, lower_crop: float | None = None,
             upper_crop: float | None) -> list[np.ndarray]:
             Returns the particle distribution as a list of numpy arrays, optionally split for
             parallelization.
 
-        write_particle_distribution_to_disk(ll_particles: list[np.ndarray]) -> list[str]:
+        write_particle_distribution_to_disk(ll_particles: list[np.ndarray],
+            single_file: bool | None = None) -> list[str]:
             Writes the particle distribution to disk in Parquet format and returns the list of file
             paths.
+
+        refine_distribution(particle_id: np.ndarray, survived: np.ndarray) -> np.ndarray:
+            Returns the particles to track next to refine the DA boundary (adaptive mode).
     """
 
     def __init__(self, configuration: dict):
@@ -66,6 +90,11 @@ class ParticlesDistribution:
                 - n_split (int): Number of splits for parallelization.
                 - path_distribution_folder_output (str): Path to the folder where the distribution will be
                     saved.
+                - distribution_mode (str, optional): "grid" or "adaptive". Defaults to "grid".
+                - n_r_coarse (int, optional): Number of radial points of the coarse grid, in
+                    adaptive mode. Defaults to 16.
+                - single_file (bool, optional): Whether the parts of the distribution are written
+                    as the row groups of a single file. Defaults to False.
         """
         # Variables used to define the distribution
         self.r_min: int = configuration["r_min"]
@@ -78,6 +107,21 @@ class ParticlesDistribution:
 
         # Variable to write the distribution to disk
         self.path_distribution_folder_output: str = configuration["path_distribution_folder_output"]
+        self.single_file: bool = configuration.get("single_file", False)
+
+        # Adaptive search of the DA boundary
+        self.distribution_mode: str = configuration.get("distribution_mode", "grid")
+        self.n_r_coarse: int = configuration.get("n_r_coarse", 16)
+        if self.distribution_mode not in ["grid", "adaptive"]:
+            raise ValueError(
+                f"Distribution mode {self.distribution_mode} is not recognized. Please use 'grid' or "
+                "'adaptive'."
+            )
+        if self.distribution_mode == "adaptive" and self.n_split > self.n_angles:
+            raise ValueError(
+                "In adaptive mode, the distribution is split by angles, so n_split can't be larger "
+                "than n_angles."
+            )
 
     def get_radial_list(
         self, lower_crop: float | None = None, upper_crop: float | None = None
@@ -114,6 +158,41 @@ class ParticlesDistribution:
         """
         return np.linspace(0, 90, self.n_angles + 2)[1:-1]
 
+    def get_coarse_radial_indices(self) -> np.ndarray:
+        """
+        Generate the indices (in the radial list) of the radial points of the coarse grid, used in
+        adaptive mode. The first and last radial points are always included, such that the DA
+        boundary is always bracketed by the coarse grid (if it is within the radial range).
+
+        Returns:
+            np.ndarray: An array of indices in the radial list.
+        """
+        return np.unique(np.linspace(0, self.n_r - 1, min(self.n_r_coarse, self.n_r)).astype(int))
+
+    def _get_distribution_array(
+        self, radial_list: np.ndarray, array_idx_r: np.ndarray
+    ) -> np.ndarray:
+        """
+        Builds the distribution as an array of (particle id, normalized amplitude, angle) rows,
+        for all the angles and the given indices in the radial list, ordered by angle and then by
+        amplitude. The particle ids are the indices in the full (angle, amplitude) grid.
+
+        Args:
+            radial_list (np.ndarray): The radial list of the full grid.
+            array_idx_r (np.ndarray): The indices of the radial points to keep.
+
+        Returns:
+            np.ndarray: An array of shape (n_particles, 3) representing the distribution.
+        """
+        idx_angle, idx_r = np.meshgrid(np.arange(self.n_angles), array_idx_r, indexing="ij")
+        idx_angle, idx_r = idx_angle.ravel(), idx_r.ravel()
+
+        array_particles = np.empty((idx_r.size, 3))
+        array_particles[:, 0] = idx_angle * len(radial_list) + idx_r
+        array_particles[:, 1] = radial_list[idx_r]
+        array_particles[:, 2] = self.get_angular_list()[idx_angle]
+        return array_particles
+
     def return_distribution_as_list(
         self, split: bool = True, lower_crop: float | None = None, upper_crop: float | None = None
     ) -> list[np.ndarray]:
@@ -122,7 +201,12 @@ class ParticlesDistribution:
 
         This method generates a particle distribution by creating a Cartesian product
         of radial and angular lists. The resulting distribution can be optionally split
-        into multiple parts for parallel computation.
+        into multiple parts for parallel computation. The parts are views of a single array,
+        split by index ranges.
+
+        In adaptive mode, only the coarse radial points are kept (see get_coarse_radial_indices),
+        with the same particle ids as in the full grid, and the distribution is split by angles,
+        such that each part can be refined independently (see refine_distribution).
 
         Args:
             split (bool): If True, the distribution is split into multiple parts.
@@ -137,33 +221,39 @@ class ParticlesDistribution:
                 If `split` is True, the list contains multiple arrays for parallel computation.
                 Otherwise, the list contains a single array.
         """
-        # Get radial list and angular list
+        # Get radial list, and the radial points to track
         radial_list = self.get_radial_list(lower_crop=lower_crop, upper_crop=upper_crop)
-        angular_list = self.get_angular_list()
-
-        # Define particle distribution as a cartesian product of the radial and angular lists
-        l_particles = np.array(
-            [
-                (particle_id, ii[1], ii[0])
-                for particle_id, ii in enumerate(itertools.product(angular_list, radial_list))
-            ]
-        )
-
-        # Potentially split the distribution to parallelize the computation
-        if split:
-            return list(np.array_split(l_particles, self.n_split))
-
-        return [l_particles]
+        if self.distribution_mode == "adaptive":
+            if lower_crop or upper_crop:
+                raise ValueError("The radial list can't be cropped in adaptive mode.")
+            array_idx_r = self.get_coarse_radial_indices()
+        else:
+            array_idx_r = np.arange(len(radial_list))
+
+        # Define particle distribution as a cartesian product of the angular and radial lists
+        array_particles = self._get_distribution_array(radial_list, array_idx_r)
+        if not split:
+            return [array_particles]
+
+        # Split the distribution to parallelize the computation (by angles in adaptive mode)
+        n_rows_block = len(array_idx_r) if self.distribution_mode == "adaptive" else 1
+        array_blocks = array_particles.reshape(-1, n_rows_block, 3)
+        return [
+            array_blocks_split.reshape(-1, 3)
+            for array_blocks_split in np.array_split(array_blocks, self.n_split)
+        ]
 
     def write_particle_distribution_to_disk(
-        self, ll_particles: list[list[np.ndarray]]
+        self, ll_particles: list[np.ndarray], single_file: bool | None = None
     ) -> list[str]:
         """
         Writes a list of particle distributions to disk in Parquet format.
 
         Args:
-            ll_particles (list[list[np.ndarray]]): A list of particle distributions,
-                where each distribution is a list containing particle data.
+            ll_particles (list[np.ndarray]): A list of particle distributions, where each
+                distribution is an array containing particle data.
+            single_file (bool | None): If True, the distributions are written as the row groups
+                of a single file. Defaults to None (value from the configuration).
 
         Returns:
             list[str]: A list of file paths where the particle distributions
@@ -172,23 +262,66 @@ class ParticlesDistribution:
         The method creates a directory specified by `self.path_distribution_folder_output`
         if it does not already exist. Each particle distribution is saved as a
         Parquet file in this directory. The files are named sequentially using
-        a zero-padded index (e.g., '00.parquet', '01.parquet', etc.).
+        a zero-padded index (e.g., '00.parquet', '01.parquet', etc.). If `single_file` is True,
+        the distributions are instead saved as the row groups of a single file
+        ('particles.parquet'), in the same order.
         """
         # Define folder to store the distributions
         os.makedirs(self.path_distribution_folder_output, exist_ok=True)
+        if single_file is None:
+            single_file = self.single_file
+
+        # Write all the distributions in a single file, one row group per distribution
+        if single_file:
+            path_file = f"{self.path_distribution_folder_output}/{NAME_SINGLE_FILE_DISTRIBUTION}"
+            l_row_group_offsets = np.cumsum(
+                [0] + [len(l_particles) for l_particles in ll_particles[:-1]]
+            ).tolist()
+            pd.DataFrame(np.concatenate(ll_particles), columns=L_COLUMNS_DISTRIBUTION).to_parquet(
+                path_file, engine="fastparquet", row_group_offsets=l_row_group_offsets
+            )
+            return [path_file]
 
         # Write the distribution to disk
         l_path_files = []
         for idx_chunk, l_particles in enumerate(ll_particles):
             path_file = f"{self.path_distribution_folder_output}/{idx_chunk:02}.parquet"
-            pd.DataFrame(
-                l_particles,
-                columns=[
-                    "particle_id",
-                    "normalized amplitude in xy-plane",
-                    "angle in xy-plane [deg]",
-                ],
-            ).to_parquet(path_file)
+            pd.DataFrame(l_particles, columns=L_COLUMNS_DISTRIBUTION).to_parquet(path_file)
             l_path_files.append(path_file)
 
         return l_path_files
+
+    def refine_distribution(self, particle_id: np.ndarray, survived: np.ndarray) -> np.ndarray:
+        """
+        Returns the particles to track next to refine the DA boundary, in adaptive mode. For each
+        pair of consecutive tracked particles (at the same angle) of which one survived and the
+        other was lost, the particle of the full grid halfway between them is added, until the
+        boundary is resolved as finely as in the full grid.
+
+        Args:
+            particle_id (np.ndarray): The ids of the particles already tracked (as in the full
+                grid).
+            survived (np.ndarray): Whether each particle survived the tracking.
+
+        Returns:
+            np.ndarray: The particles to track next, with the same columns as the distribution
+                (id, normalized amplitude, angle in degrees). Empty if the boundary is resolved.
+        """
+        idx_sort = np.argsort(particle_id)
+        idx_angle, idx_r = np.divmod(np.asarray(particle_id).astype(int)[idx_sort], self.n_r)
+        survived = np.asarray(survived)[idx_sort]
+
+        # Consecutive particles at the same angle, on both sides of the boundary, not adjacent
+        mask_refine = (
+            (idx_angle[1:] == idx_angle[:-1])
+            & (survived[1:] != survived[:-1])
+            & (idx_r[1:] - idx_r[:-1] > 1)
+        )
+        idx_r_new = (idx_r[:-1][mask_refine] + idx_r[1:][mask_refine]) // 2
+        idx_angle_new = idx_angle[:-1][mask_refine]
+
+        array_particles = np.empty((idx_r_new.size, 3))
+        array_particles[:, 0] = idx_angle_new * self.n_r + idx_r_new
+        array_particles[:, 1] = self.get_radial_list()[idx_r_new]
+        array_particles[:, 2] = self.get_angular_list()[idx_angle_new]
+        return array_particles
@@ -13,6 +13,12 @@ import numpy as np
 
 # Import user-defined modules
 
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Delay (in slots) between the head-on collisions of beam 1 and beam 2, at IP2, IP1/5 and IP8
+L_DELAY_IPS_SLOTS = [891, 0, 2670]
+
 
 # ==================================================================================================
 # --- Function definition
@@ -237,6 +243,77 @@ def _compute_LR_per_bunch(
     return l_long_range_per_bunch
 
 
+def _count_in_circular_window(array_slots: np.ndarray, half_width: int) -> np.ndarray:
+    """
+    Counts the filled slots in the window [m - half_width, m + half_width] around each slot m of
+    a circular filling pattern, using a cumulative sum over the wrapped pattern.
+
+    Args:
+        array_slots (np.ndarray): The filling pattern (1 for filled slots, 0 otherwise).
+        half_width (int): The half width of the window, in slots.
+
+    Returns:
+        np.ndarray: The number of filled slots in the window around each slot.
+    """
+    n_slots = len(array_slots)
+    array_wrapped = np.concatenate(
+        [array_slots[n_slots - half_width :], array_slots, array_slots[:half_width]]
+    )
+    array_cumsum = np.concatenate([[0], np.cumsum(array_wrapped)])
+    return array_cumsum[2 * half_width + 1 :] - array_cumsum[:n_slots]
+
+
+def compute_LR_per_bunch_both_beams(
+    array_b1: np.ndarray,
+    array_b2: np.ndarray,
+    number_of_LR_to_consider: int | list[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the number of long-range encounters of each bunch of both beams, vectorized over all
+    the bunches. This is equivalent to _compute_LR_per_bunch, called for each beam.
+
+    For each bunch, the long-range encounters are the bunches of the other beam within
+    number_of_LR_to_consider slots of its head-on partner at IP2, IP1/5 and IP8 (the head-on
+    partner excluded), summed over the IPs. Bunches missing a head-on collision in any of these
+    IPs are discarded (number of long-range encounters set to 0).
+
+    Args:
+        array_b1 (np.ndarray): The filling pattern of beam 1 (1 for filled slots, 0 otherwise).
+        array_b2 (np.ndarray): The filling pattern of beam 2 (1 for filled slots, 0 otherwise).
+        number_of_LR_to_consider (int | list[int]): Number of long range encounters to consider
+            on each side of the head-on collision, for all the IPs or for IP2, IP1/5 and IP8
+            respectively.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The number of long-range encounters of each bunch of
+            beam 1 and beam 2, ordered by slot.
+    """
+    array_b1 = np.asarray(array_b1)
+    array_b2 = np.asarray(array_b2)
+    if isinstance(number_of_LR_to_consider, int):
+        number_of_LR_to_consider = [number_of_LR_to_consider] * len(L_DELAY_IPS_SLOTS)
+
+    l_array_LR = []
+    for array_beam, array_other_beam, factor in [(array_b1, array_b2, 1), (array_b2, array_b1, -1)]:
+        array_slots = np.arange(len(array_beam))
+        array_LR = np.zeros(len(array_beam), dtype=int)
+        array_HO = np.ones(len(array_beam), dtype=bool)
+        for delay_slots, n_LR in zip(L_DELAY_IPS_SLOTS, number_of_LR_to_consider):
+            # Head-on partner of each slot, in the other beam
+            array_partner = (array_slots + factor * delay_slots) % len(array_beam)
+            array_HO &= array_other_beam[array_partner] == 1
+            array_LR += (
+                _count_in_circular_window(array_other_beam, n_LR)[array_partner]
+                - array_other_beam[array_partner]
+            ).astype(int)
+
+        # Discard the bunches missing a head-on collision
+        array_LR[~array_HO] = 0
+        l_array_LR.append(array_LR[np.flatnonzero(array_beam)])
+
+    return l_array_LR[0], l_array_LR[1]
+
+
 def get_worst_bunch(
     filling_scheme_path: str, number_of_LR_to_consider: int = 26, beam="beam_1"
 ) -> int:
@@ -269,9 +346,12 @@ def get_worst_bunch(
     B1_bunches_index = np.flatnonzero(array_b1)
     B2_bunches_index = np.flatnonzero(array_b2)
 
-    # Compute the number of long range collisions per bunch
-    l_long_range_per_bunch = _compute_LR_per_bunch(
-        array_b1, array_b2, B1_bunches_index, B2_bunches_index, number_of_LR_to_consider, beam=beam
+    # Compute the number of long range collisions per bunch, for both beams at once
+    l_long_range_per_bunch_b1, l_long_range_per_bunch_b2 = compute_LR_per_bunch_both_beams(
+        array_b1, array_b2, number_of_LR_to_consider
+    )
+    l_long_range_per_bunch = (
+        l_long_range_per_bunch_b1 if beam == "beam_1" else l_long_range_per_bunch_b2
     )
 
     # Get the worst bunch for both beams
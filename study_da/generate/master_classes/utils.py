@@ -1,29 +1,59 @@
 """
-This module provides utility functions for file compression.
+This module provides utility functions for file compression and for the binary collider format.
 
 Functions:
     compress_and_write(path_to_file: str) -> str:
         Compresses a file using ZIP compression and writes it to disk, then removes the original
         uncompressed file.
+    get_path_binary_collider(path_collider: str, compress: bool = False) -> str:
+        Returns the path of the binary collider file corresponding to a collider file path.
+    write_collider_binary(collider: xt.Multiline, path_collider: str, compress: bool) -> str:
+        Writes a collider to disk in the binary format.
+    load_collider_binary(path_collider: str) -> xt.Multiline:
+        Loads a collider written in the binary format.
 
 Imports:
     os: Provides a way of using operating system dependent functionality like reading or writing to
         the file system.
     zipfile: Provides tools to create, read, write, append, and list a ZIP file.
+    gzip, pickle: Provide the compression and serialization of the binary collider format.
 """
+
 # ==================================================================================================
 # --- Imports
 # ==================================================================================================
 
 # Import standard library modules
+import gzip
 import os
+import pickle
 from zipfile import ZIP_DEFLATED, ZipFile
 
 # Import third-party modules
+import numpy as np
+import xtrack as xt
 
 # Import user-defined modules
 
 
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Extension of the collider files in binary format (followed by .gz if compressed)
+BINARY_COLLIDER_EXTENSION = ".pkl"
+
+# Objects that can be loaded from a binary collider file (plain containers and numpy arrays)
+DIC_ALLOWED_GLOBALS = {
+    "builtins": {"complex", "dict", "float", "frozenset", "int", "list", "set", "slice", "tuple"},
+    "collections": {"OrderedDict", "defaultdict"},
+    "numpy": {"dtype", "ndarray"},
+    "numpy.core.multiarray": {"_reconstruct", "scalar"},
+    "numpy.core.numeric": {"_frombuffer"},
+    "numpy._core.multiarray": {"_reconstruct", "scalar"},
+    "numpy._core.numeric": {"_frombuffer"},
+}
+
+
 # ==================================================================================================
 # --- Function definition
 # ==================================================================================================
@@ -48,3 +78,86 @@ def compress_and_write(path_to_file: str) -> str:
     os.remove(path_to_file)
 
     return f"{path_to_file}.zip"
+
+
+class _ColliderUnpickler(pickle.Unpickler):
+    """Unpickler restricted to the objects of a collider dictionary, such that loading a binary
+    collider file can't execute arbitrary code."""
+
+    def find_class(self, module: str, name: str):
+        if name in DIC_ALLOWED_GLOBALS.get(module, set()):
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a collider file")
+
+
+def _to_plain_objects(obj):
+    """Recursively converts the arrays of a collider dictionary (possibly views of xobjects
+    buffers) to plain numpy arrays."""
+    if isinstance(obj, dict):
+        return {key: _to_plain_objects(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_to_plain_objects(value) for value in obj]
+    if isinstance(obj, tuple):
+        return tuple(_to_plain_objects(value) for value in obj)
+    if isinstance(obj, np.ndarray) and type(obj) is not np.ndarray:
+        return np.array(obj)
+    return obj
+
+
+def get_path_binary_collider(path_collider: str, compress: bool = False) -> str:
+    """Returns the path of the binary collider file corresponding to a collider file path, e.g.
+    collider.json (or collider.json.zip) becomes collider.pkl (or collider.pkl.gz if compressed).
+
+    Args:
+        path_collider (str): Path to the collider file, in any format.
+        compress (bool, optional): Whether the binary file is compressed. Defaults to False.
+
+    Returns:
+        str: Path to the binary collider file.
+    """
+    for suffix in [".gz", BINARY_COLLIDER_EXTENSION, ".zip", ".json"]:
+        path_collider = path_collider.removesuffix(suffix)
+    return f"{path_collider}{BINARY_COLLIDER_EXTENSION}" + (".gz" if compress else "")
+
+
+def write_collider_binary(collider: xt.Multiline, path_collider: str, compress: bool) -> str:
+    """Writes a collider to disk in the binary format: the dictionary of the collider (as in the
+    JSON format) serialized with pickle, the arrays being stored as raw buffers, and optionally
+    compressed with gzip. Writing (especially compressed) and parsing are faster than with JSON,
+    the file is smaller, and the compressed file does not need to be extracted to disk before
+    being loaded. Building the collider from its dictionary is unchanged.
+
+    Args:
+        collider (xt.Multiline): The collider to write.
+        path_collider (str): Path to the collider file, in any format (see
+            get_path_binary_collider).
+        compress (bool): Whether to compress the file.
+
+    Returns:
+        path_to_output (str): Path to the binary collider file.
+    """
+    path_binary = get_path_binary_collider(path_collider, compress)
+    dic_collider = _to_plain_objects(collider.to_dict(include_version=True))
+    with (
+        gzip.open(path_binary, "wb", compresslevel=6) if compress else open(path_binary, "wb")
+    ) as fid:
+        pickle.dump(dic_collider, fid, protocol=5)
+    return path_binary
+
+
+def load_collider_binary(path_collider: str) -> xt.Multiline:
+    """Loads a collider written in the binary format (see write_collider_binary).
+
+    Args:
+        path_collider (str): Path to the binary collider file (ending with .gz if compressed).
+
+    Returns:
+        xt.Multiline: The loaded collider.
+    """
+    with (
+        gzip.open(path_collider, "rb")
+        if path_collider.endswith(".gz")
+        else open(path_collider, "rb")
+    ) as fid:
+        dic_collider = _ColliderUnpickler(fid).load()
+    return xt.Multiline.from_dict(dic_collider)
@@ -10,6 +10,8 @@ import json
 import logging
 import os
 import pathlib
+import shutil
+import tempfile
 from typing import Any
 from zipfile import ZipFile
 
@@ -32,8 +34,15 @@ from ..version_specific_files.runIII import (
 from ..version_specific_files.runIII_ions import (
     generate_orbit_correction_setup as gen_corr_runIII_ions,
 )
+from .collider_cache import PREFIX_TEMP_ENTRY, ColliderCache
 from .scheme_utils import get_worst_bunch, load_and_check_filling_scheme
-from .utils import compress_and_write
+from .utils import (
+    BINARY_COLLIDER_EXTENSION,
+    compress_and_write,
+    get_path_binary_collider,
+    load_collider_binary,
+    write_collider_binary,
+)
 from .xsuite_leveling import compute_PU, luminosity_leveling_ip1_5
 
 # ==================================================================================================
@@ -62,6 +71,9 @@ class XsuiteCollider:
         _crab (bool or None): Flag indicating if crab cavities are used.
         save_output_collider (bool): Flag indicating if the final collider should be saved.
         path_collider_file_for_tracking_as_output (str): Path to save the final collider.
+        collider_format (str): Format of the final collider file, "json" or "binary".
+        path_node_cache (str or None): Path to the node-local cache of the input colliders.
+        max_size_node_cache (float): Maximum size of the node-local cache, in GB.
 
     Methods:
         dict_orbit_correction: Property to get the dictionary for orbit correction.
@@ -102,8 +114,15 @@ class XsuiteCollider:
                 - config_lumi_leveling (dict): Configuration for luminosity leveling.
                 - save_output_collider (bool): Flag to save the final collider to disk.
                 - path_collider_file_for_tracking_as_output (str): Path to save the final collider.
+                - collider_format (str, optional): Format of the final collider file, "json" or
+                    "binary". Defaults to "json".
                 - config_lumi_leveling_ip1_5 (optional): Configuration for luminosity leveling at
                     IP1 and IP5.
+                - path_node_cache (str, optional): Path to a node-local folder in which the input
+                    collider is staged (in binary format) for the jobs running on the same node.
+                    Defaults to None (no staging).
+                - max_size_node_cache (float, optional): Maximum size of the node-local cache, in
+                    GB. Defaults to 20.
             path_collider_file_for_configuration_as_input (str): Path to the collider file.
             ver_hllhc_optics (float): Version of the HL-LHC optics.
             ver_lhc_run (float): Version of the LHC run.
@@ -142,6 +161,18 @@ class XsuiteCollider:
             "path_collider_file_for_tracking_as_output"
         ]
         self.compress = configuration["compress"]
+        self.collider_format: str = configuration.get("collider_format", "json")
+        if self.collider_format not in ["json", "binary"]:
+            raise ValueError(
+                f"Collider format {self.collider_format} is not recognized. Please use 'json' or "
+                "'binary'."
+            )
+
+        # Node-local cache of the input collider, shared by the sibling jobs
+        self.path_node_cache: str | None = configuration.get("path_node_cache")
+        if self.path_node_cache is not None:
+            self.path_node_cache = os.path.expandvars(self.path_node_cache)
+        self.max_size_node_cache: float = configuration.get("max_size_node_cache", 20.0)
 
     @property
     def dict_orbit_correction(self) -> dict:
@@ -182,22 +213,56 @@ class XsuiteCollider:
 
         return self._dict_orbit_correction
 
+    @staticmethod
+    def _get_path_collider_file(path_collider: str) -> str:
+        """
+        Get the path to the file actually containing the collider: the binary version of the file
+        (see write_collider_binary) in priority if it exists, compressed or not, and is at least
+        as recent as the JSON (or zipped) version, then the zipped version of the file if it
+        exists, and the file itself otherwise.
+
+        Args:
+            path_collider (str): The path to the collider file.
+
+        Returns:
+            str: The path to the file to load.
+        """
+        if BINARY_COLLIDER_EXTENSION in os.path.basename(path_collider):
+            return path_collider
+
+        # Correct collider file path if it is a zip file
+        path_text = path_collider
+        if os.path.exists(f"{path_collider}.zip") and not path_collider.endswith(".zip"):
+            path_text = f"{path_collider}.zip"
+
+        # Don't load a binary file older than the JSON, as the JSON might have been regenerated
+        mtime_text = os.path.getmtime(path_text) if os.path.exists(path_text) else -np.inf
+        for compress in [True, False]:
+            path_binary = get_path_binary_collider(path_collider, compress=compress)
+            if os.path.exists(path_binary) and os.path.getmtime(path_binary) >= mtime_text:
+                return path_binary
+        return path_text
+
     @staticmethod
     def _load_collider(path_collider) -> xt.Multiline:
         """
         Load a collider configuration from a file using an external path.
 
-        If the file path ends with ".zip", the file is uncompressed locally
-        and the collider configuration is loaded from the uncompressed file.
-        Otherwise, the collider configuration is loaded directly from the file.
+        The binary version of the file (see write_collider_binary) is loaded in priority if it
+        exists, compressed or not, and is not older than the JSON (or zipped) file. Otherwise, if the file path ends with ".zip" (or if a zipped
+        version of the file exists), the file is uncompressed locally and the collider
+        configuration is loaded from the uncompressed file. Otherwise, the collider configuration
+        is loaded directly from the JSON file.
 
         Returns:
             xt.Multiline: The loaded collider configuration.
         """
+        path_collider = XsuiteCollider._get_path_collider_file(path_collider)
 
-        # Correct collider file path if it is a zip file
-        if os.path.exists(f"{path_collider}.zip") and not path_collider.endswith(".zip"):
-            path_collider += ".zip"
+        # Load the binary file if it exists
+        if BINARY_COLLIDER_EXTENSION in os.path.basename(path_collider):
+            logging.info(f"Loading binary collider {path_collider}")
+            return load_collider_binary(path_collider)
 
         # Load as a json if not zip
         if not path_collider.endswith(".zip"):
@@ -214,14 +279,63 @@ class XsuiteCollider:
         """
         Load a collider configuration from a file.
 
-        If the file path ends with ".zip", the file is uncompressed locally
-        and the collider configuration is loaded from the uncompressed file.
-        Otherwise, the collider configuration is loaded directly from the file.
+        The binary version of the file is loaded in priority if it exists. Otherwise, if the file
+        path ends with ".zip", the file is uncompressed locally and the collider configuration is
+        loaded from the uncompressed file. Otherwise, the collider configuration is loaded
+        directly from the file.
+
+        If a node-local cache is configured, the collider is first staged in the cache, in
+        uncompressed binary format, by the first job of the node needing it (the others wait for
+        it), and then loaded from the cache.
+
+        Returns:
+            xt.Multiline: The loaded collider configuration.
+        """
+        if self.path_node_cache is None:
+            return self._load_collider(self.path_collider_file_for_configuration_as_input)
+        return self._load_collider_from_node_cache()
+
+    def _load_collider_from_node_cache(self) -> xt.Multiline:
+        """
+        Load the input collider from the node-local cache, staging it in the cache first if
+        needed. The entries are indexed by the hash of the content of the source file.
 
         Returns:
             xt.Multiline: The loaded collider configuration.
         """
-        return self._load_collider(self.path_collider_file_for_configuration_as_input)
+        path_source = self._get_path_collider_file(
+            self.path_collider_file_for_configuration_as_input
+        )
+        node_cache = ColliderCache(self.path_node_cache, self.max_size_node_cache)
+        key = node_cache.get_hash_file(path_source)
+        name_staged = f"collider{BINARY_COLLIDER_EXTENSION}"
+
+        path_staged = node_cache.get_path(key, name_staged)
+        if path_staged is None:
+            with node_cache.get_lock_entry(key):
+                # The collider may have been staged by another job in the meantime
+                path_staged = node_cache.get_path(key, name_staged)
+                if path_staged is None:
+                    collider = self._load_collider(path_source)
+                    logging.info(f"Staging collider {path_source} in {node_cache.path_cache}")
+                    path_temp = tempfile.mkdtemp(
+                        prefix=PREFIX_TEMP_ENTRY, dir=node_cache.path_cache
+                    )
+                    try:
+                        path_binary = write_collider_binary(
+                            collider, f"{path_temp}/collider.json", compress=False
+                        )
+                        node_cache.put(key, path_binary, move=True)
+                    finally:
+                        shutil.rmtree(path_temp, ignore_errors=True)
+                    return collider
+
+        try:
+            logging.info(f"Loading staged collider {path_staged}")
+            return load_collider_binary(path_staged)
+        except FileNotFoundError:
+            # Entry evicted in the meantime
+            return self._load_collider(path_source)
 
     def install_beam_beam_wrapper(self, collider: xt.Multiline) -> None:
         """
@@ -826,7 +940,8 @@ class XsuiteCollider:
 
     def write_collider_to_disk(self, collider, full_configuration) -> None:
         """
-        Writes the collider object to disk in JSON format if the save_output_collider flag is set.
+        Writes the collider object to disk in JSON format (or in binary format, depending on
+        collider_format) if the save_output_collider flag is set.
 
         Args:
             collider (Collider): The collider object to be saved.
@@ -837,7 +952,7 @@ class XsuiteCollider:
             None
         """
         if self.save_output_collider:
-            logging.info("Saving collider as json")
+            logging.info(f"Saving collider as {self.collider_format}")
             if (
                 hasattr(collider, "metadata")
                 and collider.metadata is not None
@@ -846,6 +961,11 @@ class XsuiteCollider:
                 collider.metadata.update(copy.deepcopy(full_configuration))
             else:
                 collider.metadata = copy.deepcopy(full_configuration)
+            if self.collider_format == "binary":
+                write_collider_binary(
+                    collider, self.path_collider_file_for_tracking_as_output, self.compress
+                )
+                return
             collider.to_json(self.path_collider_file_for_tracking_as_output)
 
             # Compress the collider file to zip to ease the load on afs
@@ -5,17 +5,99 @@
 # ==================================================================================================
 
 # Import standard library modules
+import glob
+import hashlib
 import logging
+import multiprocessing
+import os
 import time
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
 
 # Import third-party modules
+import fastparquet
 import numpy as np
 import pandas as pd
 import xobjects as xo
 import xpart as xp
 import xtrack as xt
 
+# Import user-defined modules
+from .particles_distribution import ParticlesDistribution
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Coordinates of the initial particles identifying a simulation, for the checkpoints
+L_KEYS_PARTICLES_HASHED = ["particle_id", "x", "px", "y", "py", "zeta", "delta"]
+
+# Prefix of the particle arrays in the checkpoint file
+PREFIX_CHECKPOINT_PARTICLES = "particles."
+
+# Number of turns between two checks of the surviving particles, if not tracking by chunks
+N_TURNS_PER_CHUNK_STOP_IF_ALL_LOST = 1000
+
+# ==================================================================================================
+# --- Functions for the worker processes
+# ==================================================================================================
+# Tracking instance and line used by the worker processes (inherited when the workers are forked,
+# such that the line is not serialized)
+_worker_state: Optional[tuple["XsuiteTracking", xt.Line]] = None
+
+
+def _track_shard(dic_particles: dict, idx_shard: int) -> tuple[dict, int]:
+    """
+    Tracks a shard of the particles in a worker process.
+
+    Args:
+        dic_particles (dict): A dictionary representation of the particles of the shard.
+        idx_shard (int): The index of the shard, used to name its checkpoint file.
+
+    Returns:
+        tuple: A tuple containing:
+            - dict: A dictionary representation of the tracked particles of the shard.
+            - int: The number of turns actually tracked.
+    """
+    xst, line = _worker_state  # type: ignore
+    particles = xp.Particles.from_dict(dic_particles, _context=xst.context)
+    path_checkpoint = (
+        xst.get_path_checkpoint_shard(idx_shard) if xst.path_checkpoint is not None else None
+    )
+    return xst._track_line(line, particles, path_checkpoint), xst.n_turns_tracked
+
+
+def merge_particles_dicts(
+    l_dic_particles: list[dict], array_order: Optional[np.ndarray] = None
+) -> dict:
+    """
+    Merges the dictionary representations of several sets of particles into one, ordered by
+    parent_particle_id.
+
+    Args:
+        l_dic_particles (list[dict]): The dictionary representations of the particles.
+        array_order (Optional[np.ndarray], optional): The values by which the merged particles are
+            ordered, instead of parent_particle_id. Defaults to None.
+
+    Returns:
+        dict: The dictionary representation of all the particles.
+    """
+    dic_particles = {
+        key: (
+            np.concatenate([np.asarray(dic[key]) for dic in l_dic_particles])
+            if np.ndim(value) > 0
+            else value
+        )
+        for key, value in l_dic_particles[0].items()
+    }
+    if array_order is None:
+        array_order = dic_particles["parent_particle_id"]
+    idx_sort = np.argsort(array_order, kind="stable")
+    return {
+        key: value[idx_sort] if np.ndim(value) > 0 else value
+        for key, value in dic_particles.items()
+    }
+
+
 # ==================================================================================================
 # --- Class definition
 # ==================================================================================================
@@ -31,15 +113,29 @@ class XsuiteTracking:
         _context (xo.Context): The context object for the simulation.
         beam (str): The beam configuration.
         distribution_file (str): The file path to the particle data.
+        distribution_row_group (int or None): The row group of the particle file to track (None
+            to track the whole file).
         delta_max (float): The maximum delta value for particles.
         n_turns (int): The number of turns for the simulation.
         nemitt_x (float): The normalized emittance in the x direction.
         nemitt_y (float): The normalized emittance in the y direction.
+        n_turns_per_chunk (int or None): The number of turns tracked at once (None to track all
+            the turns at once).
+        path_checkpoint (str or None): The file in which the state of the particles is saved after
+            each chunk of turns.
+        n_processes (int): The number of processes in which the particles are tracked (cpu
+            context only).
+        stop_if_all_lost (bool): Whether the tracking stops as soon as all the particles are lost.
+        n_turns_tracked (int or None): The number of turns actually tracked (None before
+            tracking).
 
     Methods:
         context: Get the context object for the simulation.
         prepare_particle_distribution_for_tracking: Prepare the particle distribution for tracking.
         track: Track the particles in the collider.
+        track_adaptive: Track the particles, refining the distribution around the DA boundary.
+        get_path_checkpoint_shard: Get the checkpoint file of a shard of the particles.
+        remove_checkpoint: Remove the checkpoint file once the output has been saved.
     """
 
     def __init__(self, configuration: dict, nemitt_x: float, nemitt_y: float) -> None:
@@ -53,8 +149,22 @@ class XsuiteTracking:
                 - "device_number": int, device number for the simulation.
                 - "beam": str, beam type for the simulation.
                 - "distribution_file": str, path to the particle file.
+                - "distribution_row_group" (optional): int, row group of the particle file to
+                    track, if the distribution was written as a single file. Defaults to None (the
+                    whole file).
                 - "delta_max": float, maximum delta value for the simulation.
                 - "n_turns": int, number of turns for the simulation.
+                - "n_turns_per_chunk" (optional): int, number of turns tracked at once. Defaults
+                    to None (all the turns at once).
+                - "path_checkpoint" (optional): str, file in which the state of the particles is
+                    saved after each chunk of turns, to resume the tracking if the job is
+                    interrupted. Defaults to None (no checkpoint).
+                - "n_processes" (optional): int, number of processes in which the particles are
+                    split for the tracking, on the cpu context. Defaults to 1.
+                - "stop_if_all_lost" (optional): bool, whether the tracking stops as soon as all
+                    the particles are lost (checked after each chunk of turns, or every
+                    N_TURNS_PER_CHUNK_STOP_IF_ALL_LOST turns if n_turns_per_chunk is not set).
+                    Defaults to False if absent, but the template configurations set it to True.
             nemitt_x (float): Normalized emittance in the x-plane.
             nemitt_y (float): Normalized emittance in the y-plane.
         """
@@ -68,9 +178,31 @@ class XsuiteTracking:
         self.distribution_file: str = configuration["distribution_file"]
         self.path_distribution_folder_input: str = configuration["path_distribution_folder_input"]
         self.particle_path: str = f"{self.path_distribution_folder_input}/{self.distribution_file}"
+        self.distribution_row_group: Optional[int] = configuration.get("distribution_row_group")
         self.delta_max: float = configuration["delta_max"]
         self.n_turns: int = configuration["n_turns"]
 
+        # Chunked tracking and checkpoints
+        self.n_turns_per_chunk: Optional[int] = configuration.get("n_turns_per_chunk")
+        self.path_checkpoint: Optional[str] = configuration.get("path_checkpoint")
+        if self.path_checkpoint is not None and self.n_turns_per_chunk is None:
+            raise ValueError("Checkpoints require the tracking to be done in chunks of turns.")
+
+        # Early termination of the tracking (checked between chunks of turns)
+        self.stop_if_all_lost: bool = configuration.get("stop_if_all_lost", False)
+        if self.stop_if_all_lost and self.n_turns_per_chunk is None:
+            self.n_turns_per_chunk = N_TURNS_PER_CHUNK_STOP_IF_ALL_LOST
+
+        # The throughput of each chunk is only logged if the chunks were explicitly requested
+        self._log_chunks: bool = configuration.get("n_turns_per_chunk") is not None
+        self.n_turns_tracked: Optional[int] = None
+
+        # Number of processes for the tracking on cpu
+        self.n_processes: int = configuration.get("n_processes", 1)
+        if self.n_processes > 1 and self.context_str != "cpu":
+            logging.warning("Number of processes will be ignored since context is not cpu")
+            self.n_processes = 1
+
         # Beambeam parameters
         self.nemitt_x: float = nemitt_x
         self.nemitt_y: float = nemitt_y
@@ -118,7 +250,8 @@ class XsuiteTracking:
         """
         Prepare a particle distribution for tracking in the collider.
 
-        This method reads particle data from a parquet file, processes the data to
+        This method reads particle data from a parquet file (or from one of its row
+        groups, if distribution_row_group is set), processes the data to
         generate normalized amplitudes and angles, and then builds particles for
         tracking in the collider. If the context is set to use GPU, the collider
         trackers are reset and rebuilt accordingly.
@@ -139,15 +272,39 @@ class XsuiteTracking:
             collider.discard_trackers()
             collider.build_trackers(_context=self.context)
 
-        particle_df = pd.read_parquet(self.particle_path)
+        if self.distribution_row_group is None:
+            particle_df = pd.read_parquet(self.particle_path)
+        else:
+            particle_df = fastparquet.ParquetFile(self.particle_path)[
+                self.distribution_row_group
+            ].to_pandas()
 
         r_vect = particle_df["normalized amplitude in xy-plane"].values
         theta_vect = particle_df["angle in xy-plane [deg]"].values * np.pi / 180  # type: ignore # [rad]
 
+        particles = self._build_particles(collider, r_vect, theta_vect)  # type: ignore
+
+        particle_id = particle_df.particle_id.values
+        return particles, particle_id, r_vect, theta_vect
+
+    def _build_particles(
+        self, collider: xt.Multiline, r_vect: np.ndarray, theta_vect: np.ndarray
+    ) -> xp.Particles:
+        """
+        Builds the particles to track from their normalized amplitudes and angles.
+
+        Args:
+            collider (xt.Multiline): The collider object containing the beam.
+            r_vect (np.ndarray): Array of normalized amplitudes in the xy-plane.
+            theta_vect (np.ndarray): Array of angles in the xy-plane in radians.
+
+        Returns:
+            xp.Particles: The particles ready for tracking.
+        """
         A1_in_sigma = r_vect * np.cos(theta_vect)
         A2_in_sigma = r_vect * np.sin(theta_vect)
 
-        particles = collider[self.beam].build_particles(
+        return collider[self.beam].build_particles(
             x_norm=A1_in_sigma,
             y_norm=A2_in_sigma,
             delta=self.delta_max,
@@ -158,13 +315,24 @@ class XsuiteTracking:
             _context=self.context,
         )
 
-        particle_id = particle_df.particle_id.values
-        return particles, particle_id, r_vect, theta_vect
-
     def track(self, collider: xt.Multiline, particles: xp.Particles) -> dict:
         """
         Tracks particles through a collider for a specified number of turns and logs the elapsed time.
 
+        If n_turns_per_chunk is set, the turns are tracked by chunks, and the throughput of each
+        chunk is logged (unlike the implicit chunks of stop_if_all_lost). If path_checkpoint is
+        also set, the state of the particles is saved after each chunk, and the tracking resumes
+        from the last checkpoint if the job is restarted. The tracked particles are the same in
+        all cases.
+
+        If n_processes is larger than 1, the particles are split in as many shards, tracked in
+        parallel by forked processes (each with its own copy of the line), and merged back in the
+        order of parent_particle_id.
+
+        If stop_if_all_lost is set, the tracking stops after the first chunk of turns at the end
+        of which all the particles are lost. The number of turns actually tracked is stored in
+        n_turns_tracked.
+
         Args:
             collider (xt.Multiline): The collider object containing the beamline to be tracked.
             particles (xp.Particles): The particles to be tracked.
@@ -175,11 +343,181 @@ class XsuiteTracking:
         # Optimize line for tracking
         collider[self.beam].optimize_for_tracking()
 
+        return self._track_optimized(collider[self.beam], particles)
+
+    def track_adaptive(
+        self, collider: xt.Multiline, particles_distribution: ParticlesDistribution
+    ) -> tuple:
+        """
+        Tracks the (coarse) distribution of the particle file, and then refines it around the DA
+        boundary: the particles halfway between a surviving particle and a lost particle are
+        tracked, round after round, until the boundary is resolved as finely as with the full
+        distribution (see ParticlesDistribution.refine_distribution).
+
+        The checkpoints (if any) are saved separately for each round, such that the rounds already
+        tracked are skipped if the job is restarted.
+
+        Args:
+            collider (xt.Multiline): The collider object containing the beamline to be tracked.
+            particles_distribution (ParticlesDistribution): The distribution (in adaptive mode)
+                from which the particle file was generated.
+
+        Returns:
+            tuple: A tuple containing:
+                - dict: A dictionary representation of all the tracked particles, ordered by
+                    particle ID (with parent_particle_id in the same order).
+                - np.ndarray: Array of particle IDs.
+                - np.ndarray: Array of normalized amplitudes in the xy-plane.
+                - np.ndarray: Array of angles in the xy-plane in radians.
+        """
+        particles, particle_id, r_vect, theta_vect = (
+            self.prepare_particle_distribution_for_tracking(collider)
+        )
+
+        # Optimize line for tracking
+        collider[self.beam].optimize_for_tracking()
+
+        l_dic_particles, l_particle_id, l_r_vect, l_theta_vect = [], [], [], []
+        l_n_turns_tracked = []
+        path_checkpoint = self.path_checkpoint
+        try:
+            while True:
+                # Distinct checkpoints for each round
+                if path_checkpoint is not None:
+                    root, extension = os.path.splitext(path_checkpoint)
+                    self.path_checkpoint = f"{root}_round_{len(l_dic_particles)}{extension}"
+
+                # Track, ordering the particles as built
+                l_dic_particles.append(
+                    merge_particles_dicts([self._track_optimized(collider[self.beam], particles)])
+                )
+                l_particle_id.append(particle_id)
+                l_r_vect.append(r_vect)
+                l_theta_vect.append(theta_vect)
+                l_n_turns_tracked.append(self.n_turns_tracked)
+
+                # Refine the distribution around the boundary
+                array_particles = particles_distribution.refine_distribution(
+                    np.concatenate(l_particle_id),
+                    np.concatenate(
+                        [dic_particles["state"] > 0 for dic_particles in l_dic_particles]
+                    ),
+                )
+                logging.info(
+                    f"Round {len(l_dic_particles) - 1}: {len(particle_id)} particles tracked, "
+                    f"{len(array_particles)} particles to track around the DA boundary"
+                )
+                if len(array_particles) == 0:
+                    break
+                particle_id = array_particles[:, 0]
+                r_vect = array_particles[:, 1]
+                theta_vect = array_particles[:, 2] * np.pi / 180  # [rad]
+                particles = self._build_particles(collider, r_vect, theta_vect)
+        finally:
+            self.path_checkpoint = path_checkpoint
+        self.n_turns_tracked = max(l_n_turns_tracked)
+
+        # Merge all the rounds, ordered by particle ID
+        particle_id = np.concatenate(l_particle_id)
+        idx_sort = np.argsort(particle_id, kind="stable")
+        dic_particles = merge_particles_dicts(l_dic_particles, array_order=particle_id)
+        dic_particles["parent_particle_id"] = np.arange(len(particle_id))
+        dic_particles["particle_id"] = np.arange(len(particle_id))
+        return (
+            dic_particles,
+            particle_id[idx_sort],
+            np.concatenate(l_r_vect)[idx_sort],
+            np.concatenate(l_theta_vect)[idx_sort],
+        )
+
+    def _track_optimized(self, line: xt.Line, particles: xp.Particles) -> dict:
+        """
+        Tracks particles through an optimized line, splitting them across processes if needed.
+
+        Args:
+            line (xt.Line): The (optimized) line to be tracked.
+            particles (xp.Particles): The particles to be tracked.
+
+        Returns:
+            dict: A dictionary representation of the tracked particles.
+        """
+        # Split the particles across processes if needed
+        if self.n_processes > 1:
+            return self._track_in_processes(line, particles)
+        return self._track_line(line, particles, self.path_checkpoint)
+
+    def _track_in_processes(self, line: xt.Line, particles: xp.Particles) -> dict:
+        """
+        Tracks particles through a line by splitting them across n_processes forked processes (or
+        fewer, if there are fewer particles than processes).
+
+        Args:
+            line (xt.Line): The (optimized) line to be tracked.
+            particles (xp.Particles): The particles to be tracked.
+
+        Returns:
+            dict: A dictionary representation of the tracked particles, ordered by
+                parent_particle_id.
+        """
+        global _worker_state
+        dic_particles = particles.to_dict(remove_unused_space=True)
+        n_particles = len(dic_particles["parent_particle_id"])
+
+        # No empty shard, and no process needed for a single shard
+        n_shards = min(self.n_processes, n_particles)
+        if n_shards <= 1:
+            return merge_particles_dicts([self._track_line(line, particles, self.path_checkpoint)])
+        l_idx_bounds = np.linspace(0, n_particles, n_shards + 1).astype(int)
+        l_dic_shards = [
+            {
+                key: value[idx_start:idx_end] if np.ndim(value) > 0 else value
+                for key, value in dic_particles.items()
+            }
+            for idx_start, idx_end in zip(l_idx_bounds[:-1], l_idx_bounds[1:])
+        ]
+
+        a = time.time()
+        _worker_state = (self, line)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_shards, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                l_dic_tracked, l_n_turns_tracked = zip(
+                    *executor.map(_track_shard, l_dic_shards, range(len(l_dic_shards)))
+                )
+        finally:
+            _worker_state = None
+        b = time.time()
+
+        logging.info(f"Elapsed time ({n_shards} processes): {b-a} s")
+        logging.info(f"Elapsed time per particle per turn: {(b-a)/n_particles/self.n_turns*1e6} us")
+        self.n_turns_tracked = max(l_n_turns_tracked)
+        return merge_particles_dicts(list(l_dic_tracked))
+
+    def _track_line(
+        self, line: xt.Line, particles: xp.Particles, path_checkpoint: Optional[str]
+    ) -> dict:
+        """
+        Tracks particles through a line, at once or by chunks of turns.
+
+        Args:
+            line (xt.Line): The (optimized) line to be tracked.
+            particles (xp.Particles): The particles to be tracked.
+            path_checkpoint (Optional[str]): The checkpoint file, if any.
+
+        Returns:
+            dict: A dictionary representation of the tracked particles.
+        """
+        # Track by chunks if needed
+        if self.n_turns_per_chunk is not None:
+            return self._track_by_chunks(line, particles, path_checkpoint)
+
         # Track
         num_turns = self.n_turns
         a = time.time()
-        collider[self.beam].track(particles, turn_by_turn_monitor=False, num_turns=num_turns)
+        line.track(particles, turn_by_turn_monitor=False, num_turns=num_turns)
         b = time.time()
+        self.n_turns_tracked = num_turns
 
         logging.info(f"Elapsed time: {b-a} s")
         logging.info(
@@ -187,3 +525,168 @@ class XsuiteTracking:
         )
 
         return particles.to_dict()
+
+    def _track_by_chunks(
+        self, line: xt.Line, particles: xp.Particles, path_checkpoint: Optional[str]
+    ) -> dict:
+        """
+        Tracks particles through a line by chunks of n_turns_per_chunk turns, resuming from the
+        checkpoint if there is one, and saving a checkpoint after each chunk if needed. If
+        stop_if_all_lost is set, the tracking stops as soon as no particle is alive.
+
+        Args:
+            line (xt.Line): The (optimized) line to be tracked.
+            particles (xp.Particles): The particles to be tracked.
+            path_checkpoint (Optional[str]): The checkpoint file, if any.
+
+        Returns:
+            dict: A dictionary representation of the tracked particles.
+        """
+        # Resume from the checkpoint if it corresponds to the same particles
+        n_turns_done = 0
+        hash_particles = None
+        if path_checkpoint is not None:
+            hash_particles = self._get_hash_particles(particles)
+            particles_checkpoint, n_turns_done = self._load_checkpoint(
+                path_checkpoint, hash_particles
+            )
+            if particles_checkpoint is not None:
+                logging.info(f"Resuming tracking from turn {n_turns_done} ({path_checkpoint})")
+                particles = particles_checkpoint
+
+        a = time.time()
+        while n_turns_done < self.n_turns:
+            if self.stop_if_all_lost and not np.any(
+                self.context.nparray_from_context_array(particles.state) > 0
+            ):
+                logging.info(f"All particles lost, tracking stopped after {n_turns_done} turns")
+                break
+            num_turns = min(self.n_turns_per_chunk, self.n_turns - n_turns_done)  # type: ignore
+            time_chunk = time.time()
+            line.track(particles, turn_by_turn_monitor=False, num_turns=num_turns)
+            n_turns_done += num_turns
+            duration_chunk = time.time() - time_chunk
+            if self._log_chunks:
+                logging.info(
+                    f"Turns {n_turns_done - num_turns} to {n_turns_done} tracked in "
+                    f"{duration_chunk:.2f} s "
+                    f"({particles._capacity * num_turns / duration_chunk:.3e} particles.turns/s)"
+                )
+
+            if path_checkpoint is not None:
+                self._write_checkpoint(
+                    path_checkpoint, particles, n_turns_done, hash_particles  # type: ignore
+                )
+        b = time.time()
+        self.n_turns_tracked = n_turns_done
+
+        logging.info(f"Elapsed time: {b-a} s")
+        return particles.to_dict()
+
+    def _get_hash_particles(self, particles: xp.Particles) -> str:
+        """
+        Returns a hash of the initial coordinates of the particles, used to check that a
+        checkpoint corresponds to the current simulation.
+
+        Args:
+            particles (xp.Particles): The particles before tracking.
+
+        Returns:
+            str: The SHA-256 hash of the coordinates, as a hexadecimal string.
+        """
+        dic_particles = particles.to_dict()
+        hasher = hashlib.sha256()
+        for key in L_KEYS_PARTICLES_HASHED:
+            hasher.update(np.ascontiguousarray(dic_particles[key]).tobytes())
+        return hasher.hexdigest()
+
+    def _write_checkpoint(
+        self, path_checkpoint: str, particles: xp.Particles, n_turns_done: int, hash_particles: str
+    ) -> None:
+        """
+        Saves the state of the particles (including the state of the random generators) to the
+        checkpoint file. The file is written atomically, such that an interrupted job always
+        leaves a valid checkpoint.
+
+        Args:
+            path_checkpoint (str): The checkpoint file.
+            particles (xp.Particles): The particles being tracked.
+            n_turns_done (int): The number of turns already tracked.
+            hash_particles (str): The hash of the initial coordinates of the particles.
+        """
+        dic_checkpoint = {
+            f"{PREFIX_CHECKPOINT_PARTICLES}{key}": np.asarray(value)
+            for key, value in particles.to_dict(keep_rng_state=True).items()
+        }
+        path_temp = f"{path_checkpoint}.tmp"
+        with open(path_temp, "wb") as fid:
+            np.savez(
+                fid, n_turns_done=n_turns_done, hash_particles=hash_particles, **dic_checkpoint
+            )
+        os.replace(path_temp, path_checkpoint)
+
+    def _load_checkpoint(
+        self, path_checkpoint: str, hash_particles: str
+    ) -> tuple[Optional[xp.Particles], int]:
+        """
+        Loads the state of the particles from the checkpoint file, if it exists and corresponds
+        to the current simulation.
+
+        Args:
+            path_checkpoint (str): The checkpoint file.
+            hash_particles (str): The hash of the initial coordinates of the particles.
+
+        Returns:
+            tuple: A tuple containing:
+                - xp.Particles or None: The particles saved in the checkpoint, or None if there
+                    is no valid checkpoint.
+                - int: The number of turns already tracked.
+        """
+        if not os.path.exists(path_checkpoint):
+            return None, 0
+
+        with np.load(path_checkpoint) as checkpoint:
+            n_turns_done = int(checkpoint["n_turns_done"])
+            if str(checkpoint["hash_particles"]) != hash_particles or n_turns_done > self.n_turns:
+                logging.warning(
+                    f"Checkpoint {path_checkpoint} doesn't correspond to the current "
+                    "simulation, it will be ignored"
+                )
+                return None, 0
+            dic_particles = {
+                key.removeprefix(PREFIX_CHECKPOINT_PARTICLES): checkpoint[key][()]
+                for key in checkpoint.files
+                if key.startswith(PREFIX_CHECKPOINT_PARTICLES)
+            }
+
+        particles = xp.Particles.from_dict(dic_particles, _context=self.context)
+        return particles, n_turns_done
+
+    def get_path_checkpoint_shard(self, idx_shard: int) -> str:
+        """
+        Returns the checkpoint file of a shard of the particles, when they are tracked in several
+        processes.
+
+        Args:
+            idx_shard (int): The index of the shard.
+
+        Returns:
+            str: The path to the checkpoint file of the shard.
+        """
+        root, extension = os.path.splitext(self.path_checkpoint)  # type: ignore
+        return f"{root}_{idx_shard}{extension}"
+
+    def remove_checkpoint(self) -> None:
+        """
+        Removes the checkpoint files (if any), e.g. once the output of the tracking has been
+        saved.
+        """
+        if self.path_checkpoint is None:
+            return
+
+        # Checkpoints of the shards and of the rounds of the adaptive tracking
+        root, extension = os.path.splitext(self.path_checkpoint)
+        l_path_checkpoints = [self.path_checkpoint] + glob.glob(f"{glob.escape(root)}_*{extension}")
+        for path_checkpoint in l_path_checkpoints:
+            if os.path.exists(path_checkpoint):
+                os.remove(path_checkpoint)
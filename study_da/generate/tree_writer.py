@@ -0,0 +1,158 @@
+"""This class is used to write the tree of a study to disk while the study is being generated,
+without keeping the whole tree in memory.
+
+The jobs must be written in the order in which they appear in the tree (depth first), which is
+the order in which GenerateScan.browse_and_stream_study creates them. Two formats are supported:
+YAML (same content as the tree written by GenerateScan.write_tree), and JSON lines (one record
+per node, see study_da.utils.dic_utils.get_dic_records), which is more compact and much faster to
+load for large studies.
+"""
+
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import json
+import os
+import re
+from typing import Any, Optional, TextIO
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+
+# Strings that can be written without quotes in YAML
+_PLAIN_SCALAR = re.compile(r"^[A-Za-z_][\w.\-/]*$")
+_RESERVED_SCALARS = {"true", "false", "null", "yes", "no", "on", "off", "y", "n"}
+
+
+# ==================================================================================================
+# --- Class definition
+# ==================================================================================================
+class StreamingTreeWriter:
+    """
+    A class to write the tree of a study incrementally.
+
+    Attributes:
+        path_tree (str): The path to the tree file.
+        tree_format (str): The format of the tree file, either "yaml" or "jsonl".
+        indent (int): The indentation of the YAML mappings.
+        n_nodes (int): The number of nodes written so far.
+
+    Methods:
+        write_node(l_keys, dic_values): Writes the values of a node of the tree.
+        close(): Closes the tree file.
+    """
+
+    def __init__(self, path_tree: str, tree_format: str = "yaml", indent: int = 2):
+        """
+        Initializes the writer and opens the tree file.
+
+        Args:
+            path_tree (str): The path to the tree file.
+            tree_format (str, optional): The format of the tree file, either "yaml" or "jsonl".
+                Defaults to "yaml".
+            indent (int, optional): The indentation of the YAML mappings. Defaults to 2.
+
+        Raises:
+            ValueError: If the tree format is not recognized.
+        """
+        if tree_format not in ["yaml", "jsonl"]:
+            raise ValueError(
+                f"Tree format {tree_format} is not recognized. Please use 'yaml' or 'jsonl'."
+            )
+        self.path_tree: str = path_tree
+        self.tree_format: str = tree_format
+        self.indent: int = indent
+        self.n_nodes: int = 0
+
+        # Keys of the last node written, to know which YAML mappings are already open
+        self.l_keys_open: list[str] = []
+
+        if os.path.dirname(path_tree) != "":
+            os.makedirs(os.path.dirname(path_tree), exist_ok=True)
+        self._file: Optional[TextIO] = open(path_tree, "w")
+
+    def __enter__(self) -> "StreamingTreeWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _format_scalar(value: Any) -> str:
+        """
+        Formats a scalar for YAML, quoting it (JSON strings are valid YAML) if needed.
+
+        Args:
+            value (Any): The value to format.
+
+        Returns:
+            str: The formatted value.
+        """
+        if (
+            isinstance(value, str)
+            and _PLAIN_SCALAR.match(value)
+            and value.lower() not in _RESERVED_SCALARS
+        ):
+            return value
+        return json.dumps(value)
+
+    def write_node(self, l_keys: list[str], dic_values: dict[str, Any]) -> None:
+        """
+        Writes the values of a node of the tree. The nodes must be written in depth-first order,
+        and the values must not be dictionaries.
+
+        Args:
+            l_keys (list[str]): The keys leading to the node.
+            dic_values (dict[str, Any]): The values of the node.
+        """
+        if self._file is None:
+            raise ValueError("The tree file is already closed.")
+
+        if self.tree_format == "jsonl":
+            self._file.write(json.dumps({"l_keys": l_keys, "values": dic_values}) + "\n")
+        else:
+            # Find the mappings that are already open
+            n_common = 0
+            for key, key_open in zip(l_keys, self.l_keys_open):
+                if key != key_open:
+                    break
+                n_common += 1
+
+            # Open the new mappings
+            l_lines = [
+                f"{' ' * self.indent * depth}{self._format_scalar(key)}:"
+                for depth, key in enumerate(l_keys[n_common:], start=n_common)
+            ]
+            l_lines.extend(
+                f"{' ' * self.indent * len(l_keys)}{self._format_scalar(key)}: "
+                f"{self._format_scalar(value)}"
+                for key, value in dic_values.items()
+            )
+            if l_lines:
+                self._file.write("\n".join(l_lines) + "\n")
+            self.l_keys_open = list(l_keys)
+
+        self.n_nodes += 1
+
+    def close(self) -> None:
+        """
+        Closes the tree file, making sure it has been written to disk.
+        """
+        if self._file is None:
+            return
+
+        # An empty tree must still be a valid dictionary
+        if self.n_nodes == 0:
+            if self.tree_format == "yaml":
+                self._file.write("{}\n")
+            else:
+                self._file.write(json.dumps({"l_keys": [], "values": {}}) + "\n")
+
+        # Force os to write to disk now, to avoid race conditions
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
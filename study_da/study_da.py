@@ -20,6 +20,11 @@ def create(
     dic_parameter_all_gen: Optional[dict[str, dict[str, Any]]] = None,
     dic_parameter_all_gen_naming: Optional[dict[str, dict[str, Any]]] = None,
     add_prefix_to_folder_names: bool = False,
+    n_workers: int = 1,
+    formatting_strategy: str = "black",
+    incremental: bool = False,
+    tree_format: str = "yaml",
+    stream_tree: bool = False,
 ) -> tuple[str, str]:
     """
     Create a study based on the configuration file.
@@ -35,6 +40,16 @@ def create(
             config. Defaults to None.
         add_prefix_to_folder_names (bool, optional): Whether to add a prefix to the folder names.
             Defaults to False.
+        n_workers (int, optional): Number of processes used to render and write the study files.
+            Defaults to 1 (no parallelization).
+        formatting_strategy (str, optional): How to format the study files, either "black",
+            "template" (template formatted only once) or "none". Defaults to "black".
+        incremental (bool, optional): Whether to update an existing study, only creating the new
+            jobs and keeping the state of the existing ones. Defaults to False.
+        tree_format (str, optional): Format of the tree file, either "yaml" or "jsonl" (JSON lines,
+            faster for large studies). Defaults to "yaml".
+        stream_tree (bool, optional): Whether to write the tree file while the study is created
+            instead of keeping the whole tree in memory. Defaults to False.
 
     Returns:
         tuple[str, str]: The path to the tree file and the name of the main configuration file.
@@ -46,6 +61,11 @@ def create(
         dic_parameter_all_gen=dic_parameter_all_gen,
         dic_parameter_all_gen_naming=dic_parameter_all_gen_naming,
         add_prefix_to_folder_names=add_prefix_to_folder_names,
+        n_workers=n_workers,
+        formatting_strategy=formatting_strategy,
+        incremental=incremental,
+        tree_format=tree_format,
+        stream_tree=stream_tree,
     )
 
     # Get variables of interest for the submission
@@ -128,6 +148,16 @@ def submit(
     dic_dependencies_per_gen: Optional[dict[int, list[str]]] = None,
     dic_copy_back_per_gen: Optional[dict[int, dict[str, bool]]] = None,
     name_config: str = "config.yaml",
+    job_store: str = "tree",
+    n_threads_status_scan: int = 1,
+    array_jobs: bool = False,
+    n_workers_local: Optional[int] = None,
+    memory_limit_local: Optional[float] = None,
+    n_jobs_per_pack: int = 1,
+    n_cores_per_pack: int = 1,
+    watch: bool = False,
+    scheduling_policy: str = "tree",
+    max_jobs_in_flight: Optional[int] = None,
 ) -> None:
     """
     Submits the jobs to the cluster. Note that copying back large files (e.g. json colliders)
@@ -167,6 +197,32 @@ def submit(
             back only "light" files, i.e. parquet, yaml and txt.
         name_config (str, optional): The name of the configuration file for the study.
             Defaults to "config.yaml".
+        job_store (str, optional): Where the state of the jobs is kept during the submission,
+            either "tree" (tree file) or "sqlite" (indexed database, faster for large studies,
+            exported to the tree file once the study is finished). Defaults to "tree".
+        n_threads_status_scan (int, optional): Number of threads used to scan the job folders
+            for finished or failed jobs (useful on network filesystems). Defaults to 1.
+        array_jobs (bool, optional): Whether to submit the cluster jobs as array jobs (HTCondor
+            queue list or Slurm job array), i.e. with a single scheduler call per generation and
+            submission type. Defaults to False.
+        n_workers_local (Optional[int], optional): The maximum number of local jobs running at the
+            same time. Defaults to None, corresponding to the number of available cores.
+        memory_limit_local (Optional[float], optional): The maximum memory (in GB) used by the
+            running local jobs for a new local job to be started. Defaults to None (no limit).
+        n_jobs_per_pack (int, optional): The maximum number of sibling jobs packed in a single
+            scheduler job, for studies with many short jobs. Defaults to 1 (no packing).
+        n_cores_per_pack (int, optional): The number of jobs of a pack run at the same time.
+            Defaults to 1.
+        watch (bool, optional): Only used with keep_submit_until_done. If True, the jobs are
+            submitted again as soon as a job is over (watching the job folders), wait_time being
+            the maximum time between two submissions. Defaults to False.
+        scheduling_policy (str, optional): The order in which the jobs ready to be submitted are
+            submitted: "tree" (order of the tree), "critical_path" (longest chain of unfinished
+            jobs depending on them first) or "descendants" (most unfinished jobs depending on them
+            first). Defaults to "tree".
+        max_jobs_in_flight (Optional[int], optional): The maximum number of jobs of the study
+            running or queuing at the same time, e.g. to share a quota. Defaults to None (no
+            limit).
 
     Returns:
         None
@@ -177,6 +233,13 @@ def submit(
         path_python_environment=path_python_environment,
         path_python_environment_container=path_python_environment_container,
         path_container_image=path_container_image,
+        job_store=job_store,
+        n_threads_status_scan=n_threads_status_scan,
+        array_jobs=array_jobs,
+        n_workers_local=n_workers_local,
+        memory_limit_local=memory_limit_local,
+        scheduling_policy=scheduling_policy,
+        max_jobs_in_flight=max_jobs_in_flight,
     )
 
     # Configure the jobs (will only configure if not already done)
@@ -193,6 +256,9 @@ def submit(
             dic_copy_back_per_gen=dic_copy_back_per_gen,
             name_config=name_config,
             force_submit=force_submit,
+            n_jobs_per_pack=n_jobs_per_pack,
+            n_cores_per_pack=n_cores_per_pack,
+            watch=watch,
         )
     else:
         study_sub.submit(
@@ -202,4 +268,6 @@ def submit(
             dic_copy_back_per_gen=dic_copy_back_per_gen,
             name_config=name_config,
             force_submit=force_submit,
+            n_jobs_per_pack=n_jobs_per_pack,
+            n_cores_per_pack=n_cores_per_pack,
         )
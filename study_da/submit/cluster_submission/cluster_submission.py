@@ -11,12 +11,13 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
-import psutil
-
 # Third party imports
+from study_da.submit.generate_run import generate_pack_run_file
 from study_da.utils import nested_get, nested_set
 
 # Local imports
+from .local_executor import get_local_executor, get_pid_job, is_job_queued_detached
+from .scheduler_queue import DEFAULT_TTL, clear_queue_cache, get_queue_state
 from .submission_statements import HTC, HTCDocker, LocalPC, Slurm, SlurmDocker
 
 
@@ -35,6 +36,20 @@ class ClusterSubmission:
         dic_tree (dict): A dictionary representing the job tree.
         path_submission_file (str): The path to the submission file.
         abs_path_study (str): The absolute path to the study.
+        queue_ttl (float): The time during which the state of the scheduler queue is reused, in
+            seconds.
+        array_jobs (bool): Whether the cluster jobs are submitted as array jobs.
+        array_max_size (int): The maximum number of jobs in a single array job.
+        dic_array_jobs (dict[str, list[str]]): A dictionary mapping the array submission files to
+            their jobs, ordered by array index.
+        n_jobs_per_pack (int): The maximum number of sibling jobs packed in a single scheduler job.
+        n_cores_per_pack (int): The number of jobs of a pack run at the same time.
+        dic_jobs_of_pack (dict[str, list[str]]): A dictionary mapping the first job of each pack
+            written to all the jobs of the pack.
+        local_executor (LocalExecutor): The executor running the local jobs, shared by all the
+            submissions of the process.
+        max_jobs_in_flight (Optional[int]): The maximum number of jobs of the study running or
+            queuing at the same time.
         dic_submission (dict): A dictionary mapping submission types to their corresponding classes.
 
     Methods:
@@ -56,6 +71,13 @@ class ClusterSubmission:
             Returns the HTC flavor for a given job.
         _return_abs_path_job(job: str) -> tuple[str, str]:
             Returns the absolute path of a job.
+        _return_abs_path_submission(job: str) -> tuple[str, str]:
+            Returns the absolute path of what is submitted for a job (the job or its pack).
+        _pack_jobs(list_of_jobs: list[str], running_jobs: list[str], queuing_jobs: list[str],
+            submission_type: str) -> list[str]:
+            Groups the sibling jobs to submit into packs.
+        _cap_jobs_in_flight(running_jobs: list[str], queuing_jobs: list[str]) -> list[str]:
+            Drops the jobs to submit exceeding the maximum number of jobs in flight.
         _write_sub_files_slurm_docker(sub_filename: str, running_jobs: list[str],
             queuing_jobs: list[str], list_of_jobs: list[str]) -> tuple[list[str], list[str]]:
             Writes submission files for Slurm Docker jobs.
@@ -65,6 +87,9 @@ class ClusterSubmission:
         _write_sub_file(sub_filename: str, running_jobs: list[str], queuing_jobs: list[str],
             list_of_jobs: list[str], submission_type: str) -> tuple[list[str], list[str]]:
             Writes a submission file for the given jobs.
+        _write_sub_files_array(sub_filename: str, running_jobs: list[str], queuing_jobs: list[str],
+            list_of_jobs: list[str], submission_type: str) -> tuple[list[str], list[str]]:
+            Writes one array submission file per generation for the given jobs.
         _write_sub_files(sub_filename: str, running_jobs: list[str], queuing_jobs: list[str],
             list_of_jobs: list[str], submission_type: str) -> tuple[list[str], list[str]]:
             Writes submission files for the given jobs based on the submission type.
@@ -78,8 +103,11 @@ class ClusterSubmission:
         submit(list_of_jobs: list[str], l_submission_filenames: list[str], submission_type: str)
             -> None:
             Submits the jobs to the appropriate cluster system.
-        _get_local_jobs() -> list[str]:
-            Gets the list of local jobs.
+        _get_local_jobs(status: str = "running") -> list[str]:
+            Gets the list of local jobs based on the status.
+        _get_scheduler_jobs(scheduler: str, status: str, force_query_individually: bool = False)
+            -> list[str]:
+            Gets the list of jobs of a scheduler based on the status, from a single cached query.
         _get_condor_jobs(status: str, force_query_individually: bool = False) -> list[str]:
             Gets the list of Condor jobs based on the status.
         _get_slurm_jobs(status: str, force_query_individually: bool = False) -> list[str]:
@@ -97,6 +125,14 @@ class ClusterSubmission:
         dic_tree: dict,
         path_submission_file: str,
         abs_path_study: str,
+        queue_ttl: float = DEFAULT_TTL,
+        array_jobs: bool = False,
+        array_max_size: int = 1000,
+        n_jobs_per_pack: int = 1,
+        n_cores_per_pack: int = 1,
+        n_workers_local: Optional[int] = None,
+        memory_limit_local: Optional[float] = None,
+        max_jobs_in_flight: Optional[int] = None,
     ):
         self.study_name: str = study_name
         self.l_jobs_to_submit: list[str] = l_jobs_to_submit
@@ -104,6 +140,15 @@ class ClusterSubmission:
         self.dic_tree: dict = dic_tree
         self.path_submission_file: str = path_submission_file
         self.abs_path_study: str = abs_path_study
+        self.queue_ttl: float = queue_ttl
+        self.array_jobs: bool = array_jobs
+        self.array_max_size: int = array_max_size
+        self.dic_array_jobs: dict[str, list[str]] = {}
+        self.n_jobs_per_pack: int = n_jobs_per_pack
+        self.n_cores_per_pack: int = n_cores_per_pack
+        self.dic_jobs_of_pack: dict[str, list[str]] = {}
+        self.local_executor = get_local_executor(n_workers_local, memory_limit_local)
+        self.max_jobs_in_flight: Optional[int] = max_jobs_in_flight
         self.dic_submission: dict = {
             "local": LocalPC,
             "htc": HTC,
@@ -121,7 +166,42 @@ class ClusterSubmission:
             dic_tree (dict): A dictionary representing the job tree structure.
             path_submission_file (str): The path to the submission file.
             abs_path_study (str): The absolute path to the study.
+            queue_ttl (float, optional): The time during which the state of the scheduler queue
+                is reused, in seconds. Defaults to DEFAULT_TTL.
+            array_jobs (bool, optional): Whether to submit the cluster jobs as array jobs, i.e.
+                with a single submission (HTCondor queue list or Slurm job array) per generation
+                and submission type. Defaults to False.
+            array_max_size (int, optional): The maximum number of jobs in a single array job,
+                larger arrays being split. Must not exceed the MaxArraySize of Slurm (1001 by
+                default). Defaults to 1000.
+            n_jobs_per_pack (int, optional): The maximum number of sibling jobs (same generation
+                and parent folder) packed in a single scheduler job, run by a generated driver.
+                Defaults to 1 (no packing).
+            n_cores_per_pack (int, optional): The number of jobs of a pack run at the same time
+                (the resources requested to the scheduler are not changed). Defaults to 1.
+            n_workers_local (Optional[int], optional): The maximum number of local jobs running at
+                the same time. Defaults to None, corresponding to the number of available cores.
+            memory_limit_local (Optional[float], optional): The maximum memory (in GB) used by the
+                running local jobs for a new local job to be started. Defaults to None (no limit).
+            max_jobs_in_flight (Optional[int], optional): The maximum number of jobs of the study
+                running or queuing at the same time. The jobs to submit are kept in the order of
+                l_jobs_to_submit until the limit is reached. Defaults to None (no limit).
+        """
+
+    @staticmethod
+    def _format_id_sub(id_sub: int | str) -> int | str:
+        """
+        Formats the submission id of a job. Jobs submitted individually are identified by an
+        integer, while jobs submitted in an array are identified by the id of the array and their
+        index in it, e.g. "1234.5".
+
+        Args:
+            id_sub (int | str): The submission id of the job.
+
+        Returns:
+            int | str: The formatted submission id.
         """
+        return id_sub if isinstance(id_sub, str) and "." in id_sub else int(id_sub)
 
     # Getter for dic_id_to_path_job
     @property
@@ -142,7 +222,9 @@ class ClusterSubmission:
             l_keys = self.dic_all_jobs[job]["l_keys"]
             subdic_job = nested_get(self.dic_tree, l_keys)
             if "id_sub" in subdic_job:
-                dic_id_to_path_job[subdic_job["id_sub"]] = self._return_abs_path_job(job)[0]
+                dic_id_to_path_job[self._format_id_sub(subdic_job["id_sub"])] = (
+                    self._return_abs_path_submission(job)[0]
+                )
                 found_at_least_one = True
 
         return dic_id_to_path_job if found_at_least_one else None
@@ -154,33 +236,39 @@ class ClusterSubmission:
         Updates the internal job submission tree with job IDs and their corresponding paths.
 
         Args:
-            dic_id_to_path_job (dict[int, str]): A dictionary mapping job IDs (integers) to their
-            respective paths (strings).
+            dic_id_to_path_job (dict[int, str]): A dictionary mapping job IDs (integers, or
+            "arrayid.index" strings for array jobs) to their respective paths (strings).
 
         Raises:
             AssertionError: If dic_id_to_path_job is not a dictionary.
 
         Notes:
-            - Ensures all job IDs are integers.
+            - Ensures all job IDs are integers (except for array jobs).
             - Updates the internal job submission tree by adding or removing job IDs based on the
                 provided dictionary.
             - If a job's path is found in the dictionary, its ID is updated in the tree.
-            - If a job's ID is not found in the dictionary, it is removed from the tree.
+            - If a job's ID is not found in the dictionary, it is removed from the tree (along
+                with its pack, if any).
+            - Packed jobs share the ID of their pack.
         """
         assert isinstance(dic_id_to_path_job, dict)
-        # Ensure all ids are integers
+        # Ensure all ids are integers (or array ids)
         dic_id_to_path_job = {
-            int(id_job): path_job for id_job, path_job in dic_id_to_path_job.items()
+            self._format_id_sub(id_job): path_job for id_job, path_job in dic_id_to_path_job.items()
         }
-        dic_job_to_id = {path_job: int(id_job) for id_job, path_job in dic_id_to_path_job.items()}
+        dic_job_to_id = {path_job: id_job for id_job, path_job in dic_id_to_path_job.items()}
 
         # Update the tree
         for job in self.l_jobs_to_submit:
-            path_job = self._return_abs_path_job(job)[0]
+            path_job = self._return_abs_path_submission(job)[0]
             l_keys = self.dic_all_jobs[job]["l_keys"]
             subdic_job = nested_get(self.dic_tree, l_keys)
-            if "id_sub" in subdic_job and int(subdic_job["id_sub"]) not in dic_id_to_path_job:
+            if (
+                "id_sub" in subdic_job
+                and self._format_id_sub(subdic_job["id_sub"]) not in dic_id_to_path_job
+            ):
                 del subdic_job["id_sub"]
+                subdic_job.pop("path_pack", None)
             elif "id_sub" not in subdic_job and path_job in dic_job_to_id:
                 subdic_job["id_sub"] = dic_job_to_id[path_job]
             # Else all is consistent
@@ -288,6 +376,9 @@ class ClusterSubmission:
         l_keys = self.dic_all_jobs[job]["l_keys"]
         completed = nested_get(self.dic_tree, l_keys + ["status"]) == "finished"
         failed = nested_get(self.dic_tree, l_keys + ["status"]) == "failed"
+
+        # Packed jobs are running or queuing with their pack
+        path_pack = nested_get(self.dic_tree, l_keys).get("path_pack")
         if completed:
             logging.info(f"{path_job} is already completed.")
 
@@ -296,11 +387,11 @@ class ClusterSubmission:
             logging.info(f"{path_job} has failed.")
 
         # Test if job is running
-        elif path_job in running_jobs:
+        elif path_job in running_jobs or path_pack in running_jobs:
             logging.info(f"{path_job} is already running.")
 
         # Test if job is queuing
-        elif path_job in queuing_jobs:
+        elif path_job in queuing_jobs or path_pack in queuing_jobs:
             logging.info(f"{path_job} is already queuing.")
 
         # True if job must be (re)submitted
@@ -341,6 +432,124 @@ class ClusterSubmission:
         abs_path_job = f"{self.abs_path_study}/{path_job}"
         return path_job, abs_path_job
 
+    def _return_abs_path_submission(self, job: str) -> tuple[str, str]:
+        """
+        Generate the relative and absolute paths of what is submitted for a given job, i.e. the
+        folder of its pack if the job is packed, and the job directory otherwise.
+
+        Args:
+            job (str): The job string containing the path to the job file.
+
+        Returns:
+            tuple[str, str]: A tuple containing:
+            - path_job (str): The relative path to the submitted directory.
+            - abs_path_job (str): The absolute path to the submitted directory.
+        """
+        l_keys = self.dic_all_jobs[job]["l_keys"]
+        path_pack = nested_get(self.dic_tree, l_keys).get("path_pack")
+        if path_pack is None:
+            return self._return_abs_path_job(job)
+        return path_pack, f"{self.abs_path_study}/{path_pack}"
+
+    def _pack_jobs(
+        self,
+        list_of_jobs: list[str],
+        running_jobs: list[str],
+        queuing_jobs: list[str],
+        submission_type: str,
+    ) -> list[str]:
+        """
+        Groups the sibling jobs to submit (same generation and parent folder) into packs of at
+        most n_jobs_per_pack jobs. The run file of each pack (a driver running the run files of its
+        jobs) is written in a folder next to the first job of the pack, which then stands for the
+        whole pack in the submission files. The jobs of each pack are recorded in
+        dic_jobs_of_pack, and the pack of each job in the tree.
+
+        Args:
+            list_of_jobs (list[str]): List of jobs to be submitted.
+            running_jobs (list[str]): List of currently running jobs.
+            queuing_jobs (list[str]): List of currently queuing jobs.
+            submission_type (str): The type of submission.
+
+        Returns:
+            list[str]: The jobs to write in the submission files, i.e. the first job of each pack.
+        """
+        # Group the jobs that must be (re)submitted by siblings
+        dic_siblings: dict[tuple, list[str]] = {}
+        for job in list_of_jobs:
+            path_job, _ = self._return_abs_path_job(job)
+            if self._test_job(job, path_job, running_jobs, queuing_jobs):
+                # Forget the previous pack of the job, if any
+                nested_get(self.dic_tree, self.dic_all_jobs[job]["l_keys"]).pop("path_pack", None)
+                key_siblings = (self.dic_all_jobs[job]["gen"], os.path.dirname(path_job[:-1]))
+                dic_siblings.setdefault(key_siblings, []).append(job)
+
+        # Write the run file of each pack
+        list_of_jobs_packed = []
+        for l_siblings in dic_siblings.values():
+            for idx_start in range(0, len(l_siblings), self.n_jobs_per_pack):
+                l_jobs_pack = l_siblings[idx_start : idx_start + self.n_jobs_per_pack]
+                list_of_jobs_packed.append(l_jobs_pack[0])
+                if len(l_jobs_pack) == 1:
+                    continue
+
+                path_pack = f"{self._return_abs_path_job(l_jobs_pack[0])[0]}pack/"
+                abs_path_pack = f"{self.abs_path_study}/{path_pack}"
+                logging.info(f'Packing {len(l_jobs_pack)} jobs in "{abs_path_pack}"')
+                os.makedirs(abs_path_pack, exist_ok=True)
+                path_run_pack = f"{abs_path_pack}run.sh"
+                with open(path_run_pack, "w") as f:
+                    f.write(
+                        generate_pack_run_file(
+                            [self._return_abs_path_job(job)[1][:-1] for job in l_jobs_pack],
+                            n_cores=self.n_cores_per_pack,
+                            slurm_docker_fix=submission_type == "slurm_docker",
+                        )
+                    )
+                os.chmod(path_run_pack, 0o755)
+
+                for job in l_jobs_pack:
+                    nested_set(
+                        self.dic_tree, self.dic_all_jobs[job]["l_keys"] + ["path_pack"], path_pack
+                    )
+                self.dic_jobs_of_pack[l_jobs_pack[0]] = l_jobs_pack
+
+        return list_of_jobs_packed
+
+    def _cap_jobs_in_flight(self, running_jobs: list[str], queuing_jobs: list[str]) -> list[str]:
+        """
+        Drops the jobs to submit that would exceed the maximum number of jobs in flight (running
+        or queuing). The jobs already in flight are always kept, and the jobs to submit are kept in
+        the order of l_jobs_to_submit (i.e. by priority) while there is room left.
+
+        Args:
+            running_jobs (list[str]): List of currently running jobs.
+            queuing_jobs (list[str]): List of currently queuing jobs.
+
+        Returns:
+            list[str]: The jobs to submit, or in flight, fitting in the quota.
+        """
+        if self.max_jobs_in_flight is None:
+            return self.l_jobs_to_submit
+
+        l_jobs_in_flight = []
+        l_jobs_new = []
+        for job in self.l_jobs_to_submit:
+            path_job, _ = self._return_abs_path_job(job)
+            if self._test_job(job, path_job, running_jobs, queuing_jobs):
+                l_jobs_new.append(job)
+            else:
+                l_jobs_in_flight.append(job)
+
+        n_free = max(self.max_jobs_in_flight - len(l_jobs_in_flight), 0)
+        if len(l_jobs_new) > n_free:
+            logging.info(
+                f"{len(l_jobs_in_flight)} jobs in flight, only {n_free} of the "
+                f"{len(l_jobs_new)} jobs to submit are submitted now."
+            )
+        set_jobs_kept = set(l_jobs_in_flight) | set(l_jobs_new[:n_free])
+        return [job for job in self.l_jobs_to_submit if job in set_jobs_kept]
+
     def _write_sub_files_slurm_docker(
         self,
         sub_filename: str,
@@ -369,7 +578,7 @@ class ClusterSubmission:
         l_filenames = []
         list_of_jobs_updated = []
         for idx_job, job in enumerate(list_of_jobs):
-            path_job, abs_path_job = self._return_abs_path_job(job)
+            path_job, abs_path_job = self._return_abs_path_submission(job)
 
             # Test if job is running, queuing or completed
             if self._test_job(job, path_job, running_jobs, queuing_jobs):
@@ -452,8 +661,9 @@ class ClusterSubmission:
                         self._return_htc_flavour(job),
                     )
                 else:
+                    # Array jobs get the same path fix as the individual Slurm Docker jobs
                     return self.dic_submission[submission_type](
-                        sub_filename, abs_path_job, gpu, self.path_image
+                        sub_filename, abs_path_job, gpu, self.path_image, fix=self.array_jobs
                     )
             case "local":
                 return self.dic_submission[submission_type](sub_filename, abs_path_job)
@@ -469,7 +679,8 @@ class ClusterSubmission:
         submission_type: str,
     ) -> tuple[list[str], list[str]]:
         """
-        Writes a submission file for a list of jobs and returns the updated list of jobs.
+        Writes a submission file for a list of jobs and returns the updated list of jobs. No file
+        is written for the local jobs, as they are run by the local executor.
 
         Args:
             sub_filename (str): The filename for the submission file.
@@ -483,6 +694,16 @@ class ClusterSubmission:
             - A list with the submission filename if the file was created, otherwise an empty list.
             - An updated list of jobs that were included in the submission file.
         """
+        # Local jobs are run by the local executor, which doesn't need a submission file
+        if submission_type == "local":
+            list_of_jobs_updated = []
+            for job in list_of_jobs:
+                path_job, abs_path_job = self._return_abs_path_submission(job)
+                if self._test_job(job, path_job, running_jobs, queuing_jobs):
+                    logging.info(f'Queuing local job "{abs_path_job}"')
+                    list_of_jobs_updated.append(job)
+            return [], list_of_jobs_updated
+
         # Flag to know if the file can be submitted (at least one job in it)
         ok_to_submit = False
 
@@ -499,8 +720,8 @@ class ClusterSubmission:
         Sub = None
         with open(sub_filename, "w") as fid:
             for job in list_of_jobs:
-                # Get corresponding path job (remove the python file name)
-                path_job, abs_path_job = self._return_abs_path_job(job)
+                # Get corresponding path job (remove the python file name), or path of its pack
+                path_job, abs_path_job = self._return_abs_path_submission(job)
 
                 # Test if job is running, queuing or completed
                 if self._test_job(job, path_job, running_jobs, queuing_jobs):
@@ -537,6 +758,82 @@ class ClusterSubmission:
 
         return ([sub_filename], list_of_jobs_updated) if ok_to_submit else ([], [])
 
+    def _write_sub_files_array(
+        self,
+        sub_filename: str,
+        running_jobs: list[str],
+        queuing_jobs: list[str],
+        list_of_jobs: list[str],
+        submission_type: str,
+    ) -> tuple[list[str], list[str]]:
+        """
+        Writes array submission files for a list of jobs: one file per generation (and per GPU
+        request and HTC flavor, which must be shared by all the jobs of an array), each job folder
+        being resolved from the array index. The jobs of each file are recorded in
+        dic_array_jobs, ordered by array index.
+
+        Args:
+            sub_filename (str): The base name for the submission files.
+            running_jobs (list[str]): List of currently running jobs.
+            queuing_jobs (list[str]): List of currently queuing jobs.
+            list_of_jobs (list[str]): List of jobs to be submitted.
+            submission_type (str): The type of submission.
+
+        Returns:
+            tuple[list[str], list[str]]: A tuple containing:
+            - A list of filenames for the generated submission files.
+            - An updated list of jobs that were included in the submission files, ordered as in
+                the submission files.
+        """
+        # Group the jobs to submit by array
+        dic_arrays: dict[tuple, list[tuple[str, str]]] = {}
+        for job in list_of_jobs:
+            path_job, abs_path_job = self._return_abs_path_submission(job)
+
+            # Test if job is running, queuing or completed
+            if self._test_job(job, path_job, running_jobs, queuing_jobs):
+                logging.info(f'Adding node "{abs_path_job}" to array submission')
+
+                # Get job GPU request
+                l_keys = self.dic_all_jobs[job]["l_keys"]
+                # Ensure GPU is defined, and set it to False if not
+                if "request_gpu" not in nested_get(self.dic_tree, l_keys):
+                    nested_set(self.dic_tree, l_keys + ["request_gpu"], False)
+                gpu = nested_get(self.dic_tree, l_keys + ["request_gpu"])
+
+                htc_flavor = self._return_htc_flavour(job) if "htc" in submission_type else None
+                key_array = (self.dic_all_jobs[job]["gen"], gpu, htc_flavor)
+                dic_arrays.setdefault(key_array, []).append((job, abs_path_job))
+
+        # Write one submission file per array (split if too large)
+        l_filenames = []
+        list_of_jobs_updated = []
+        for (gen, gpu, _), l_jobs_array in dic_arrays.items():
+            for idx_start in range(0, len(l_jobs_array), self.array_max_size):
+                l_jobs_chunk = l_jobs_array[idx_start : idx_start + self.array_max_size]
+                filename_sub = (
+                    f"{sub_filename.split('.sub')[0]}_{submission_type}_gen_{gen}"
+                    f"_array_{len(l_filenames)}.sub"
+                )
+
+                # Get a submission object per job, to have the (possibly fixed) job folders
+                l_Sub = [
+                    self._get_Sub(job, submission_type, filename_sub, abs_path_job, gpu)
+                    for job, abs_path_job in l_jobs_chunk
+                ]
+
+                # Create folder if it does not exist
+                os.makedirs(os.path.dirname(l_Sub[0].sub_filename), exist_ok=True)
+                with open(l_Sub[0].sub_filename, "w") as fid:
+                    fid.write(l_Sub[0].get_array_statement([Sub.path_job_folder for Sub in l_Sub]))
+
+                l_jobs = [job for job, _ in l_jobs_chunk]
+                self.dic_array_jobs[l_Sub[0].sub_filename] = l_jobs
+                l_filenames.append(l_Sub[0].sub_filename)
+                list_of_jobs_updated.extend(l_jobs)
+
+        return l_filenames, list_of_jobs_updated
+
     def _write_sub_files(
         self,
         sub_filename: str,
@@ -560,8 +857,14 @@ class ClusterSubmission:
                 - Updated list of running jobs.
                 - Updated list of queuing jobs.
         """
+        # Cluster jobs can be grouped in array jobs
+        if self.array_jobs and submission_type != "local":
+            return self._write_sub_files_array(
+                sub_filename, running_jobs, queuing_jobs, list_of_jobs, submission_type
+            )
+
         # Slurm docker is a peculiar case as one submission file must be created per job
-        if submission_type == "slurm_docker":
+        elif submission_type == "slurm_docker":
             return self._write_sub_files_slurm_docker(
                 sub_filename, running_jobs, queuing_jobs, list_of_jobs
             )
@@ -591,9 +894,17 @@ class ClusterSubmission:
         """
         running_jobs, queuing_jobs = self._get_state_jobs(verbose=False)
 
+        # Keep the jobs fitting in the quota of jobs in flight, the others are submitted later
+        l_jobs_kept = self._cap_jobs_in_flight(running_jobs, queuing_jobs)
+        if dic_summary_by_gen is not None and len(l_jobs_kept) < len(self.l_jobs_to_submit):
+            set_jobs_kept = set(l_jobs_kept)
+            for job in self.l_jobs_to_submit:
+                if job not in set_jobs_kept:
+                    dic_summary_by_gen[self.dic_all_jobs[job]["gen"]]["to_submit_later"] += 1
+
         # Make a dict of all jobs to submit depending on the submission type
         dic_jobs_to_submit = {key: [] for key in self.dic_submission.keys()}
-        for job in self.l_jobs_to_submit:
+        for job in l_jobs_kept:
             l_keys = self.dic_all_jobs[job]["l_keys"]
             submission_type = nested_get(self.dic_tree, l_keys + ["submission_type"])
             dic_jobs_to_submit[submission_type].append(job)  # type: ignore
@@ -602,12 +913,19 @@ class ClusterSubmission:
         dic_submission_files = {}
         for submission_type, list_of_jobs in dic_jobs_to_submit.items():
             if len(list_of_jobs) > 0:
+                # Pack the sibling cluster jobs if requested
+                list_of_jobs_to_write = copy.copy(list_of_jobs)
+                if self.n_jobs_per_pack > 1 and submission_type != "local":
+                    list_of_jobs_to_write = self._pack_jobs(
+                        list_of_jobs_to_write, running_jobs, queuing_jobs, submission_type
+                    )
+
                 # Write submission files
                 l_submission_filenames, list_of_jobs_updated = self._write_sub_files(
                     self.path_submission_file,
                     running_jobs,
                     queuing_jobs,
-                    copy.copy(list_of_jobs),
+                    list_of_jobs_to_write,
                     submission_type,
                 )
 
@@ -617,11 +935,16 @@ class ClusterSubmission:
                     l_submission_filenames,
                 )
 
-                # Update dic_summary_by_gen inplace
+                # Update dic_summary_by_gen inplace (packed jobs are submitted with their pack)
                 if dic_summary_by_gen is not None:
+                    set_jobs_submitted = {
+                        job_packed
+                        for job in list_of_jobs_updated
+                        for job_packed in self.dic_jobs_of_pack.get(job, [job])
+                    }
                     for job in list_of_jobs:
                         gen = self.dic_all_jobs[job]["gen"]
-                        if job in list_of_jobs_updated:
+                        if job in set_jobs_submitted:
                             dic_summary_by_gen[gen]["submitted_now"] += 1
                         else:
                             dic_summary_by_gen[gen]["running_or_queuing"] += 1
@@ -635,13 +958,15 @@ class ClusterSubmission:
         dic_id_to_path_job_temp: dict,
         list_of_jobs: list[str],
         idx_submission: int = 0,
+        l_jobs_array: Optional[list[str]] = None,
     ) -> tuple[dict, int]:
         """
         Updates the job status from the HPC output.
 
         This method parses the output of a job submission command to update the job status
         in a dictionary mapping job IDs to their respective paths. It supports both HTC and
-        SLURM submission types.
+        SLURM submission types. For array jobs, each job is identified by the id of the array and
+        its index in it.
 
         Args:
             submit_command (str): The command used to submit the job.
@@ -649,6 +974,8 @@ class ClusterSubmission:
             dic_id_to_path_job_temp (dict): A dictionary mapping job IDs to their paths.
             list_of_jobs (list[str]): A list of job paths.
             idx_submission (int, optional): The index of the current submission. Defaults to 0.
+            l_jobs_array (Optional[list[str]], optional): The jobs of the array, ordered by index,
+                if the submission is an array job. Defaults to None.
 
         Returns:
             tuple[dict, int]: A tuple containing the updated dictionary and the updated index of
@@ -667,20 +994,24 @@ class ClusterSubmission:
         if "ERROR" in output_error:
             raise RuntimeError(f"Error in submission: {output_error}")
         for line in output.split("\n"):
-            if "htc" in submission_type:
-                if "cluster" in line:
-                    cluster_id = int(line.split("cluster ")[1][:-1])
-                    dic_id_to_path_job_temp[cluster_id] = self._return_abs_path_job(
-                        list_of_jobs[idx_submission]
-                    )[0]
-                    idx_submission += 1
-            elif "slurm" in submission_type:
-                if "Submitted" in line:
-                    job_id = int(line.split(" ")[3])
-                    dic_id_to_path_job_temp[job_id] = self._return_abs_path_job(
-                        list_of_jobs[idx_submission]
-                    )[0]
-                    idx_submission += 1
+            if "htc" in submission_type and "cluster" in line:
+                job_id = int(line.split("cluster ")[1][:-1])
+            elif "slurm" in submission_type and "Submitted" in line:
+                job_id = int(line.split(" ")[3])
+            else:
+                continue
+
+            if l_jobs_array is None:
+                dic_id_to_path_job_temp[job_id] = self._return_abs_path_submission(
+                    list_of_jobs[idx_submission]
+                )[0]
+                idx_submission += 1
+            else:
+                for idx_array, job in enumerate(l_jobs_array):
+                    dic_id_to_path_job_temp[f"{job_id}.{idx_array}"] = (
+                        self._return_abs_path_submission(job)[0]
+                    )
+                idx_submission += len(l_jobs_array)
 
         return dic_id_to_path_job_temp, idx_submission
 
@@ -705,32 +1036,48 @@ class ClusterSubmission:
             None
         """
         # Check that the submission file(s) is/are appropriate for the submission mode
-        if len(l_submission_filenames) > 1 and submission_type != "slurm_docker":
+        if (
+            len(l_submission_filenames) > 1
+            and submission_type != "slurm_docker"
+            and not self.array_jobs
+        ):
             raise ValueError(
                 "Error: Multiple submission files should not be implemented for this submission"
                 " mode"
             )
 
         # Check that at least one job is being submitted
-        if not l_submission_filenames:
+        if not list_of_jobs:
             logging.info("No job being submitted.")
 
+        # Local jobs are run by the local executor, with a bounded number of processes
+        if submission_type == "local" and list_of_jobs:
+            self.local_executor.submit([self._return_abs_path_job(job)[1] for job in list_of_jobs])
+            logging.info(f"Local executor statistics: {self.local_executor.get_stats()}")
+
         # Submit
         dic_id_to_path_job_temp = {}
         idx_submission = 0
         for sub_filename in l_submission_filenames:
             if submission_type == "local":
-                os.system(self.dic_submission[submission_type].get_submit_command(sub_filename))
+                continue
             elif submission_type in {"htc", "slurm", "htc_docker", "slurm_docker"}:
-                submit_command = self.dic_submission[submission_type].get_submit_command(
-                    sub_filename
-                )
+                l_jobs_array = self.dic_array_jobs.get(sub_filename)
+                if l_jobs_array is None:
+                    submit_command = self.dic_submission[submission_type].get_submit_command(
+                        sub_filename
+                    )
+                else:
+                    submit_command = self.dic_submission[submission_type].get_array_submit_command(
+                        sub_filename
+                    )
                 dic_id_to_path_job_temp, idx_submission = self._update_job_status_from_hpc_output(
                     submit_command,
                     submission_type,
                     dic_id_to_path_job_temp,
                     list_of_jobs,
                     idx_submission,
+                    l_jobs_array,
                 )
             else:
                 raise ValueError(f"Error: {submission_type} is not a valid submission mode")
@@ -750,54 +1097,58 @@ class ClusterSubmission:
             dic_id_to_path_job = dic_id_to_path_job_temp
             self.dic_id_to_path_job = dic_id_to_path_job
 
+        # The state of the queue must be queried again to see the new jobs
+        clear_queue_cache()
         logging.info("Jobs status after submission:")
         _, _ = self._get_state_jobs(verbose=True)
 
-    def _get_local_jobs(self) -> list[str]:
+    def _get_local_jobs(self, status: str = "running") -> list[str]:
         """
-        Retrieves a list of local job paths.
-        This method scans the current processes to identify jobs that are running
-        a script named 'run.sh'. It extracts the job paths and filters them to
-        include only the paths that are relevant to the current study.
+        Retrieves the paths of the local jobs based on their status. The running jobs are found
+        from the pid written in their folder by the local executor (also tracking the jobs started
+        by a previous submission process), and the queuing jobs are the ones waiting for a worker
+        in the local executor, or in the detached dispatcher of a previous submission process.
 
         Args:
-            None
+            status (str, optional): The status of the jobs to retrieve. Can be "running" or
+                "queuing". Defaults to "running".
 
         Returns:
-            list[str]: A list of job paths that are currently running and relevant
-            to the study.
+            list[str]: A list of paths to the jobs that match the specified status.
         """
+        if status == "queuing":
+            set_abs_path_queuing = set(self.local_executor.get_queuing_jobs())
 
         l_path_jobs = []
-        # Warning, does not work at the moment in lxplus...
-        for ps in psutil.pids():
-            try:
-                aux = psutil.Process(ps).cmdline()
-            except Exception:
-                aux = []
-            if len(aux) > 1 and "run.sh" in aux[-1]:
-                job = str(Path(aux[-1]).parent)
-
-                # Only get path after name of the study
-                try:
-                    job = job.split(self.study_name)[1]
-                    l_path_jobs.append(f"{self.study_name}{job}/")
-                except IndexError:
-                    logging.warning(
-                        "Some jobs from another study are running. Acquiring the full path as the "
-                        "study name is unknown."
-                    )
-                    l_path_jobs.append(job)
+        for job in self.l_jobs_to_submit:
+            l_keys = self.dic_all_jobs[job]["l_keys"]
+            if nested_get(self.dic_tree, l_keys + ["submission_type"]) != "local":
+                continue
+            path_job, abs_path_job = self._return_abs_path_job(job)
+            if status == "queuing":
+                if abs_path_job.rstrip("/") in set_abs_path_queuing or is_job_queued_detached(
+                    abs_path_job
+                ):
+                    l_path_jobs.append(path_job)
+            elif (pid := get_pid_job(abs_path_job)) is not None:
+                self.local_executor.adopt(abs_path_job, pid)
+                l_path_jobs.append(path_job)
+
         return l_path_jobs
 
-    def _get_condor_jobs(self, status: str, force_query_individually: bool = False) -> list[str]:
+    def _get_scheduler_jobs(
+        self, scheduler: str, status: str, force_query_individually: bool = False
+    ) -> list[str]:
         """
-        Retrieve the paths of Condor jobs based on their status.
+        Retrieve the paths of the jobs of a scheduler (HTCondor or Slurm) based on their status.
+        The queue is queried once for all the jobs of the user, and the result is cached for
+        `queue_ttl` seconds, such that the running and queuing jobs come from the same query.
 
         Args:
+            scheduler (str): The scheduler to query, either "htc" or "slurm".
             status (str): The status of the jobs to retrieve. Can be "running" or "queuing".
-            force_query_individually (bool, optional): If True, query each job individually if the
-                id-job file is missing. Defaults to False.
+            force_query_individually (bool, optional): If True, get the path of the jobs that are
+                not in the id-job file from their command. Defaults to False.
 
         Returns:
             list[str]: A list of paths to the jobs that match the specified status.
@@ -806,140 +1157,113 @@ class ClusterSubmission:
             ValueError: If the status provided is not "running" or "queuing".
 
         Notes:
-            - The method relies on the `condor_q` command to retrieve job information.
             - If the id-job file is missing and `force_query_individually` is False, jobs not in
                 `dic_id_to_path_job` will be ignored.
-            - If `force_query_individually` is True, the method will query each job individually to
-                retrieve its path.
             - Warnings are printed if jobs are found that are not in the id-job file or if the
                 id-job file is missing.
         """
+        if status not in ["running", "queuing"]:
+            raise ValueError(f"Status {status} is not recognized. Please use running or queuing.")
+
         l_path_jobs = []
-        dic_status = {"running": 1, "queuing": 2}
-        condor_output = subprocess.run(["condor_q"], capture_output=True).stdout.decode("utf-8")
+        dic_queue = get_queue_state(scheduler, ttl=self.queue_ttl)
+        dic_id_to_path_job = self.dic_id_to_path_job
 
-        # Check which jobs are running
         first_line = True
         first_missing_job = True
-        for line in condor_output.split("\n")[4:]:
-            if line == "":
-                break
-            jobid = int(line.split("ID:")[1][1:8])
-            condor_status = line.split("      ")[1:5]  # Done, Run, Idle, and potentially Hold
-
-            # If job is running/queuing, get the path to the job
-            if condor_status[dic_status[status]] == "1":
-                # Get path from dic_id_to_path_job if available
-                if self.dic_id_to_path_job is not None:
-                    if jobid in self.dic_id_to_path_job:
-                        l_path_jobs.append(self.dic_id_to_path_job[jobid])
-                    elif first_missing_job:
-                        logging.warning(
-                            "Warning, some jobs are queuing/running and are not in the id-job"
-                            " file. They may come from another study. Ignoring them."
-                        )
-                        first_missing_job = False
+        for jobid, dic_job in dic_queue.items():
+            # Get path from dic_id_to_path_job if available
+            if dic_id_to_path_job is not None:
+                # Jobs submitted in an array are identified by the array id and their index
+                l_entries = [(jobid, dic_job)] + [
+                    (f"{jobid}.{task}", dic_task) for task, dic_task in dic_job["tasks"].items()
+                ]
+                l_entries_known = [
+                    (id_entry, dic_entry)
+                    for id_entry, dic_entry in l_entries
+                    if id_entry in dic_id_to_path_job
+                ]
+                l_path_jobs.extend(
+                    dic_id_to_path_job[id_entry]
+                    for id_entry, dic_entry in l_entries_known
+                    if dic_entry["state"] == status
+                )
+                if not l_entries_known and dic_job["state"] == status and first_missing_job:
+                    logging.warning(
+                        "Warning, some jobs are queuing/running and are not in the id-job"
+                        " file. They may come from another study. Ignoring them."
+                    )
+                    first_missing_job = False
 
-                elif force_query_individually:
+            elif force_query_individually:
+                # Each task of an array has its own command
+                l_entries = [
+                    (f"{jobid}_{task}", dic_task) for task, dic_task in dic_job["tasks"].items()
+                ] or [(str(jobid), dic_job)]
+                for id_entry, dic_entry in l_entries:
+                    if dic_entry["state"] != status:
+                        continue
                     if first_line:
                         logging.warning(
                             "Warning, some jobs are queuing/running and the id-job file is"
-                            " missing... Querying them individually."
+                            " missing... Getting their path from their command."
                         )
                         first_line = False
-                    job_details = subprocess.run(
-                        ["condor_q", "-l", f"{jobid}"], capture_output=True
-                    ).stdout.decode("utf-8")
-                    job = job_details.split('Cmd = "')[1].split("run.sh")[0]
+                    if "run.sh" in dic_entry["cmd"]:
+                        job = dic_entry["cmd"].split("run.sh")[0]
+                    elif scheduler == "slurm":
+                        # Slurm docker jobs are submitted through the submission file, not run.sh
+                        job_details = subprocess.run(
+                            ["scontrol", "show", "jobid", "-dd", id_entry], capture_output=True
+                        ).stdout.decode("utf-8")
+                        if "output.txt" not in job_details:
+                            continue
+                        job = job_details.split("StdOut=")[1].split("output.txt")[0]
+                    else:
+                        continue
+
+                    # Only get path after study_name
+                    if self.study_name in job:
+                        job = job.split(self.study_name)[1]
+                        l_path_jobs.append(f"{self.study_name}{job}")
+
+            elif dic_job["state"] == status and first_line:
+                logging.warning(
+                    "Warning, some jobs are queuing/running and the id-job file is"
+                    " missing... Ignoring them."
+                )
+                first_line = False
 
-                    # Only get path after master_study
-                    job = job.split(self.study_name)[1]
-                    l_path_jobs.append(f"{self.study_name}{job}")
+        return l_path_jobs
 
-                elif first_line:
-                    logging.warning(
-                        "Warning, some jobs are queuing/running and the id-job file is"
-                        " missing... Ignoring them."
-                    )
-                    first_line = False
+    def _get_condor_jobs(self, status: str, force_query_individually: bool = False) -> list[str]:
+        """
+        Retrieve the paths of Condor jobs based on their status (see _get_scheduler_jobs).
 
-        return l_path_jobs
+        Args:
+            status (str): The status of the jobs to retrieve. Can be "running" or "queuing".
+            force_query_individually (bool, optional): If True, get the path of the jobs that are
+                not in the id-job file from their command. Defaults to False.
 
-    def _get_slurm_jobs(self, status: str, force_query_individually: bool = False) -> list[str]:
+        Returns:
+            list[str]: A list of paths to the jobs that match the specified status.
         """
-        Retrieve a list of SLURM job paths based on their status.
+        return self._get_scheduler_jobs("htc", status, force_query_individually)
 
-        This method queries SLURM to get the job IDs and their statuses for the current user.
-        It then attempts to map these job IDs to their corresponding paths using an internal
-        dictionary. If the dictionary is not available or does not contain the job ID, it can
-        optionally query each job individually for its details.
+    def _get_slurm_jobs(self, status: str, force_query_individually: bool = False) -> list[str]:
+        """
+        Retrieve a list of SLURM job paths based on their status (see _get_scheduler_jobs).
 
         Args:
             status (str): The status of the jobs to retrieve. Expected values are "running" or
                 "queuing".
-            force_query_individually (bool, optional): If True, query each job individually for its
-                details when the job ID is not found in the internal dictionary. Defaults to False.
+            force_query_individually (bool, optional): If True, get the path of the jobs that are
+                not in the id-job file from their command. Defaults to False.
 
         Returns:
             list[str]: A list of job paths corresponding to the specified status.
         """
-        l_path_jobs = []
-        dic_status = {"running": "RUNNING", "queuing": "PENDING"}
-        username = (
-            subprocess.run(["id", "-u", "-n"], capture_output=True).stdout.decode("utf-8").strip()
-        )
-        slurm_output = subprocess.run(
-            ["squeue", "-u", f"{username}", "-t", dic_status[status]], capture_output=True
-        ).stdout.decode("utf-8")
-
-        # Get job id and details
-        first_line = True
-        first_missing_job = True
-        for line in slurm_output.split("\n")[1:]:
-            l_split = line.split()
-            if len(l_split) == 0:
-                break
-            jobid = int(l_split[0])
-            slurm_status = l_split[4]  # R or PD  # noqa: F841
-
-            # Get path from dic_id_to_path_job if available
-            if self.dic_id_to_path_job is not None:
-                if jobid in self.dic_id_to_path_job:
-                    l_path_jobs.append(self.dic_id_to_path_job[jobid])
-                elif first_missing_job:
-                    logging.warning(
-                        "Warning, some jobs are queuing/running and are not in the id-job"
-                        " file. They may come from another study. Ignoring them."
-                    )
-                    first_missing_job = False
-
-            elif force_query_individually:
-                if first_line:
-                    logging.warning(
-                        "Warning, some jobs are queuing/running and the id-job file is"
-                        " missing... Querying them individually."
-                    )
-                    first_line = False
-                job_details = subprocess.run(
-                    ["scontrol", "show", "jobid", "-dd", f"{jobid}"], capture_output=True
-                ).stdout.decode("utf-8")
-                job = (
-                    job_details.split("Command=")[1].split("run.sh")[0]
-                    if "run.sh" in job_details
-                    else job_details.split("StdOut=")[1].split("output.txt")[0]
-                )
-                # Only get path after study_name
-                job = job.split(self.study_name)[1]
-                l_path_jobs.append(f"{self.study_name}{job}")
-
-            elif first_line:
-                logging.warning(
-                    "Warning, some jobs are queuing/running and the id-job file is"
-                    " missing... Ignoring them."
-                )
-                first_line = False
-
-        return l_path_jobs
+        return self._get_scheduler_jobs("slurm", status, force_query_individually)
 
     def querying_jobs(
         self, check_local: bool, check_htc: bool, check_slurm: bool, status: str = "running"
@@ -956,14 +1280,9 @@ class ClusterSubmission:
         Returns:
             list[str]: A list of job paths that match the query criteria.
         """
-        # sourcery skip: remove-redundant-if, remove-redundant-pass, swap-nested-ifs
         l_path_jobs = []
         if check_local:
-            if status == "running":
-                l_path_jobs.extend(self._get_local_jobs())
-            else:
-                # Always empty return as there is no queuing in local pc
-                pass
+            l_path_jobs.extend(self._get_local_jobs(status))
 
         if check_htc:
             l_path_jobs.extend(self._get_condor_jobs(status))
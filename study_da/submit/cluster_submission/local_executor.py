@@ -0,0 +1,596 @@
+"""This module contains the LocalExecutor class, used to run the jobs submitted on the local
+machine with a bounded number of processes.
+
+The jobs are kept in a queue and started as soon as a worker is free (and, optionally, as long as
+the memory used by the running jobs is below a limit), by a thread running in the background of
+the submission process. The pid of each job is written in its folder (.pid), such that the jobs
+started by a previous submission process are found without scanning all the processes of the
+machine. The executor is shared by all the submissions of the process (see get_local_executor).
+
+The jobs still queuing when the submission process exits are handed over to a dispatcher process
+detached from it (see LocalExecutor.detach), whose pid is written in their folder (.queued). There
+is at most one detached dispatcher per machine (and user): as long as it is alive, the executors
+of the next submission processes hand their jobs over to it instead of starting them, such that
+the number of workers and the memory limit hold for all the local jobs of the machine.
+"""
+
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+# Standard library imports
+import atexit
+import getpass
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+# Third party imports
+import psutil
+from filelock import FileLock
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Name of the file containing the pid of a job, in the job folder
+NAME_PID_FILE = ".pid"
+
+# Name of the file containing the pid of the detached dispatcher of a queuing job, in the job folder
+NAME_QUEUE_FILE = ".queued"
+
+# Module run by the detached dispatcher
+MODULE_DISPATCHER = "study_da.submit.cluster_submission.local_executor"
+
+# Folder of the detached dispatcher of the machine, containing its pid, its lock, and the jobs
+# handed over to it (one file per hand-over, in the inbox subfolder)
+PATH_DISPATCHER = os.path.join(tempfile.gettempdir(), f"study_da_dispatcher_{getpass.getuser()}")
+NAME_DISPATCHER_PID_FILE = "dispatcher.pid"
+NAME_DISPATCHER_LOCK_FILE = "dispatcher.lock"
+NAME_DISPATCHER_INBOX = "inbox"
+
+# Interval between two updates of the executor, in seconds
+POLL_INTERVAL = 1.0
+
+
+# ==================================================================================================
+# --- Functions
+# ==================================================================================================
+def get_pid_job(abs_path_job: str) -> Optional[int]:
+    """
+    Gets the pid of a job from its folder, if the job is still running.
+
+    Args:
+        abs_path_job (str): The absolute path to the job folder.
+
+    Returns:
+        Optional[int]: The pid of the job if it is running, None otherwise.
+    """
+    try:
+        with open(f"{abs_path_job.rstrip('/')}/{NAME_PID_FILE}") as fid:
+            pid = int(fid.read().strip())
+        # Ensure the pid has not been reused by another process
+        l_cmdline = psutil.Process(pid).cmdline()
+    except (OSError, ValueError, psutil.Error):
+        return None
+    if f"{abs_path_job.rstrip('/')}/run.sh" not in l_cmdline:
+        return None
+    return pid
+
+
+def is_job_queued_detached(abs_path_job: str) -> bool:
+    """
+    Checks if a job is queuing in a detached dispatcher (see LocalExecutor.detach) that is still
+    alive.
+
+    Args:
+        abs_path_job (str): The absolute path to the job folder.
+
+    Returns:
+        bool: True if the job is queuing in a detached dispatcher, False otherwise.
+    """
+    try:
+        with open(f"{abs_path_job.rstrip('/')}/{NAME_QUEUE_FILE}") as fid:
+            pid = int(fid.read().strip())
+        # Ensure the pid has not been reused by another process
+        l_cmdline = psutil.Process(pid).cmdline()
+    except (OSError, ValueError, psutil.Error):
+        return False
+    return MODULE_DISPATCHER in l_cmdline
+
+
+def get_pid_dispatcher(path_dispatcher: str) -> Optional[int]:
+    """
+    Gets the pid of the detached dispatcher of the machine, if it is still alive.
+
+    Args:
+        path_dispatcher (str): The folder of the detached dispatcher.
+
+    Returns:
+        Optional[int]: The pid of the dispatcher if it is alive, None otherwise.
+    """
+    try:
+        with open(f"{path_dispatcher}/{NAME_DISPATCHER_PID_FILE}") as fid:
+            pid = int(fid.read().strip())
+        # Ensure the pid has not been reused by another process
+        l_cmdline = psutil.Process(pid).cmdline()
+    except (OSError, ValueError, psutil.Error):
+        return None
+    if MODULE_DISPATCHER not in l_cmdline or path_dispatcher not in l_cmdline:
+        return None
+    return pid
+
+
+def get_available_cores() -> int:
+    """
+    Gets the number of cores available to the current process.
+
+    Returns:
+        int: The number of available cores.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# ==================================================================================================
+# --- Class
+# ==================================================================================================
+class LocalExecutor:
+    """
+    A class to run the local jobs with a bounded pool of processes.
+
+    Attributes:
+        n_workers (int): The maximum number of jobs running at the same time.
+        memory_limit (Optional[float]): The maximum memory used by the running jobs (in GB) for a
+            new job to be started.
+        queue_jobs (deque[str]): The folders of the jobs waiting for a worker.
+        dic_running (dict[str, dict[str, Any]]): The running jobs, with their process and start
+            time, indexed by their folder.
+        path_dispatcher (str): The folder of the detached dispatcher of the machine.
+
+    Methods:
+        __init__(n_workers=None, memory_limit=None, path_dispatcher=None): Initializes the
+            LocalExecutor class.
+        submit(l_abs_path_jobs): Adds jobs to the queue, and starts them if workers are free.
+        adopt(abs_path_job, pid): Tracks a job started by another process.
+        detach(): Hands the queued jobs over to a detached dispatcher.
+        get_running_jobs(): Gets the folders of the running jobs.
+        get_queuing_jobs(): Gets the folders of the queuing jobs.
+        get_stats(): Gets the throughput statistics of the executor.
+    """
+
+    def __init__(
+        self,
+        n_workers: Optional[int] = None,
+        memory_limit: Optional[float] = None,
+        path_dispatcher: Optional[str] = None,
+    ):
+        """
+        Initializes the LocalExecutor class.
+
+        Args:
+            n_workers (Optional[int], optional): The maximum number of jobs running at the same
+                time. Defaults to None, corresponding to the number of available cores.
+            memory_limit (Optional[float], optional): The maximum memory (resident set size, in
+                GB) used by the running jobs for a new job to be started. Defaults to None (no
+                limit).
+            path_dispatcher (Optional[str], optional): The folder of the detached dispatcher of
+                the machine. Defaults to None, corresponding to PATH_DISPATCHER.
+        """
+        self.n_workers: int = n_workers if n_workers is not None else get_available_cores()
+        self.memory_limit: Optional[float] = memory_limit
+        self.queue_jobs: deque[str] = deque()
+        self.dic_running: dict[str, dict[str, Any]] = {}
+        self.path_dispatcher: str = (
+            path_dispatcher if path_dispatcher is not None else PATH_DISPATCHER
+        )
+
+        # Statistics
+        self.time_first_start: Optional[float] = None
+        self.n_started: int = 0
+        self.n_completed: int = 0
+        self.n_failed: int = 0
+        self.total_duration: float = 0.0
+
+        # Thread starting the queued jobs in the background
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, l_abs_path_jobs: list[str]) -> list[str]:
+        """
+        Adds jobs to the queue, and starts them if workers are free. The remaining jobs are
+        started in the background as the running jobs finish, by the submission process as long
+        as it is alive, and then by a detached dispatcher (see detach). If the detached dispatcher
+        of a previous submission process is still alive, all the jobs are handed over to it.
+
+        Args:
+            l_abs_path_jobs (list[str]): The absolute paths to the job folders.
+
+        Returns:
+            list[str]: The jobs started immediately.
+        """
+        with self._lock:
+            set_known = set(self.queue_jobs) | set(self.dic_running)
+            self.queue_jobs.extend(
+                abs_path_job.rstrip("/")
+                for abs_path_job in l_abs_path_jobs
+                if abs_path_job.rstrip("/") not in set_known
+            )
+            l_started = self._update()
+
+            # Start the thread running the queue in the background
+            if (self.queue_jobs or self.dic_running) and self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+        return l_started
+
+    def adopt(self, abs_path_job: str, pid: int) -> None:
+        """
+        Tracks a job started by another process (e.g. a previous submission), such that it counts
+        in the number of running jobs.
+
+        Args:
+            abs_path_job (str): The absolute path to the job folder.
+            pid (int): The pid of the job.
+        """
+        with self._lock:
+            abs_path_job = abs_path_job.rstrip("/")
+            if abs_path_job in self.dic_running:
+                return
+            try:
+                process = psutil.Process(pid)
+            except psutil.Error:
+                return
+            self.dic_running[abs_path_job] = {
+                "process": process,
+                "time_start": process.create_time(),
+                "adopted": True,
+            }
+
+    def detach(self) -> Optional[int]:
+        """
+        Hands the queued jobs over to a dispatcher process detached from the submission process,
+        such that they are still started once the submission process is over. The running jobs
+        are given to the dispatcher as well, such that they count in its number of running jobs.
+        The dispatcher of a previous submission process is reused if it is still alive.
+
+        Returns:
+            Optional[int]: The pid of the dispatcher, or None if no job is queuing.
+        """
+        with self._lock:
+            self._update()
+            if not self.queue_jobs:
+                return None
+
+            with self._get_dispatcher_lock():
+                pid_dispatcher = get_pid_dispatcher(self.path_dispatcher)
+                if pid_dispatcher is None:
+                    pid_dispatcher = self._start_dispatcher()
+                self._hand_over(pid_dispatcher)
+
+        return pid_dispatcher
+
+    def _get_dispatcher_lock(self) -> FileLock:
+        """
+        Gets the lock of the detached dispatcher, held to start it, to hand jobs over to it, and by
+        the dispatcher itself to check if it is done.
+
+        Returns:
+            FileLock: The lock of the detached dispatcher.
+        """
+        os.makedirs(f"{self.path_dispatcher}/{NAME_DISPATCHER_INBOX}", exist_ok=True)
+        return FileLock(f"{self.path_dispatcher}/{NAME_DISPATCHER_LOCK_FILE}", timeout=60)
+
+    def _start_dispatcher(self) -> int:
+        """
+        Starts the detached dispatcher, and writes its pid in its folder. Must be called with the
+        lock of the dispatcher acquired.
+
+        Returns:
+            int: The pid of the dispatcher.
+        """
+        # Make sure the dispatcher can import the package, even if it's not installed
+        path_package = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [os.path.abspath(path_package)] + [path for path in [env.get("PYTHONPATH")] if path]
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-m", MODULE_DISPATCHER, self.path_dispatcher],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            env=env,
+        )
+        with open(f"{self.path_dispatcher}/{NAME_DISPATCHER_PID_FILE}", "w") as fid:
+            fid.write(str(process.pid))
+        return process.pid
+
+    def _hand_over(self, pid_dispatcher: int) -> None:
+        """
+        Hands the queued and running jobs over to the detached dispatcher, through a file of its
+        inbox. Must be called with the lock and the lock of the dispatcher acquired.
+
+        Args:
+            pid_dispatcher (int): The pid of the dispatcher.
+        """
+        dic_state = {
+            "n_workers": self.n_workers,
+            "memory_limit": self.memory_limit,
+            "running": list(self.dic_running),
+            "queuing": list(self.queue_jobs),
+        }
+        path_inbox = f"{self.path_dispatcher}/{NAME_DISPATCHER_INBOX}"
+        name_state = f"{time.time_ns()}_{os.getpid()}.json"
+        with open(f"{path_inbox}/.{name_state}", "w") as fid:
+            json.dump(dic_state, fid)
+        # Rename once written, such that the dispatcher never reads a partial file
+        os.replace(f"{path_inbox}/.{name_state}", f"{path_inbox}/{name_state}")
+
+        # Mark the jobs as queuing in the dispatcher, for the next submissions
+        for abs_path_job in self.queue_jobs:
+            with open(f"{abs_path_job}/{NAME_QUEUE_FILE}", "w") as fid:
+                fid.write(str(pid_dispatcher))
+        logging.info(
+            f"{len(self.queue_jobs)} queuing and {len(self.dic_running)} running local jobs are"
+            f" handed over to the detached dispatcher {pid_dispatcher}"
+        )
+        self.queue_jobs.clear()
+        self.dic_running.clear()
+
+    def _take_over(self, dic_state: dict[str, Any]) -> None:
+        """
+        Takes over the jobs handed over by another executor (see _hand_over), with its number of
+        workers and memory limit.
+
+        Args:
+            dic_state (dict[str, Any]): The state of the executor handing the jobs over.
+        """
+        self.n_workers = dic_state["n_workers"]
+        self.memory_limit = dic_state["memory_limit"]
+        for abs_path_job in dic_state["running"]:
+            if (pid := get_pid_job(abs_path_job)) is not None:
+                self.adopt(abs_path_job, pid)
+        self.submit(dic_state["queuing"])
+
+    def _get_memory_used(self) -> float:
+        """
+        Gets the memory used by the running jobs (including their children).
+
+        Returns:
+            float: The resident set size of the running jobs, in GB.
+        """
+        memory = 0
+        for dic_job in self.dic_running.values():
+            try:
+                process = psutil.Process(dic_job["process"].pid)
+                for proc in [process] + process.children(recursive=True):
+                    memory += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return memory / 1024**3
+
+    def _start_job(self, abs_path_job: str) -> None:
+        """
+        Starts a job in its own session (such that it survives the submission process), and writes
+        its pid in its folder.
+
+        Args:
+            abs_path_job (str): The absolute path to the job folder.
+        """
+        logging.info(f'Starting local job "{abs_path_job}"')
+        process = subprocess.Popen(
+            ["bash", f"{abs_path_job}/run.sh"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        with open(f"{abs_path_job}/{NAME_PID_FILE}", "w") as fid:
+            fid.write(str(process.pid))
+        if os.path.exists(f"{abs_path_job}/{NAME_QUEUE_FILE}"):
+            os.remove(f"{abs_path_job}/{NAME_QUEUE_FILE}")
+
+        self.dic_running[abs_path_job] = {
+            "process": process,
+            "time_start": time.time(),
+            "adopted": False,
+        }
+        self.n_started += 1
+        if self.time_first_start is None:
+            self.time_first_start = time.time()
+
+    def _update(self) -> list[str]:
+        """
+        Removes the jobs that are over, and starts queued jobs while workers are free. If the
+        detached dispatcher of the machine is alive (and is not the current process), the jobs are
+        handed over to it instead. Must be called with the lock acquired.
+
+        Returns:
+            list[str]: The jobs started.
+        """
+        # Only the detached dispatcher starts jobs as long as it is alive
+        if (self.queue_jobs or self.dic_running) and get_pid_dispatcher(
+            self.path_dispatcher
+        ) not in [None, os.getpid()]:
+            with self._get_dispatcher_lock():
+                # The dispatcher may have exited in the meantime
+                pid_dispatcher = get_pid_dispatcher(self.path_dispatcher)
+                if pid_dispatcher is not None:
+                    self._hand_over(pid_dispatcher)
+                    return []
+
+        # Remove the jobs that are over
+        for abs_path_job, dic_job in list(self.dic_running.items()):
+            if dic_job["adopted"]:
+                try:
+                    over = not dic_job["process"].is_running()
+                except psutil.Error:
+                    over = True
+                if over:
+                    del self.dic_running[abs_path_job]
+                continue
+
+            returncode = dic_job["process"].poll()
+            if returncode is not None:
+                del self.dic_running[abs_path_job]
+                self.n_completed += 1
+                self.n_failed += int(returncode != 0)
+                self.total_duration += time.time() - dic_job["time_start"]
+
+        # Start queued jobs while workers (and memory) are available
+        l_started = []
+        while self.queue_jobs and len(self.dic_running) < self.n_workers:
+            if (
+                self.memory_limit is not None
+                and self.dic_running
+                and self._get_memory_used() >= self.memory_limit
+            ):
+                break
+            abs_path_job = self.queue_jobs.popleft()
+            self._start_job(abs_path_job)
+            l_started.append(abs_path_job)
+
+        return l_started
+
+    def _run(self) -> None:
+        """
+        Updates the executor until all the jobs are over.
+        """
+        while True:
+            time.sleep(POLL_INTERVAL)
+            with self._lock:
+                self._update()
+                if not self.queue_jobs and not self.dic_running:
+                    self._thread = None
+                    return
+
+    def get_running_jobs(self) -> list[str]:
+        """
+        Gets the folders of the running jobs.
+
+        Returns:
+            list[str]: The absolute paths to the folders of the running jobs.
+        """
+        with self._lock:
+            self._update()
+            return list(self.dic_running)
+
+    def get_queuing_jobs(self) -> list[str]:
+        """
+        Gets the folders of the jobs waiting for a worker.
+
+        Returns:
+            list[str]: The absolute paths to the folders of the queuing jobs.
+        """
+        with self._lock:
+            return list(self.queue_jobs)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Gets the throughput statistics of the executor (for the jobs it started).
+
+        Returns:
+            dict[str, Any]: The number of jobs started, running, queuing, completed and failed,
+                the mean duration of the completed jobs (in seconds), and the throughput (in
+                completed jobs per hour).
+        """
+        with self._lock:
+            self._update()
+            elapsed = time.time() - self.time_first_start if self.time_first_start else 0.0
+            return {
+                "n_workers": self.n_workers,
+                "started": self.n_started,
+                "running": len(self.dic_running),
+                "queuing": len(self.queue_jobs),
+                "completed": self.n_completed,
+                "failed": self.n_failed,
+                "mean_duration": (
+                    self.total_duration / self.n_completed if self.n_completed else None
+                ),
+                "throughput_per_hour": self.n_completed / elapsed * 3600 if elapsed else None,
+            }
+
+
+# ==================================================================================================
+# --- Shared executor
+# ==================================================================================================
+_local_executor: Optional[LocalExecutor] = None
+
+
+def get_local_executor(
+    n_workers: Optional[int] = None, memory_limit: Optional[float] = None
+) -> LocalExecutor:
+    """
+    Gets the executor shared by all the local submissions of the process, creating it if needed
+    (its queued jobs are then handed over to a detached dispatcher when the process exits). The
+    number of workers and the memory limit are updated if provided.
+
+    Args:
+        n_workers (Optional[int], optional): The maximum number of jobs running at the same time.
+            Defaults to None (number of available cores, or unchanged).
+        memory_limit (Optional[float], optional): The maximum memory used by the running jobs, in
+            GB. Defaults to None (no limit, or unchanged).
+
+    Returns:
+        LocalExecutor: The shared executor.
+    """
+    global _local_executor
+    if _local_executor is None:
+        _local_executor = LocalExecutor(n_workers, memory_limit)
+        atexit.register(_local_executor.detach)
+    else:
+        if n_workers is not None:
+            _local_executor.n_workers = n_workers
+        if memory_limit is not None:
+            _local_executor.memory_limit = memory_limit
+    return _local_executor
+
+
+# ==================================================================================================
+# --- Detached dispatcher
+# ==================================================================================================
+def run_detached_dispatcher(path_dispatcher: str) -> None:
+    """
+    Runs the jobs handed over by the executors (see LocalExecutor.detach) through the inbox of the
+    dispatcher, until they are all over and no more jobs are handed over.
+
+    Args:
+        path_dispatcher (str): The folder of the detached dispatcher.
+    """
+    local_executor = LocalExecutor(path_dispatcher=path_dispatcher)
+    path_inbox = f"{path_dispatcher}/{NAME_DISPATCHER_INBOX}"
+    while True:
+        with local_executor._get_dispatcher_lock():
+            l_dic_state = []
+            for name_state in sorted(os.listdir(path_inbox)):
+                if name_state.startswith("."):
+                    continue
+                with open(f"{path_inbox}/{name_state}") as fid:
+                    l_dic_state.append(json.load(fid))
+                os.remove(f"{path_inbox}/{name_state}")
+
+            # Stop once all the jobs are over, such that the next executors start jobs themselves
+            if (
+                not l_dic_state
+                and not local_executor.get_running_jobs()
+                and not local_executor.get_queuing_jobs()
+            ):
+                if get_pid_dispatcher(path_dispatcher) == os.getpid():
+                    os.remove(f"{path_dispatcher}/{NAME_DISPATCHER_PID_FILE}")
+                return
+
+        for dic_state in l_dic_state:
+            local_executor._take_over(dic_state)
+        time.sleep(POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    run_detached_dispatcher(sys.argv[1])
@@ -0,0 +1,195 @@
+"""This module contains the functions used to poll the queue of the cluster schedulers (HTCondor
+and Slurm).
+
+Each poll issues a single machine-readable query for all the jobs of the user, and parses it into
+a dictionary mapping the job ids to their state and command. The state of each task of a job
+(HTCondor proc, or Slurm array task) is also kept, such that the jobs submitted as arrays can be
+followed individually. The result is cached for a short time
+(TTL), shared by all the callers of the process, such that the running and queuing jobs of several
+submission types or generations are obtained from the same query.
+"""
+
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+# Standard library imports
+import getpass
+import logging
+import subprocess
+import time
+from typing import Any, Optional
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Default time during which the state of the queue is reused, in seconds
+DEFAULT_TTL = 10.0
+
+# HTCondor JobStatus codes (see the job ClassAd attributes in the HTCondor documentation)
+DIC_CONDOR_STATUS = {
+    "1": "queuing",
+    "2": "running",
+    "3": "removed",
+    "4": "completed",
+    "5": "held",
+    "6": "transferring_output",
+    "7": "suspended",
+}
+
+# Slurm job states
+DIC_SLURM_STATUS = {"RUNNING": "running", "PENDING": "queuing"}
+
+# Priority of the states when several jobs share the same id (e.g. HTCondor procs of a cluster)
+L_STATES_PRIORITY = ["running", "queuing"]
+
+# ==================================================================================================
+# --- Cache
+# ==================================================================================================
+# State of the queue of each scheduler, along with the time of the query
+_dic_queue_cache: dict[str, tuple[float, dict[int, dict[str, Any]]]] = {}
+
+
+# ==================================================================================================
+# --- Functions
+# ==================================================================================================
+def _merge_job_state(
+    dic_queue: dict[int, dict[str, Any]],
+    job_id: int,
+    state: str,
+    cmd: str,
+    l_tasks: Optional[list[int]] = None,
+) -> None:
+    """
+    Adds a job to the state of the queue. If the id is already present (several jobs sharing the
+    same id), the state with the highest priority is kept (running, then queuing).
+
+    Args:
+        dic_queue (dict[int, dict[str, Any]]): The state of the queue, mutated inplace.
+        job_id (int): The id of the job.
+        state (str): The state of the job.
+        cmd (str): The command of the job.
+        l_tasks (Optional[list[int]], optional): The indices of the tasks of the job (HTCondor
+            procs or Slurm array tasks) in this state. Defaults to None.
+    """
+
+    def get_priority(state: str) -> int:
+        return (
+            L_STATES_PRIORITY.index(state) if state in L_STATES_PRIORITY else len(L_STATES_PRIORITY)
+        )
+
+    if job_id not in dic_queue:
+        dic_queue[job_id] = {"state": state, "cmd": cmd, "tasks": {}}
+    elif get_priority(state) < get_priority(dic_queue[job_id]["state"]):
+        dic_queue[job_id].update({"state": state, "cmd": cmd})
+
+    for task in l_tasks or []:
+        dic_queue[job_id]["tasks"][task] = {"state": state, "cmd": cmd}
+
+
+def _parse_slurm_array_tasks(str_tasks: str) -> list[int]:
+    """
+    Parses the tasks of a Slurm array job, as reported by squeue (e.g. "4" for a running task, or
+    "[0-3,7%2]" for pending tasks).
+
+    Args:
+        str_tasks (str): The tasks of the array job.
+
+    Returns:
+        list[int]: The indices of the tasks.
+    """
+    l_tasks = []
+    for str_range in str_tasks.strip("[]").split("%")[0].split(","):
+        start, _, end = str_range.partition("-")
+        if start.isdigit() and (not end or end.isdigit()):
+            l_tasks.extend(range(int(start), int(end or start) + 1))
+    return l_tasks
+
+
+def query_condor_queue() -> dict[int, dict[str, Any]]:
+    """
+    Queries the HTCondor queue of the user with a single autoformat query.
+
+    Returns:
+        dict[int, dict[str, Any]]: A dictionary mapping the cluster ids to the state and the
+            command of the jobs, and of each of their procs.
+    """
+    condor_output = subprocess.run(
+        ["condor_q", "-af", "ClusterId", "ProcId", "JobStatus", "Cmd"], capture_output=True
+    ).stdout.decode("utf-8")
+
+    dic_queue = {}
+    for line in condor_output.splitlines():
+        l_split = line.split(maxsplit=3)
+        if len(l_split) < 3 or not l_split[0].isdigit() or not l_split[1].isdigit():
+            continue
+        cmd = l_split[3] if len(l_split) > 3 else ""
+        state = DIC_CONDOR_STATUS.get(l_split[2], "unknown")
+        _merge_job_state(dic_queue, int(l_split[0]), state, cmd, [int(l_split[1])])
+
+    return dic_queue
+
+
+def query_slurm_queue() -> dict[int, dict[str, Any]]:
+    """
+    Queries the Slurm queue of the user with a single formatted query.
+
+    Returns:
+        dict[int, dict[str, Any]]: A dictionary mapping the job ids to the state and the command of
+            the jobs, and of each of their array tasks.
+    """
+    slurm_output = subprocess.run(
+        ["squeue", "-h", "-u", getpass.getuser(), "--format=%i %T %o"], capture_output=True
+    ).stdout.decode("utf-8")
+
+    dic_queue = {}
+    for line in slurm_output.splitlines():
+        l_split = line.split(maxsplit=2)
+        if len(l_split) < 2:
+            continue
+        # Job arrays are reported as jobid_taskid, or jobid_[tasks] for pending tasks
+        job_id, _, str_tasks = l_split[0].partition("_")
+        if not job_id.isdigit():
+            continue
+        cmd = l_split[2] if len(l_split) > 2 else ""
+        state = DIC_SLURM_STATUS.get(l_split[1], l_split[1].lower())
+        _merge_job_state(dic_queue, int(job_id), state, cmd, _parse_slurm_array_tasks(str_tasks))
+
+    return dic_queue
+
+
+def get_queue_state(scheduler: str, ttl: float = DEFAULT_TTL) -> dict[int, dict[str, Any]]:
+    """
+    Gets the state of the queue of a scheduler, querying it only if the cached state is older than
+    the TTL.
+
+    Args:
+        scheduler (str): The scheduler to query, either "htc" or "slurm".
+        ttl (float, optional): The time during which the cached state is reused, in seconds.
+            Defaults to DEFAULT_TTL.
+
+    Returns:
+        dict[int, dict[str, Any]]: A dictionary mapping the job ids to the state ("running",
+            "queuing", etc.), the command, and the tasks (procs or array tasks) of the jobs.
+    """
+    if scheduler in _dic_queue_cache:
+        time_query, dic_queue = _dic_queue_cache[scheduler]
+        if time.time() - time_query < ttl:
+            return dic_queue
+
+    if scheduler == "htc":
+        dic_queue = query_condor_queue()
+    elif scheduler == "slurm":
+        dic_queue = query_slurm_queue()
+    else:
+        raise ValueError(f"Scheduler {scheduler} is not recognized. Please use 'htc' or 'slurm'.")
+
+    logging.info(f"Queried the {scheduler} queue: {len(dic_queue)} jobs found.")
+    _dic_queue_cache[scheduler] = (time.time(), dic_queue)
+    return dic_queue
+
+
+def clear_queue_cache() -> None:
+    """
+    Clears the cached state of the queues (e.g. after a submission, to see the new jobs).
+    """
+    _dic_queue_cache.clear()
@@ -23,6 +23,10 @@ class SubmissionStatement:
         __init__(sub_filename: str, path_job_folder: str, gpu: bool | None):
             Initializes the SubmissionStatement with the given filename, job folder path, and
             gpu request.
+        get_array_statement(l_path_job_folders: list[str]) -> str:
+            Returns the content of a submission file running several jobs as a single array job.
+        get_array_submit_command(sub_filename: str) -> str:
+            Returns the command to submit an array submission file.
     """
 
     def __init__(self, sub_filename: str, path_job_folder: str, gpu: bool | None):
@@ -55,6 +59,103 @@ class SubmissionStatement:
             self.request_GPUs: int = 0
             self.slurm_queue_statement: str = "#SBATCH --partition=slurm_hpc_acc"
 
+    def get_array_statement(self, l_path_job_folders: list[str]) -> str:
+        """
+        Returns the content of a submission file running several jobs (sharing the same
+        configuration as the current job) as a single array job.
+
+        Args:
+            l_path_job_folders (list[str]): The paths to the job folders, in the order of the array
+                indices.
+
+        Raises:
+            NotImplementedError: If the submission mode doesn't support array jobs.
+
+        Returns:
+            str: The content of the array submission file.
+        """
+        raise NotImplementedError(
+            f"Array jobs are not supported for {self.__class__.__name__} submissions."
+        )
+
+    @staticmethod
+    def get_array_submit_command(sub_filename: str) -> str:
+        """
+        Returns the command to submit an array submission file.
+
+        Args:
+            sub_filename (str): The name of the submission file.
+
+        Raises:
+            NotImplementedError: If the submission mode doesn't support array jobs.
+
+        Returns:
+            str: The command to submit the array job.
+        """
+        raise NotImplementedError("Array jobs are not supported for this submission mode.")
+
+    def _get_slurm_array_statement(
+        self, l_path_job_folders: list[str], command: str, comment: str
+    ) -> str:
+        """
+        Returns the content of an sbatch script running one job per array task, the job folder
+        being resolved from the array index. The output of each job is written in its folder.
+
+        Args:
+            l_path_job_folders (list[str]): The paths to the job folders, in the order of the array
+                indices.
+            command (str): The command running the job, using $path_job as the job folder.
+            comment (str): The comment describing the submission file.
+
+        Returns:
+            str: The content of the sbatch script.
+        """
+        str_path_job_folders = "\n".join(
+            f'"{path_job_folder.rstrip("/")}"' for path_job_folder in l_path_job_folders
+        )
+        return (
+            "#!/bin/bash\n"
+            + f"# {comment}\n"
+            + (f"{self.slurm_queue_statement}\n" if self.slurm_queue_statement else "")
+            + "#SBATCH --output=/dev/null\n"
+            + "#SBATCH --error=/dev/null\n"
+            + "#SBATCH --ntasks=2\n"
+            + f"#SBATCH --gres=gpu:{self.request_GPUs}\n"
+            + f"#SBATCH --array=0-{len(l_path_job_folders) - 1}\n\n"
+            + f"l_path_job=(\n{str_path_job_folders}\n)\n"
+            + "path_job=${l_path_job[$SLURM_ARRAY_TASK_ID]}\n"
+            + f"{command} > $path_job/output.txt 2> $path_job/error.txt\n"
+        )
+
+    def _get_htc_array_statement(
+        self, l_path_job_folders: list[str], head: str, htc_flavor: str, tail: str
+    ) -> str:
+        """
+        Returns the content of an HTCondor submission file queuing one job per folder, the job
+        folder being resolved from the queue list.
+
+        Args:
+            l_path_job_folders (list[str]): The paths to the job folders, in the order of the procs.
+            head (str): The header of the submission file.
+            htc_flavor (str): The flavor of the HTCondor jobs.
+            tail (str): The tail of the submission file.
+
+        Returns:
+            str: The content of the submission file.
+        """
+        str_path_job_folders = "\n".join(
+            path_job_folder.rstrip("/") for path_job_folder in l_path_job_folders
+        )
+        return (
+            f"{head}\n"
+            + "initialdir = $(path_job)\n"
+            + "executable = $(path_job)/run.sh\n"
+            + f"request_GPUs = {self.request_GPUs}\n"
+            + f'+JobFlavour  = "{htc_flavor}"\n'
+            + f"queue path_job from (\n{str_path_job_folders}\n)\n"
+            + f"{tail}\n"
+        )
+
 
 class LocalPC(SubmissionStatement):
     """
@@ -141,6 +242,35 @@ class Slurm(SubmissionStatement):
         self.tail: str = "# SLURM"
         self.submit_command: str = self.get_submit_command(sub_filename)
 
+    def get_array_statement(self, l_path_job_folders: list[str]) -> str:
+        """
+        Returns the content of an sbatch script running the jobs as a single array job.
+
+        Args:
+            l_path_job_folders (list[str]): The paths to the job folders.
+
+        Returns:
+            str: The content of the array submission file.
+        """
+        return self._get_slurm_array_statement(
+            l_path_job_folders,
+            "bash $path_job/run.sh",
+            "This is a SLURM array submission file",
+        )
+
+    @staticmethod
+    def get_array_submit_command(sub_filename: str) -> str:
+        """
+        Returns the command to submit an array submission file.
+
+        Args:
+            sub_filename (str): The name of the submission file.
+
+        Returns:
+            str: The command to submit the array job.
+        """
+        return f"sbatch {sub_filename}"
+
     @staticmethod
     def get_submit_command(sub_filename: str) -> str:
         """
@@ -198,6 +328,7 @@ class SlurmDocker(SubmissionStatement):
             self.path_job_folder: str = self.path_job_folder.replace(to_replace, replacement)
             path_image: str = path_image.replace(to_replace, replacement)
             self.sub_filename: str = self.sub_filename.replace(to_replace, replacement)
+        self.path_image: str = path_image
 
         self.head: str = (
             "#!/bin/bash\n"
@@ -213,6 +344,36 @@ class SlurmDocker(SubmissionStatement):
         self.tail: str = "# SLURM Docker"
         self.submit_command: str = self.get_submit_command(sub_filename)
 
+    def get_array_statement(self, l_path_job_folders: list[str]) -> str:
+        """
+        Returns the content of an sbatch script running the jobs as a single array job.
+
+        Args:
+            l_path_job_folders (list[str]): The paths to the job folders (already fixed for INFN
+                if needed).
+
+        Returns:
+            str: The content of the array submission file.
+        """
+        return self._get_slurm_array_statement(
+            l_path_job_folders,
+            f"singularity exec {self.path_image} $path_job/run.sh",
+            "This is a SLURM array submission file using Docker",
+        )
+
+    @staticmethod
+    def get_array_submit_command(sub_filename: str) -> str:
+        """
+        Returns the command to submit an array submission file.
+
+        Args:
+            sub_filename (str): The name of the submission file.
+
+        Returns:
+            str: The command to submit the array job.
+        """
+        return f"sbatch {sub_filename}"
+
     @staticmethod
     def get_submit_command(sub_filename: str) -> str:
         """
@@ -256,6 +417,7 @@ class HTC(SubmissionStatement):
             htc_flavor (str, optional): The flavor of the HTCondor job. Defaults to "espresso".
         """
         super().__init__(sub_filename, path_job_folder, gpu)
+        self.htc_flavor: str = htc_flavor
 
         self.head: str = (
             "# This is a HTCondor submission file\n"
@@ -273,6 +435,33 @@ class HTC(SubmissionStatement):
         self.tail: str = "# HTC"
         self.submit_command: str = self.get_submit_command(sub_filename)
 
+    def get_array_statement(self, l_path_job_folders: list[str]) -> str:
+        """
+        Returns the content of a submission file queuing all the jobs in a single cluster.
+
+        Args:
+            l_path_job_folders (list[str]): The paths to the job folders.
+
+        Returns:
+            str: The content of the array submission file.
+        """
+        return self._get_htc_array_statement(
+            l_path_job_folders, self.head, self.htc_flavor, self.tail
+        )
+
+    @staticmethod
+    def get_array_submit_command(sub_filename: str) -> str:
+        """
+        Returns the command to submit an array submission file.
+
+        Args:
+            sub_filename (str): The name of the submission file.
+
+        Returns:
+            str: The command to submit the array job.
+        """
+        return f"condor_submit {sub_filename}"
+
     @staticmethod
     def get_submit_command(sub_filename: str) -> str:
         """
@@ -322,6 +511,7 @@ class HTCDocker(SubmissionStatement):
             htc_flavor (str, optional): The flavor of the HTCondor job. Defaults to "espresso".
         """
         super().__init__(sub_filename, path_job_folder, gpu)
+        self.htc_flavor: str = htc_flavor
 
         self.head: str = (
             "# This is a HTCondor submission file using Docker\n"
@@ -342,6 +532,33 @@ class HTCDocker(SubmissionStatement):
         self.tail: str = "# HTC Docker"
         self.submit_command: str = self.get_submit_command(sub_filename)
 
+    def get_array_statement(self, l_path_job_folders: list[str]) -> str:
+        """
+        Returns the content of a submission file queuing all the jobs in a single cluster.
+
+        Args:
+            l_path_job_folders (list[str]): The paths to the job folders.
+
+        Returns:
+            str: The content of the array submission file.
+        """
+        return self._get_htc_array_statement(
+            l_path_job_folders, self.head, self.htc_flavor, self.tail
+        )
+
+    @staticmethod
+    def get_array_submit_command(sub_filename: str) -> str:
+        """
+        Returns the command to submit an array submission file.
+
+        Args:
+            sub_filename (str): The name of the submission file.
+
+        Returns:
+            str: The command to submit the array job.
+        """
+        return f"condor_submit {sub_filename}"
+
     @staticmethod
     def get_submit_command(sub_filename: str) -> str:
         """
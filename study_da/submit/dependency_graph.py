@@ -4,10 +4,25 @@
 # --- Imports
 # ==================================================================================================
 # Standard library imports
+from typing import Optional
+
 # Third party imports
+import numpy as np
+
 # Local imports
 from study_da.utils import nested_get
 
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Codes of the status vector
+UNFINISHED = 0
+FINISHED = 1
+FAILED = 2
+
+# Orders in which the jobs ready to be submitted can be submitted
+SCHEDULING_POLICIES = ("tree", "critical_path", "descendants")
+
 
 # ==================================================================================================
 # --- Class
@@ -16,29 +31,190 @@ class DependencyGraph:
     """
     A class to manage the dependencies between jobs.
 
+    A job depends on all the jobs located in the parent folders of its own folder. Internally, the
+    jobs and their folders are identified by integers: each folder points to its closest parent
+    folder containing jobs, and the jobs of each folder are stored as an adjacency (CSR) array.
+    The status of the jobs is kept in a vector, from which the number of unfinished dependencies
+    and the presence of a failed dependency are computed for all jobs at once, browsing the folders
+    one depth level at a time. The graph only depends on the jobs of the study, such that it can be
+    kept between two status checks and only its status vector updated.
+
     Attributes:
         dic_tree (dict): The dictionary representing the job tree.
         dic_all_jobs (dict): The dictionary containing all jobs and their details.
         dependency_graph (dict): The dictionary representing the dependency graph.
+        l_jobs (list[str]): The jobs, indexed by their integer id.
+        array_status (np.ndarray): The status of each job (UNFINISHED, FINISHED or FAILED).
+        array_n_unfinished_dependencies (np.ndarray): The number of unfinished dependencies of
+            each job.
+        array_has_failed_dependency (np.ndarray): Whether each job has a failed dependency.
 
     Methods:
-        __init__(dic_tree, dic_all_jobs): Initializes the DependencyGraph class.
+        __init__(dic_tree, dic_all_jobs, dic_status): Initializes the DependencyGraph class.
+        update_status(dic_tree): Updates the status vector from the tree.
+        update_jobs_status(dic_status): Updates the status vector from the status of the jobs.
         build_full_dependency_graph(): Builds the full dependency graph.
         get_unfinished_dependency(job): Gets the list of unfinished dependencies for a given job.
+        get_failed_dependency(job): Gets the list of failed dependencies for a given job.
+        get_downstream_work(): Gets the unfinished work depending on each job.
+        sort_jobs_by_priority(l_jobs, policy): Sorts jobs by the work they unblock.
     """
 
-    def __init__(self, dic_tree: dict, dic_all_jobs: dict):
+    def __init__(
+        self,
+        dic_tree: Optional[dict],
+        dic_all_jobs: dict,
+        dic_status: Optional[dict[str, Optional[str]]] = None,
+    ):
         """
         Initializes the DependencyGraph class.
 
         Args:
-            dic_tree (dict): The dictionary representing the job tree.
+            dic_tree (Optional[dict]): The dictionary representing the job tree. Not needed if
+                dic_status is provided.
             dic_all_jobs (dict): The dictionary containing all jobs and their details.
+            dic_status (Optional[dict[str, Optional[str]]], optional): The status of each job. If
+                provided, it is used instead of the status of the jobs in the tree. Defaults to
+                None.
         """
         self.dic_tree = dic_tree
         self.dic_all_jobs = dic_all_jobs
         self.dependency_graph = {}
 
+        # Integer ids of the jobs
+        self.l_jobs: list[str] = list(dic_all_jobs)
+        self.dic_job_to_id: dict[str, int] = {job: idx for idx, job in enumerate(self.l_jobs)}
+
+        # Folders of the jobs, with their parent folder and their jobs
+        self._build_folder_graph()
+
+        # Status vector, and dependencies state derived from it
+        if dic_status is not None:
+            self.update_jobs_status(dic_status)
+        else:
+            self.update_status(dic_tree)  # type: ignore
+
+    def _build_folder_graph(self) -> None:
+        """
+        Builds the graph of the job folders: folder of each job, closest parent folder (containing
+        jobs) of each folder, jobs of each folder (CSR arrays), and folders sorted by depth.
+        """
+        dic_folder_to_id: dict[tuple, int] = {}
+        self.array_job_folder = np.empty(len(self.l_jobs), dtype=np.int64)
+        for idx, job in enumerate(self.l_jobs):
+            folder = tuple(self.dic_all_jobs[job]["l_keys"][:-1])
+            self.array_job_folder[idx] = dic_folder_to_id.setdefault(folder, len(dic_folder_to_id))
+        n_folders = len(dic_folder_to_id)
+
+        # Closest parent folder containing jobs (-1 if none)
+        self.array_parent_folder = np.full(n_folders, -1, dtype=np.int64)
+        array_depth = np.empty(n_folders, dtype=np.int64)
+        for folder, id_folder in dic_folder_to_id.items():
+            array_depth[id_folder] = len(folder)
+            for i in range(len(folder) - 1, -1, -1):
+                if folder[:i] in dic_folder_to_id:
+                    self.array_parent_folder[id_folder] = dic_folder_to_id[folder[:i]]
+                    break
+
+        # Jobs of each folder: array_folder_jobs[indptr[f]:indptr[f + 1]]
+        self.array_folder_jobs = np.argsort(self.array_job_folder, kind="stable")
+        self.array_folder_indptr = np.zeros(n_folders + 1, dtype=np.int64)
+        self.array_folder_indptr[1:] = np.cumsum(
+            np.bincount(self.array_job_folder, minlength=n_folders)
+        )
+
+        # Folders grouped by depth, such that parents are always processed before their children
+        self.l_array_folders_per_depth = [
+            np.flatnonzero(array_depth == depth) for depth in np.unique(array_depth)
+        ]
+
+    def update_status(self, dic_tree: dict) -> None:
+        """
+        Updates the status vector from the tree, and recomputes the state of the dependencies of
+        all jobs.
+
+        Args:
+            dic_tree (dict): The dictionary representing the job tree.
+        """
+        self.dic_tree = dic_tree
+        self.update_jobs_status(
+            {
+                job: nested_get(dic_tree, self.dic_all_jobs[job]["l_keys"]).get("status")
+                for job in self.l_jobs
+            }
+        )
+
+    def update_jobs_status(self, dic_status: dict[str, Optional[str]]) -> None:
+        """
+        Updates the status vector from the status of the jobs, and recomputes the state of the
+        dependencies of all jobs.
+
+        Args:
+            dic_status (dict[str, Optional[str]]): The status of each job.
+        """
+        dic_status_to_code = {"finished": FINISHED, "failed": FAILED}
+        self.array_status = np.array(
+            [dic_status_to_code.get(dic_status.get(job), UNFINISHED) for job in self.l_jobs],
+            dtype=np.int8,
+        )
+        self._propagate_status()
+
+    def _propagate_status(self) -> None:
+        """
+        Computes the number of unfinished dependencies and the presence of a failed dependency for
+        all jobs, in a single pass over the folders sorted by depth.
+        """
+        n_folders = len(self.array_parent_folder)
+        array_n_unfinished_folder = np.bincount(
+            self.array_job_folder, weights=self.array_status == UNFINISHED, minlength=n_folders
+        ).astype(np.int64)
+        array_has_failed_folder = (
+            np.bincount(
+                self.array_job_folder, weights=self.array_status == FAILED, minlength=n_folders
+            )
+            > 0
+        )
+
+        # Propagate from the parents to the children
+        array_n_unfinished_ancestors = np.zeros(n_folders, dtype=np.int64)
+        array_has_failed_ancestor = np.zeros(n_folders, dtype=bool)
+        for array_folders in self.l_array_folders_per_depth:
+            array_parents = self.array_parent_folder[array_folders]
+            has_parent = array_parents >= 0
+            array_folders = array_folders[has_parent]
+            array_parents = array_parents[has_parent]
+            array_n_unfinished_ancestors[array_folders] = (
+                array_n_unfinished_ancestors[array_parents]
+                + array_n_unfinished_folder[array_parents]
+            )
+            array_has_failed_ancestor[array_folders] = (
+                array_has_failed_ancestor[array_parents] | array_has_failed_folder[array_parents]
+            )
+
+        self.array_n_unfinished_dependencies = array_n_unfinished_ancestors[self.array_job_folder]
+        self.array_has_failed_dependency = array_has_failed_ancestor[self.array_job_folder]
+
+    def _get_dependency_ids(self, job: str) -> np.ndarray:
+        """
+        Gets the ids of all the dependencies of a job (jobs in the parent folders).
+
+        Args:
+            job (str): The name of the job.
+
+        Returns:
+            np.ndarray: The ids of the dependencies.
+        """
+        l_ids = []
+        id_folder = self.array_parent_folder[self.array_job_folder[self.dic_job_to_id[job]]]
+        while id_folder >= 0:
+            l_ids.append(
+                self.array_folder_jobs[
+                    self.array_folder_indptr[id_folder] : self.array_folder_indptr[id_folder + 1]
+                ]
+            )
+            id_folder = self.array_parent_folder[id_folder]
+        return np.concatenate(l_ids) if l_ids else np.empty(0, dtype=np.int64)
+
     def build_full_dependency_graph(self) -> dict:
         """
         Builds the full dependency graph.
@@ -46,21 +222,10 @@ class DependencyGraph:
         Returns:
             dict: The full dependency graph.
         """
-        self.set_l_keys = {
-            tuple(self.dic_all_jobs[job]["l_keys"][:-1]) for job in self.dic_all_jobs
-        }
-        for job in self.dic_all_jobs:
-            l_keys = self.dic_all_jobs[job]["l_keys"]
-            self.dependency_graph[job] = set()
-            # Add all parents to the dependency graph
-            for i in range(len(l_keys) - 1):
-                l_keys_parent = l_keys[:i]
-                if tuple(l_keys_parent) in self.set_l_keys:
-                    parent = nested_get(self.dic_tree, l_keys_parent)
-                    # Look for all the jobs in the parent (but not the generations below)
-                    for name_parent, sub_dict in parent.items():
-                        if "file" in sub_dict:
-                            self.dependency_graph[job].add(sub_dict["file"])
+        for job in self.l_jobs:
+            self.dependency_graph[job] = {
+                self.l_jobs[id_dep] for id_dep in self._get_dependency_ids(job)
+            }
         return self.dependency_graph
 
     def get_unfinished_dependency(self, job: str) -> list:
@@ -73,20 +238,13 @@ class DependencyGraph:
         Returns:
             list: The list of unfinished dependencies.
         """
-        # Ensure the dependency graph is built
-        if self.dependency_graph == {}:
-            self.build_full_dependency_graph()
-
-        # Get the list of dependencies
-        l_dependencies = self.dependency_graph[job]
-
-        # Get the corresponding list of l_keys
-        ll_keys = [self.dic_all_jobs[dep]["l_keys"] for dep in l_dependencies]
+        if self.array_n_unfinished_dependencies[self.dic_job_to_id[job]] == 0:
+            return []
 
         return [
-            dep
-            for dep, l_keys in zip(l_dependencies, ll_keys)
-            if nested_get(self.dic_tree, l_keys + ["status"]) not in ["finished", "failed"]
+            self.l_jobs[id_dep]
+            for id_dep in self._get_dependency_ids(job)
+            if self.array_status[id_dep] == UNFINISHED
         ]
 
     def get_failed_dependency(self, job: str) -> list:
@@ -99,18 +257,85 @@ class DependencyGraph:
         Returns:
             list: The list of failed dependencies.
         """
-        # Ensure the dependency graph is built
-        if self.dependency_graph == {}:
-            self.build_full_dependency_graph()
-
-        # Get the list of dependencies
-        l_dependencies = self.dependency_graph[job]
-
-        # Get the corresponding list of l_keys
-        ll_keys = [self.dic_all_jobs[dep]["l_keys"] for dep in l_dependencies]
+        if not self.array_has_failed_dependency[self.dic_job_to_id[job]]:
+            return []
 
         return [
-            dep
-            for dep, l_keys in zip(l_dependencies, ll_keys)
-            if nested_get(self.dic_tree, l_keys + ["status"]) == "failed"
+            self.l_jobs[id_dep]
+            for id_dep in self._get_dependency_ids(job)
+            if self.array_status[id_dep] == FAILED
         ]
+
+    def get_downstream_work(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the unfinished work depending on each job, in a single pass over the folders sorted by
+        decreasing depth: the length of the longest chain of unfinished jobs depending on the job
+        (critical path, in number of generations), and the number of unfinished jobs depending on
+        it (descendants).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The length of the critical path and the number of
+                unfinished descendants of each job.
+        """
+        n_folders = len(self.array_parent_folder)
+        array_n_unfinished_folder = np.bincount(
+            self.array_job_folder, weights=self.array_status == UNFINISHED, minlength=n_folders
+        ).astype(np.int64)
+
+        # Propagate from the children to the parents
+        array_critical_path = np.zeros(n_folders, dtype=np.int64)
+        array_n_descendants = np.zeros(n_folders, dtype=np.int64)
+        for array_folders in reversed(self.l_array_folders_per_depth):
+            array_parents = self.array_parent_folder[array_folders]
+            has_parent = array_parents >= 0
+            array_folders = array_folders[has_parent]
+            array_parents = array_parents[has_parent]
+            np.maximum.at(
+                array_critical_path,
+                array_parents,
+                array_critical_path[array_folders] + (array_n_unfinished_folder[array_folders] > 0),
+            )
+            np.add.at(
+                array_n_descendants,
+                array_parents,
+                array_n_descendants[array_folders] + array_n_unfinished_folder[array_folders],
+            )
+
+        return (
+            array_critical_path[self.array_job_folder],
+            array_n_descendants[self.array_job_folder],
+        )
+
+    def sort_jobs_by_priority(self, l_jobs: list[str], policy: str = "tree") -> list[str]:
+        """
+        Sorts jobs by the unfinished work they unblock, such that the branches with the most
+        downstream work are submitted first. Ties keep the order of the tree.
+
+        Args:
+            l_jobs (list[str]): The jobs to sort.
+            policy (str, optional): The scheduling policy. "tree" keeps the order of the tree,
+                "critical_path" sorts by decreasing length of the longest chain of unfinished jobs
+                depending on each job (then by number of descendants), and "descendants" by
+                decreasing number of unfinished jobs depending on each job (then by critical
+                path). Defaults to "tree".
+
+        Returns:
+            list[str]: The sorted jobs.
+        """
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError(
+                f"Scheduling policy {policy} is not recognized. Please use one of "
+                f"{', '.join(SCHEDULING_POLICIES)}."
+            )
+        if policy == "tree" or not l_jobs:
+            return list(l_jobs)
+
+        array_critical_path, array_n_descendants = self.get_downstream_work()
+        array_ids = np.array([self.dic_job_to_id[job] for job in l_jobs], dtype=np.int64)
+
+        # The last key of lexsort is the primary one, and lexsort is stable
+        if policy == "critical_path":
+            keys = (-array_n_descendants[array_ids], -array_critical_path[array_ids])
+        else:
+            keys = (-array_critical_path[array_ids], -array_n_descendants[array_ids])
+        return [l_jobs[idx] for idx in np.lexsort(keys)]
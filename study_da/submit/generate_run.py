@@ -18,6 +18,9 @@ Functions:
         generation_number: int, tree_path: str, l_keys: list[str], additionnal_command: str = "",
         l_dependencies: list[str] | None = None, name_config: str = "config.yaml") -> str:
 
+    generate_pack_run_file(l_abs_job_folders: list[str], n_cores: int = 1,
+        slurm_docker_fix: bool = False) -> str:
+
 """
 
 # ==================================================================================================
@@ -255,3 +258,53 @@ def _generate_run_file_htc(
         f"# Optional user defined command to run\n"
         f"{additionnal_command}\n"
     )
+
+
+def generate_pack_run_file(
+    l_abs_job_folders: list[str], n_cores: int = 1, slurm_docker_fix: bool = False
+) -> str:
+    """
+    Generates the run file of a pack, i.e. a driver running the run files of several jobs in a
+    single scheduler job, sequentially or over several cores. Each job is run from its own
+    temporary directory (as HTC run files work in the current directory), with its output written
+    in its folder, and is tagged as failed if its run file exited without tagging it.
+
+    Args:
+        l_abs_job_folders (list[str]): The (absolute) folders of the jobs of the pack.
+        n_cores (int, optional): The number of jobs run at the same time. Defaults to 1.
+        slurm_docker_fix (bool, optional): Whether to fix the Docker issue with recovery path on
+            Slurm. Defaults to False.
+
+    Returns:
+        str: The generated run file content.
+    """
+    # ! Ugly fix, will need to be removed when INFN is fixed
+    if slurm_docker_fix:
+        to_replace = "/storage-hpc/gpfs_data/HPC/home_recovery"
+        replacement = "/home/HPC"
+        l_abs_job_folders = [
+            abs_job_folder.replace(to_replace, replacement) for abs_job_folder in l_abs_job_folders
+        ]
+
+    str_job_folders = "\n".join(f'"{abs_job_folder}"' for abs_job_folder in l_abs_job_folders)
+    return (
+        "#!/bin/bash\n"
+        "# Run the jobs of the pack, each one being tagged individually\n"
+        "run_job() {\n"
+        "    dir_run=$(mktemp -d)\n"
+        "    (cd $dir_run && bash $1/run.sh > $1/output.txt 2> $1/error.txt)\n"
+        "    rm -rf $dir_run\n"
+        "    if [ ! -f $1/.finished ] && [ ! -f $1/.failed ]; then\n"
+        "        touch $1/.failed\n"
+        "    fi\n"
+        "}\n\n"
+        f"l_path_job=(\n{str_job_folders}\n)\n\n"
+        f"# Run at most {n_cores} job(s) at the same time\n"
+        'for path_job in "${l_path_job[@]}"; do\n'
+        f"    while [ $(jobs -rp | wc -l) -ge {n_cores} ]; do\n"
+        "        sleep 1\n"
+        "    done\n"
+        "    run_job $path_job &\n"
+        "done\n"
+        "wait\n"
+    )
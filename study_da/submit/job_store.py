@@ -0,0 +1,342 @@
+"""This module contains the JobStore class, an SQLite backend for the state of the jobs of a study.
+
+The tree file (tree.yaml) must be fully parsed and rewritten every time the state of a single job
+is read or updated. For large studies, the JobStore keeps the same information in an SQLite
+database, with one row per job indexed by path, generation and status, such that jobs can be
+listed, read and updated without going through the whole tree. The tree can be imported from and
+exported back to the tree file at any time.
+
+Note that SQLite relies on file locks, which are not reliable on some network filesystems (e.g.
+AFS). Accesses are therefore still protected by the lock of the SubmitScan class.
+"""
+
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+# Standard library imports
+import json
+import sqlite3
+from contextlib import closing
+from typing import Any, Optional
+
+# Local imports
+from study_da.utils.dic_utils import get_dic_records, nested_get
+
+
+# ==================================================================================================
+# --- Class
+# ==================================================================================================
+class JobStore:
+    """
+    A class to store the tree of a study, and the state of its jobs, in an SQLite database.
+
+    Attributes:
+        path_store (str): The path to the SQLite database.
+
+    Methods:
+        __init__(path_store): Initializes the JobStore class, creating the tables if needed.
+        get_info(key): Gets an internal information of the store.
+        set_info(key, value): Sets an internal information of the store.
+        import_tree(dic_tree, dic_all_jobs): Replaces the content of the store with a tree.
+        load_tree(l_status_excluded): Rebuilds the tree from the store.
+        write_tree(dic_tree, dic_all_jobs): Updates the store with the jobs that changed in a tree.
+        write_jobs(dic_tree, dic_jobs): Updates the store with some jobs of a (partial) tree.
+        get_all_jobs(): Gets all jobs, with their generation and keys in the tree.
+        get_jobs_status(l_status_excluded): Gets the status of the jobs.
+        update_jobs_status(dic_status): Updates the status of several jobs at once.
+        set_tree_values(dic_values): Sets values at the root of the tree.
+    """
+
+    def __init__(self, path_store: str):
+        """
+        Initializes the JobStore class, creating the tables if needed.
+
+        Args:
+            path_store (str): The path to the SQLite database.
+        """
+        self.path_store: str = path_store
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (path TEXT PRIMARY KEY, position INTEGER, "
+                "l_keys TEXT, gen INTEGER, status TEXT, data TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_gen ON jobs (gen)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS nodes (position INTEGER PRIMARY KEY, l_keys TEXT, "
+                "data TEXT)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a connection to the database. Connections are not kept open between operations, as
+        several processes (possibly on different machines) can access the same study.
+
+        Returns:
+            sqlite3.Connection: The connection to the database.
+        """
+        return sqlite3.connect(self.path_store, timeout=60)
+
+    def get_info(self, key: str) -> Any:
+        """
+        Gets an internal information of the store (e.g. the modification time of the tree file
+        when it was last synchronized).
+
+        Args:
+            key (str): The name of the information.
+
+        Returns:
+            Any: The value of the information, None if not set.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM info WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set_info(self, key: str, value: Any) -> None:
+        """
+        Sets an internal information of the store.
+
+        Args:
+            key (str): The name of the information.
+            value (Any): The value of the information (must be JSON serializable).
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+
+    @staticmethod
+    def _get_rows(
+        dic_tree: dict, dic_all_jobs: dict[str, dict[str, Any]]
+    ) -> tuple[list[tuple], list[tuple]]:
+        """
+        Converts a tree into the rows of the jobs and nodes tables.
+
+        Args:
+            dic_tree (dict): The dictionary representing the job tree.
+            dic_all_jobs (dict[str, dict[str, Any]]): The dictionary containing all jobs and their
+                details (generation and keys in the tree).
+
+        Returns:
+            tuple[list[tuple], list[tuple]]: The rows of the jobs table and of the nodes table.
+        """
+        dic_l_keys_to_job = {tuple(dic_job["l_keys"]): job for job, dic_job in dic_all_jobs.items()}
+        l_rows_jobs = []
+        l_rows_nodes = []
+        for position, record in enumerate(get_dic_records(dic_tree)):
+            l_keys = record["l_keys"]
+            dic_values = record["values"]
+            job = dic_l_keys_to_job.get(tuple(l_keys))
+            if job is None:
+                l_rows_nodes.append((position, json.dumps(l_keys), json.dumps(dic_values)))
+            else:
+                l_rows_jobs.append(
+                    (
+                        job,
+                        position,
+                        json.dumps(l_keys),
+                        dic_all_jobs[job]["gen"],
+                        dic_values.get("status"),
+                        json.dumps(dic_values),
+                    )
+                )
+        return l_rows_jobs, l_rows_nodes
+
+    def import_tree(self, dic_tree: dict, dic_all_jobs: dict[str, dict[str, Any]]) -> None:
+        """
+        Replaces the content of the store with a tree.
+
+        Args:
+            dic_tree (dict): The dictionary representing the job tree.
+            dic_all_jobs (dict[str, dict[str, Any]]): The dictionary containing all jobs and their
+                details (generation and keys in the tree).
+        """
+        l_rows_jobs, l_rows_nodes = self._get_rows(dic_tree, dic_all_jobs)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM jobs")
+            conn.execute("DELETE FROM nodes")
+            conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)", l_rows_jobs)
+            conn.executemany("INSERT INTO nodes VALUES (?, ?, ?)", l_rows_nodes)
+
+    def load_tree(self, l_status_excluded: Optional[list[str]] = None) -> dict:
+        """
+        Rebuilds the tree from the store.
+
+        Args:
+            l_status_excluded (Optional[list[str]], optional): The jobs with these statuses are
+                left out of the tree, which is then much faster to rebuild when most jobs are over.
+                Defaults to None.
+
+        Returns:
+            dict: The dictionary representing the job tree.
+        """
+        if l_status_excluded is None:
+            l_status_excluded = []
+        placeholders = ", ".join("?" * len(l_status_excluded))
+        with closing(self._connect()) as conn:
+            l_rows_nodes = conn.execute("SELECT position, l_keys, data FROM nodes").fetchall()
+            l_rows_jobs = conn.execute(
+                "SELECT position, l_keys, data, status FROM jobs WHERE status IS NULL OR status "
+                f"NOT IN ({placeholders})",
+                l_status_excluded,
+            )
+            l_rows = [(position, l_keys, data, False) for position, l_keys, data in l_rows_nodes]
+            l_rows.extend(
+                (position, l_keys, (data, status), True)
+                for position, l_keys, data, status in l_rows_jobs
+            )
+
+        # Rebuild the tree in its original order
+        dic_tree = {}
+        for _, l_keys, data, is_job in sorted(l_rows, key=lambda row: row[0]):
+            if is_job:
+                data, status = data
+                dic_values = json.loads(data)
+                # The status column is the reference, as it can be updated on its own
+                if status is not None or "status" in dic_values:
+                    dic_values["status"] = status
+            else:
+                dic_values = json.loads(data)
+
+            l_keys = json.loads(l_keys)
+            if l_keys:
+                node = dic_tree
+                for key in l_keys:
+                    node = node.setdefault(key, {})
+                node.update(dic_values)
+            else:
+                dic_tree.update(dic_values)
+
+        return dic_tree
+
+    def write_tree(self, dic_tree: dict, dic_all_jobs: dict[str, dict[str, Any]]) -> None:
+        """
+        Updates the store with a tree. Only the jobs that changed are rewritten. If the jobs of
+        the tree are not the same as the ones in the store, the whole tree is imported again.
+
+        Args:
+            dic_tree (dict): The dictionary representing the job tree.
+            dic_all_jobs (dict[str, dict[str, Any]]): The dictionary containing all jobs and their
+                details (generation and keys in the tree).
+        """
+        l_rows_jobs, l_rows_nodes = self._get_rows(dic_tree, dic_all_jobs)
+        with closing(self._connect()) as conn:
+            dic_stored = {
+                path: (position, status, data)
+                for path, position, status, data in conn.execute(
+                    "SELECT path, position, status, data FROM jobs"
+                )
+            }
+
+        # The structure of the tree changed
+        if set(dic_stored) != set(dic_all_jobs):
+            self.import_tree(dic_tree, dic_all_jobs)
+            return
+
+        # The position of the jobs changes if nodes are added or removed (e.g. re-configuration)
+        l_rows_changed = [
+            (position, status, data, path)
+            for path, position, _, _, status, data in l_rows_jobs
+            if dic_stored[path] != (position, status, data)
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE jobs SET position = ?, status = ?, data = ? WHERE path = ?", l_rows_changed
+            )
+            conn.execute("DELETE FROM nodes")
+            conn.executemany("INSERT INTO nodes VALUES (?, ?, ?)", l_rows_nodes)
+
+    def write_jobs(self, dic_tree: dict, dic_jobs: dict[str, dict[str, Any]]) -> None:
+        """
+        Updates the store with some jobs of a tree, e.g. a tree loaded with only the jobs that are
+        not over. The other jobs and the nodes of the tree are left untouched.
+
+        Args:
+            dic_tree (dict): The dictionary representing the (possibly partial) job tree.
+            dic_jobs (dict[str, dict[str, Any]]): The dictionary containing the jobs to update and
+                their details (generation and keys in the tree).
+        """
+        l_rows_jobs = []
+        for job, dic_job in dic_jobs.items():
+            dic_values = {
+                key: value
+                for key, value in nested_get(dic_tree, dic_job["l_keys"]).items()
+                if not isinstance(value, dict)
+            }
+            l_rows_jobs.append((dic_values.get("status"), json.dumps(dic_values), job))
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("UPDATE jobs SET status = ?, data = ? WHERE path = ?", l_rows_jobs)
+
+    def get_all_jobs(self) -> dict[str, dict[str, Any]]:
+        """
+        Gets all jobs, with their generation and keys in the tree (same output as
+        ConfigJobs.find_all_jobs).
+
+        Returns:
+            dict[str, dict[str, Any]]: The dictionary containing all jobs and their details.
+        """
+        with closing(self._connect()) as conn:
+            return {
+                path: {"gen": gen, "l_keys": json.loads(l_keys)}
+                for path, gen, l_keys in conn.execute(
+                    "SELECT path, gen, l_keys FROM jobs ORDER BY position"
+                )
+            }
+
+    def get_jobs_status(self, l_status_excluded: Optional[list[str]] = None) -> dict[str, str]:
+        """
+        Gets the status of the jobs.
+
+        Args:
+            l_status_excluded (Optional[list[str]], optional): The jobs with these statuses are
+                not returned. Defaults to None.
+
+        Returns:
+            dict[str, str]: A dictionary mapping the jobs to their status.
+        """
+        if l_status_excluded is None:
+            l_status_excluded = []
+        placeholders = ", ".join("?" * len(l_status_excluded))
+        with closing(self._connect()) as conn:
+            return dict(
+                conn.execute(
+                    "SELECT path, status FROM jobs WHERE status IS NULL OR status NOT IN "
+                    f"({placeholders}) ORDER BY position",
+                    l_status_excluded,
+                )
+            )
+
+    def update_jobs_status(self, dic_status: dict[str, str]) -> None:
+        """
+        Updates the status of several jobs at once.
+
+        Args:
+            dic_status (dict[str, str]): A dictionary mapping the jobs to their new status.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE jobs SET status = ? WHERE path = ?",
+                [(status, job) for job, status in dic_status.items()],
+            )
+
+    def set_tree_values(self, dic_values: dict[str, Any]) -> None:
+        """
+        Sets values at the root of the tree (e.g. the global status of the study).
+
+        Args:
+            dic_values (dict[str, Any]): The values to set.
+        """
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT position, data FROM nodes WHERE l_keys = '[]'").fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO nodes VALUES (?, ?, ?)", (-1, "[]", json.dumps(dic_values))
+                )
+            else:
+                position, data = row
+                conn.execute(
+                    "UPDATE nodes SET data = ? WHERE position = ?",
+                    (json.dumps(json.loads(data) | dic_values), position),
+                )
@@ -0,0 +1,179 @@
+"""This module contains the JobWatcher class, used to wait for the end of the jobs of a study.
+
+On Linux, the creation of the tags (.finished or .failed) in the job folders is watched with
+inotify, such that the watcher wakes up as soon as a job is over. Note that inotify only sees the
+changes made from the current machine: on network filesystems (e.g. AFS), where the tags are
+written by the worker nodes, or when inotify is not available, the watcher simply sleeps, and the
+job folders must be polled.
+"""
+
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+# Standard library imports
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import time
+from typing import Optional
+
+# Local imports
+from .status_scanner import DIC_TAG_TO_STATUS
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# inotify events signaling the creation of a tag
+IN_ATTRIB = 0x00000004
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+MASK_TAG_EVENTS = IN_ATTRIB | IN_MOVED_TO | IN_CREATE
+
+# Header of an inotify event (wd, mask, cookie, len), followed by the name of the file
+EVENT_HEADER = struct.Struct("iIII")
+
+
+# ==================================================================================================
+# --- Class
+# ==================================================================================================
+class JobWatcher:
+    """
+    A class to wait for the tags written in the job folders at the end of each job.
+
+    Attributes:
+        abs_path (str): The absolute path to the folder containing the study.
+        use_inotify (bool): Whether the job folders are watched with inotify.
+
+    Methods:
+        __init__(abs_path, use_inotify=True): Initializes the JobWatcher class.
+        watch(l_jobs): Sets the jobs whose folders are watched.
+        wait(timeout): Waits until a job is over, or until the timeout.
+        close(): Stops watching the job folders.
+    """
+
+    def __init__(self, abs_path: str, use_inotify: bool = True):
+        """
+        Initializes the JobWatcher class.
+
+        Args:
+            abs_path (str): The absolute path to the folder containing the study.
+            use_inotify (bool, optional): Whether to watch the job folders with inotify, if
+                available. Defaults to True.
+        """
+        self.abs_path: str = abs_path
+        self._fd: Optional[int] = None
+        self._libc: Optional[ctypes.CDLL] = None
+        self._dic_job_to_wd: dict[str, int] = {}
+        self._dic_wd_to_job: dict[int, str] = {}
+        if use_inotify:
+            self._init_inotify()
+
+    @property
+    def use_inotify(self) -> bool:
+        """
+        Whether the job folders are watched with inotify.
+
+        Returns:
+            bool: True if inotify is used, False if the job folders must be polled.
+        """
+        return self._fd is not None
+
+    def _init_inotify(self) -> None:
+        """
+        Initializes inotify through the C library, if available.
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            logging.info("inotify is not available, the job folders will be polled.")
+            return
+        if fd < 0:
+            logging.info("inotify could not be initialized, the job folders will be polled.")
+            return
+        self._libc = libc
+        self._fd = fd
+
+    def watch(self, l_jobs: list[str]) -> None:
+        """
+        Sets the jobs whose folders are watched: the folders of new jobs are added, and the ones of
+        the jobs not in the list anymore are removed.
+
+        Args:
+            l_jobs (list[str]): The jobs to watch.
+        """
+        if self._fd is None or self._libc is None:
+            return
+
+        set_jobs = set(l_jobs)
+        for job in set(self._dic_job_to_wd) - set_jobs:
+            wd = self._dic_job_to_wd.pop(job)
+            # A folder (and its watch) can be shared by several jobs
+            if wd not in self._dic_job_to_wd.values():
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dic_wd_to_job[wd]
+
+        for job in set_jobs - set(self._dic_job_to_wd):
+            absolute_job_folder = f"{self.abs_path}/{os.path.dirname(job)}"
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(absolute_job_folder), MASK_TAG_EVENTS
+            )
+            if wd < 0:
+                if ctypes.get_errno() == errno.ENOSPC:
+                    logging.warning(
+                        "Maximum number of inotify watches reached, the remaining job folders "
+                        "will only be polled."
+                    )
+                    return
+                continue
+            self._dic_job_to_wd[job] = wd
+            self._dic_wd_to_job[wd] = job
+
+    def wait(self, timeout: float) -> set[str]:
+        """
+        Waits until a tag is created in a watched job folder, or until the timeout.
+
+        Args:
+            timeout (float): The maximum waiting time, in seconds.
+
+        Returns:
+            set[str]: The jobs whose folders received a tag (always empty without inotify).
+        """
+        if self._fd is None:
+            time.sleep(timeout)
+            return set()
+
+        l_ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not l_ready:
+            return set()
+
+        # Read all the pending events
+        set_jobs = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset : offset + length].rstrip(b"\0").decode()
+                offset += length
+                if name in DIC_TAG_TO_STATUS and wd in self._dic_wd_to_job:
+                    set_jobs.add(self._dic_wd_to_job[wd])
+        return set_jobs
+
+    def close(self) -> None:
+        """
+        Stops watching the job folders.
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._dic_job_to_wd = {}
+        self._dic_wd_to_job = {}
@@ -0,0 +1,187 @@
+"""This module contains the StatusScanner class, used to check the state of the jobs of a study
+from the tags (.finished or .failed) written in the job folders at the end of each job."""
+
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+# Standard library imports
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Tags written at the end of a job, by order of priority
+DIC_TAG_TO_STATUS = {".finished": "finished", ".failed": "failed"}
+
+# Margin on the modification time of a folder, for filesystems with a coarse time resolution
+MTIME_MARGIN_NS = 2 * 10**9
+
+
+# ==================================================================================================
+# --- Class
+# ==================================================================================================
+class StatusScanner:
+    """
+    A class to scan the job folders of a study for the tags written at the end of each job.
+
+    Each generation folder is listed once per scan, giving the modification time of the folders
+    of the jobs still polled: a job folder is only listed (instead of checking the existence of
+    each tag separately) if it was modified since it was last seen without tag, as writing a tag
+    modifies it. The generation folders can be scanned in parallel with a pool of threads (useful
+    on network filesystems, where each request has a high latency), and the folders of the jobs
+    that are over are remembered to never be scanned again.
+
+    Attributes:
+        abs_path (str): The absolute path to the folder containing the study.
+        n_threads (int): The number of threads used to scan the generation folders.
+        dic_terminal_status (dict[str, str]): The status of the jobs known to be over.
+        dic_mtime_not_over (dict[str, int]): The modification time (in ns) of the job folders
+            last seen without tag, indexed by job.
+
+    Methods:
+        __init__(abs_path, n_threads=1): Initializes the StatusScanner class.
+        scan(l_jobs): Gets the status of the jobs from the tags in their folders.
+        forget(job): Forgets the status of a job (e.g. when it is resubmitted).
+    """
+
+    def __init__(self, abs_path: str, n_threads: int = 1):
+        """
+        Initializes the StatusScanner class.
+
+        Args:
+            abs_path (str): The absolute path to the folder containing the study.
+            n_threads (int, optional): The number of threads used to scan the generation folders.
+                Defaults to 1 (no parallelization).
+        """
+        self.abs_path: str = abs_path
+        self.n_threads: int = n_threads
+        self.dic_terminal_status: dict[str, str] = {}
+        self.dic_mtime_not_over: dict[str, int] = {}
+
+    @staticmethod
+    def _scan_job_folder(absolute_job_folder: str) -> Optional[str]:
+        """
+        Lists a job folder once to get the status of the job from its tags.
+
+        Args:
+            absolute_job_folder (str): The absolute path to the job folder.
+
+        Returns:
+            Optional[str]: "finished" or "failed" if the corresponding tag exists, None otherwise.
+        """
+        try:
+            with os.scandir(absolute_job_folder) as it:
+                set_tags = {entry.name for entry in it if entry.name in DIC_TAG_TO_STATUS}
+        except FileNotFoundError:
+            logging.warning(f"Job folder {absolute_job_folder} does not exist.")
+            return None
+
+        return next((status for tag, status in DIC_TAG_TO_STATUS.items() if tag in set_tags), None)
+
+    def _scan_generation_folder(self, folder: str, l_jobs: list[str]) -> dict[str, Optional[str]]:
+        """
+        Lists a generation folder once, and scans the folders of its jobs that were modified since
+        they were last seen without tag.
+
+        Args:
+            folder (str): The generation folder, relative to the study path.
+            l_jobs (list[str]): The jobs of the generation folder.
+
+        Returns:
+            dict[str, Optional[str]]: The status of each job, None if the job is not over.
+        """
+        # Only get the modification time of the folders of the jobs being polled
+        set_names = {os.path.basename(os.path.dirname(job)) for job in l_jobs}
+        time_scan = time.time_ns()
+        try:
+            with os.scandir(f"{self.abs_path}/{folder}") as it:
+                dic_mtime = {
+                    entry.name: entry.stat().st_mtime_ns
+                    for entry in it
+                    if entry.name in set_names and entry.is_dir()
+                }
+        except FileNotFoundError:
+            dic_mtime = {}
+
+        dic_status: dict[str, Optional[str]] = {}
+        for job in l_jobs:
+            absolute_job_folder = f"{self.abs_path}/{os.path.dirname(job)}"
+            mtime = dic_mtime.get(os.path.basename(absolute_job_folder))
+            if mtime is None:
+                logging.warning(f"Job folder {absolute_job_folder} does not exist.")
+                dic_status[job] = None
+                continue
+
+            # No tag can have been written if the folder was not modified
+            if self.dic_mtime_not_over.get(job) == mtime:
+                dic_status[job] = None
+                continue
+
+            dic_status[job] = self._scan_job_folder(absolute_job_folder)
+
+            # Only trust the modification time if it is clearly older than the scan
+            if dic_status[job] is None and mtime < time_scan - MTIME_MARGIN_NS:
+                self.dic_mtime_not_over[job] = mtime
+
+        return dic_status
+
+    def scan(self, l_jobs: list[str]) -> dict[str, Optional[str]]:
+        """
+        Gets the status of the jobs from the tags in their folders. The jobs already known to be
+        over are not scanned again.
+
+        Args:
+            l_jobs (list[str]): The jobs to scan.
+
+        Returns:
+            dict[str, Optional[str]]: The status of each job ("finished" or "failed"), None if the
+                job is not over.
+        """
+        dic_status = {job: self.dic_terminal_status.get(job) for job in l_jobs}
+
+        # Group the jobs to scan by generation folder
+        dic_jobs_per_folder: dict[str, list[str]] = {}
+        for job, status in dic_status.items():
+            if status is None:
+                folder = os.path.dirname(os.path.dirname(job))
+                dic_jobs_per_folder.setdefault(folder, []).append(job)
+
+        # Scan the generation folders
+        if self.n_threads > 1 and len(dic_jobs_per_folder) > 1:
+            with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+                l_dic_status_folder = list(
+                    executor.map(
+                        self._scan_generation_folder,
+                        dic_jobs_per_folder.keys(),
+                        dic_jobs_per_folder.values(),
+                    )
+                )
+        else:
+            l_dic_status_folder = [
+                self._scan_generation_folder(folder, l_jobs_folder)
+                for folder, l_jobs_folder in dic_jobs_per_folder.items()
+            ]
+
+        # Remember the jobs that are over
+        for dic_status_folder in l_dic_status_folder:
+            for job, status in dic_status_folder.items():
+                if status is not None:
+                    self.dic_terminal_status[job] = status
+                    self.dic_mtime_not_over.pop(job, None)
+                    dic_status[job] = status
+
+        return dic_status
+
+    def forget(self, job: str) -> None:
+        """
+        Forgets the status of a job, which will be scanned again (e.g. when it is resubmitted).
+
+        Args:
+            job (str): The job to forget.
+        """
+        self.dic_terminal_status.pop(job, None)
+        self.dic_mtime_not_over.pop(job, None)
@@ -20,8 +20,24 @@ from study_da.utils import load_dic_from_path, write_dic_to_path
 from ..utils import nested_get, nested_set
 from .cluster_submission import ClusterSubmission
 from .config_jobs import ConfigJobs
-from .dependency_graph import DependencyGraph
+from .dependency_graph import SCHEDULING_POLICIES, DependencyGraph
 from .generate_run import generate_run_file
+from .job_store import JobStore
+from .job_watcher import JobWatcher
+from .status_scanner import StatusScanner
+
+# ==================================================================================================
+# --- Constants
+# ==================================================================================================
+# Initial interval between two scans of the job folders when waiting for the jobs, in seconds
+MIN_POLL_INTERVAL = 5.0
+
+# Maximum interval between two scans of the job folders when waiting for the jobs, in seconds,
+# such that the jobs written from other machines (not seen by inotify) are found quickly
+MAX_POLL_INTERVAL = 30.0
+
+# Status of the jobs that are over, which are not checked again
+STATUS_OVER = ["finished", "failed", "unsubmittable"]
 
 
 # ==================================================================================================
@@ -34,6 +50,13 @@ class SubmitScan:
         path_python_environment: str = "",
         path_python_environment_container: str = "",
         path_container_image: Optional[str] = None,
+        job_store: str = "tree",
+        n_threads_status_scan: int = 1,
+        array_jobs: bool = False,
+        n_workers_local: Optional[int] = None,
+        memory_limit_local: Optional[float] = None,
+        scheduling_policy: str = "tree",
+        max_jobs_in_flight: Optional[int] = None,
     ) -> None:
         """
         Initializes the SubmitScan class.
@@ -45,6 +68,28 @@ class SubmitScan:
                 in the container. Defaults to "".
             path_container_image (Optional[str], optional): The path to the container image.
                 Defaults to None.
+            job_store (str, optional): Where the state of the jobs is kept during the submission.
+                "tree" reads and writes the tree file every time, while "sqlite" keeps the state in
+                an indexed SQLite database next to the tree file, synchronized with the tree file
+                on import and exported back when the study is finished (or with export_tree).
+                Defaults to "tree".
+            n_threads_status_scan (int, optional): The number of threads used to scan the job
+                folders for the tags of the jobs that are over. Useful on network filesystems.
+                Defaults to 1.
+            array_jobs (bool, optional): Whether to submit the cluster jobs as array jobs, i.e.
+                with a single scheduler call per generation and submission type. Defaults to False.
+            n_workers_local (Optional[int], optional): The maximum number of local jobs running at
+                the same time. Defaults to None, corresponding to the number of available cores.
+            memory_limit_local (Optional[float], optional): The maximum memory (in GB) used by the
+                running local jobs for a new local job to be started. Defaults to None (no limit).
+            scheduling_policy (str, optional): The order in which the jobs ready to be submitted
+                are submitted. "tree" keeps the order of the tree, "critical_path" submits first
+                the jobs with the longest chain of unfinished jobs depending on them, and
+                "descendants" the jobs with the most unfinished jobs depending on them. Defaults
+                to "tree".
+            max_jobs_in_flight (Optional[int], optional): The maximum number of jobs of the study
+                running or queuing at the same time. The jobs that don't fit are submitted later,
+                by order of priority. Defaults to None (no limit).
         """
         # Path to study files
         self.path_tree = path_tree
@@ -130,6 +175,47 @@ class SubmitScan:
         # Lock file to avoid concurrent access (softlock as several platforms are used)
         self.lock = SoftFileLock(f"{self.path_tree}.lock", timeout=60)
 
+        # Dependency graph, kept between two status checks as long as the jobs don't change
+        self.dependency_graph: Optional[DependencyGraph] = None
+
+        # Scanner of the job folders for the tags of the jobs that are over
+        self.status_scanner = StatusScanner(self.abs_path, n_threads=n_threads_status_scan)
+
+        # Submission of the cluster jobs as array jobs
+        self.array_jobs = array_jobs
+
+        # Resources of the executor running the local jobs
+        self.n_workers_local = n_workers_local
+        self.memory_limit_local = memory_limit_local
+
+        # Order of submission of the jobs, and quota of jobs running or queuing
+        if scheduling_policy not in SCHEDULING_POLICIES:
+            raise ValueError(
+                f"Scheduling policy {scheduling_policy} is not recognized. Please use one of "
+                f"{', '.join(SCHEDULING_POLICIES)}."
+            )
+        self.scheduling_policy = scheduling_policy
+        self.max_jobs_in_flight = max_jobs_in_flight
+
+        # Jobs that are not over yet (as of the last status check), kept in memory to wait for
+        # them without reloading the tree
+        self.l_jobs_to_finish: list[str] = []
+
+        # Status of the jobs (as of the last status check), such that only the jobs that are not
+        # over are read again from the job store
+        self.dic_status_jobs: dict[str, Optional[str]] = {}
+
+        # Indexed store for the state of the jobs, if requested
+        if job_store not in ["tree", "sqlite"]:
+            raise ValueError(
+                f"Job store {job_store} is not recognized. Please use 'tree' or 'sqlite'."
+            )
+        self.job_store: Optional[JobStore] = None
+        if job_store == "sqlite":
+            self.job_store = JobStore(f"{os.path.splitext(self.path_tree)[0]}.sqlite")
+            with self.lock:
+                self.sync_job_store()
+
     # dic_tree as a property so that it is reloaded every time it is accessed
     @property
     def dic_tree(self) -> dict:
@@ -139,6 +225,9 @@ class SubmitScan:
         Returns:
             dict: The loaded dictionary tree.
         """
+        if self.job_store is not None:
+            logging.info(f"Loading tree from {self.job_store.path_store}")
+            return self.job_store.load_tree()
         logging.info(f"Loading tree from {self.path_tree}")
         return load_dic_from_path(self.path_tree)[0]
 
@@ -151,9 +240,115 @@ class SubmitScan:
         Args:
             value (dict): The dictionary tree to write.
         """
+        if self.job_store is not None:
+            logging.info(f"Writing tree to {self.job_store.path_store}")
+            self.job_store.write_tree(value, self.find_all_jobs_in_tree(value))
+            return
         logging.info(f"Writing tree to {self.path_tree}")
         write_dic_to_path(value, self.path_tree)
 
+    def find_all_jobs_in_tree(self, dic_tree: dict) -> dict:
+        """
+        Finds all jobs in a tree.
+
+        Args:
+            dic_tree (dict): The dictionary tree structure.
+
+        Returns:
+            dict: A dictionary containing all jobs, with their generation and keys in the tree.
+        """
+        return ConfigJobs(
+            dic_tree, starting_depth=-len(Path(self.path_tree).parts) + 2
+        ).find_all_jobs()
+
+    def sync_job_store(self) -> None:
+        """
+        Imports the tree file into the job store if the tree file has been modified since the
+        last synchronization (e.g. the study has been updated), or if the store is new. Must be
+        called with the lock acquired.
+        """
+        if self.job_store is None:
+            return
+        mtime_tree = os.path.getmtime(self.path_tree)
+        mtime_synced = self.job_store.get_info("mtime_tree")
+        if mtime_synced == mtime_tree:
+            return
+        if mtime_synced is not None:
+            logging.warning(
+                f"{self.path_tree} has been modified since it was last exported from the job "
+                "store. Importing it again."
+            )
+        logging.info(f"Importing {self.path_tree} into {self.job_store.path_store}")
+        dic_tree = load_dic_from_path(self.path_tree)[0]
+        self.job_store.import_tree(dic_tree, self.find_all_jobs_in_tree(dic_tree))
+        self.job_store.set_info("mtime_tree", mtime_tree)
+
+    def get_jobs_status(
+        self, dic_all_jobs: dict[str, dict[str, Any]], dic_tree: Optional[dict] = None
+    ) -> dict[str, Optional[str]]:
+        """
+        Gets the status of all jobs. With the job store, only the status of the jobs that are not
+        over is read, the status of the others being kept from the previous check. All statuses
+        are read again if the jobs changed, or if a job that was not over is now over (e.g. the
+        store was updated by another process).
+
+        Args:
+            dic_all_jobs (dict[str, dict[str, Any]]): A dictionary containing all jobs.
+            dic_tree (Optional[dict], optional): The dictionary tree structure, from which the
+                status is read if no job store is used. Defaults to None, in which case the tree
+                is loaded.
+
+        Returns:
+            dict[str, Optional[str]]: The status of each job.
+        """
+        if self.job_store is None:
+            if dic_tree is None:
+                dic_tree = self.dic_tree
+            return {
+                job: nested_get(dic_tree, dic_job["l_keys"]).get("status")
+                for job, dic_job in dic_all_jobs.items()
+            }
+
+        dic_status_pending = self.job_store.get_jobs_status(STATUS_OVER)
+        if self.dic_status_jobs.keys() != dic_all_jobs.keys() or any(
+            status not in STATUS_OVER and job not in dic_status_pending
+            for job, status in self.dic_status_jobs.items()
+        ):
+            return self.job_store.get_jobs_status()
+        return self.dic_status_jobs | dic_status_pending
+
+    def get_dependency_graph(
+        self, dic_all_jobs: dict[str, dict[str, Any]], dic_status: dict[str, Optional[str]]
+    ) -> DependencyGraph:
+        """
+        Gets the dependency graph of the jobs. The graph is only built again if the jobs changed,
+        otherwise only the status of the jobs is updated.
+
+        Args:
+            dic_all_jobs (dict[str, dict[str, Any]]): A dictionary containing all jobs.
+            dic_status (dict[str, Optional[str]]): The status of each job.
+
+        Returns:
+            DependencyGraph: The dependency graph, up to date with the status of the jobs.
+        """
+        if self.dependency_graph is not None and self.dependency_graph.l_jobs == list(dic_all_jobs):
+            self.dependency_graph.update_jobs_status(dic_status)
+        else:
+            self.dependency_graph = DependencyGraph(None, dic_all_jobs, dic_status)
+        return self.dependency_graph
+
+    def export_tree(self) -> None:
+        """
+        Exports the state of the jobs from the job store to the tree file.
+        """
+        if self.job_store is None:
+            logging.info("No job store is used, the tree file is already up to date.")
+            return
+        with self.lock:
+            logging.info(f"Exporting {self.job_store.path_store} to {self.path_tree}")
+            write_dic_to_path(self.job_store.load_tree(), self.path_tree)
+            self.job_store.set_info("mtime_tree", os.path.getmtime(self.path_tree))
+
     def configure_jobs(
         self,
         force_configure: bool = False,
@@ -179,7 +374,9 @@ class SubmitScan:
                 return
 
             # Configure the jobs (add generation and job keys, set status to "To finish")
-            dic_tree = ConfigJobs(dic_tree,starting_depth=-len(Path(self.path_tree).parts) + 2).find_and_configure_jobs(dic_config_jobs)
+            dic_tree = ConfigJobs(
+                dic_tree, starting_depth=-len(Path(self.path_tree).parts) + 2
+            ).find_and_configure_jobs(dic_config_jobs)
 
             # Add the python environment, container image and absolute path of the study to the tree
             dic_tree["python_environment"] = self.path_python_environment
@@ -200,10 +397,15 @@ class SubmitScan:
         Returns:
             dict: A dictionary containing all jobs.
         """
+        # The jobs can be read directly from the index of the job store
+        if self.job_store is not None:
+            with self.lock:
+                return self.job_store.get_all_jobs()
+
         # Get a copy of the tree as it's safer
         with self.lock:
             dic_tree = self.dic_tree
-        return ConfigJobs(dic_tree,starting_depth=-len(Path(self.path_tree).parts) + 2).find_all_jobs()
+        return self.find_all_jobs_in_tree(dic_tree)
 
     def generate_run_files(
         self,
@@ -310,52 +512,60 @@ class SubmitScan:
         dic_all_jobs = self.get_all_jobs()
         at_least_one_job_to_finish = False
         final_status = "to_finish"
+        # Statuses changed during the check, to only update these with the job store
+        dic_status_updated = {}
         with self.lock:
-            # Get dic tree once to avoid reloading it for every job
-            dic_tree = self.dic_tree
-
-            # First pass to update the state of the tree
-            for job in dic_all_jobs:
-                # Skip jobs that are already finished, failed or unsubmittable
-                if nested_get(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"]) in [
-                    "finished",
-                    "failed",
-                    "unsubmittable",
-                ]:
-                    continue
-
-                # Check the state of the others
-                relative_job_folder = os.path.dirname(job)
-                absolute_job_folder = f"{self.abs_path}/{relative_job_folder}"
-                if os.path.exists(f"{absolute_job_folder}/.finished"):
-                    nested_set(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"], "finished")
-                # Check if the job failed otherwise (not to resubmit it again)
-                elif os.path.exists(f"{absolute_job_folder}/.failed"):
-                    nested_set(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"], "failed")
-                # else:
-                #     at_least_one_job_to_finish = True
-
-            # Second pass to update the state of the tree with unreachable jobs
-            dependency_graph = DependencyGraph(dic_tree, dic_all_jobs)
+            # Get the status of the jobs once to avoid reloading the tree for every job (only the
+            # jobs that are not over are read with the job store)
+            dic_tree = self.dic_tree if self.job_store is None else {}
+            dic_status = self.get_jobs_status(dic_all_jobs, dic_tree)
+
+            # First pass to update the status of the jobs, skipping jobs that are already
+            # finished, failed or unsubmittable
+            l_jobs_to_scan = [
+                job for job, status in dic_status.items() if status not in STATUS_OVER
+            ]
+
+            # Check the state of the others (finished, or failed not to resubmit it again)
+            for job, status in self.status_scanner.scan(l_jobs_to_scan).items():
+                if status is not None:
+                    dic_status[job] = dic_status_updated[job] = status
+
+            # Second pass to update the status of the jobs with unreachable jobs
+            dependency_graph = self.get_dependency_graph(dic_all_jobs, dic_status)
+            self.l_jobs_to_finish = []
             for job in dic_all_jobs:
                 # Get all failed dependencies across the tree
                 l_dep_failed = dependency_graph.get_failed_dependency(job)
                 if len(l_dep_failed) > 0:
-                    nested_set(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"], "unsubmittable")
-                elif nested_get(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"]) == "to_submit":
+                    dic_status[job] = dic_status_updated[job] = "unsubmittable"
+                elif dic_status[job] == "to_submit":
                     at_least_one_job_to_finish = True
+                    self.l_jobs_to_finish.append(job)
 
             if not at_least_one_job_to_finish:
                 # No more jobs to submit so finished
-                dic_tree["status"] = final_status = "finished"
+                final_status = "finished"
                 # Last pass to check if all jobs are properly finished
-                for job in dic_all_jobs:
-                    if nested_get(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"]) != "finished":
-                        dic_tree["status"] = final_status = "finished with issues"
-                        break
+                if any(status != "finished" for status in dic_status.values()):
+                    final_status = "finished with issues"
+            self.dic_status_jobs = dic_status
+
+            # Update the tree (or only the statuses that changed with the job store)
+            if self.job_store is not None:
+                self.job_store.update_jobs_status(dic_status_updated)
+                if final_status != "to_finish":
+                    self.job_store.set_tree_values({"status": final_status})
+            else:
+                for job, status in dic_status_updated.items():
+                    nested_set(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"], status)
+                if final_status != "to_finish":
+                    dic_tree["status"] = final_status
+                self.dic_tree = dic_tree
 
-            # Update dic_tree from cluster_submission
-            self.dic_tree = dic_tree
+        # Keep the tree file up to date once the study is over
+        if self.job_store is not None and final_status != "to_finish":
+            self.export_tree()
 
         return dic_all_jobs, final_status
 
@@ -382,6 +592,7 @@ class SubmitScan:
             absolute_job_folder = f"{self.abs_path}/{relative_job_folder}"
 
             # Remove failed tag
+            self.status_scanner.forget(job)
             if os.path.exists(f"{absolute_job_folder}/.failed"):
                 os.remove(f"{absolute_job_folder}/.failed")
             else:
@@ -408,6 +619,8 @@ class SubmitScan:
         dic_copy_back_per_gen: Optional[dict[int, dict[str, bool]]] = None,
         name_config: str = "config.yaml",
         force_submit: bool = False,
+        n_jobs_per_pack: int = 1,
+        n_cores_per_pack: int = 1,
     ) -> str:
         """
         Submits the jobs to the cluster. Note that copying back large files (e.g. json colliders)
@@ -434,6 +647,12 @@ class SubmitScan:
                 Defaults to "config.yaml".
             force_submit (bool, optional): If True, jobs are resubmitted even though they failed.
                 Defaults to False.
+            n_jobs_per_pack (int, optional): The maximum number of sibling jobs (same generation
+                and parent folder) packed in a single scheduler job. Useful for many short jobs,
+                for which the scheduler overhead dominates. Each job is still tagged individually.
+                Defaults to 1 (no packing).
+            n_cores_per_pack (int, optional): The number of jobs of a pack run at the same time.
+                Defaults to 1 (jobs run sequentially).
 
         Returns:
             str: The final status of the jobs.
@@ -470,22 +689,40 @@ class SubmitScan:
 
         logging.info("Acquiring lock to submit jobs")
         with self.lock:
-            # Get dic tree once to avoid reloading it for every job
-            dic_tree = self.dic_tree
+            # Get dic tree once to avoid reloading it for every job (with the job store, only the
+            # jobs that are not over, which are the only ones that can be submitted, are loaded)
+            if self.job_store is not None:
+                dic_tree = self.job_store.load_tree(l_status_excluded=STATUS_OVER)
+            else:
+                dic_tree = self.dic_tree
+            dic_status = self.get_jobs_status(dic_all_jobs, dic_tree)
 
             # Submit the jobs
             self._submit(
                 dic_tree,
                 dic_all_jobs,
+                dic_status,
                 one_generation_at_a_time,
                 dic_additional_commands_per_gen,
                 dic_dependencies_per_gen,
                 dic_copy_back_per_gen,
                 name_config,
+                n_jobs_per_pack=n_jobs_per_pack,
+                n_cores_per_pack=n_cores_per_pack,
             )
 
             # Update dic_tree from cluster_submission
-            self.dic_tree = dic_tree
+            if self.job_store is not None:
+                self.job_store.write_jobs(
+                    dic_tree,
+                    {
+                        job: dic_all_jobs[job]
+                        for job, status in dic_status.items()
+                        if status not in STATUS_OVER
+                    },
+                )
+            else:
+                self.dic_tree = dic_tree
         logging.info("Jobs have been submitted. Lock released.")
         return final_status
 
@@ -493,18 +730,23 @@ class SubmitScan:
         self,
         dic_tree: dict[str, Any],
         dic_all_jobs: dict[str, dict[str, Any]],
+        dic_status: dict[str, Optional[str]],
         one_generation_at_a_time: bool,
         dic_additional_commands_per_gen: dict[int, str],
         dic_dependencies_per_gen: dict[int, list[str]],
         dic_copy_back_per_gen: dict[int, dict[str, bool]],
         name_config: str,
+        n_jobs_per_pack: int = 1,
+        n_cores_per_pack: int = 1,
     ) -> None:
         """
         Submits the jobs to the cluster.
 
         Args:
-            dic_tree (dict[str, Any]): The dictionary tree structure.
+            dic_tree (dict[str, Any]): The dictionary tree structure. Only the jobs that are not over
+                are needed.
             dic_all_jobs (dict[str, dict[str,Any]]): A dictionary containing all jobs.
+            dic_status (dict[str, Optional[str]]): The status of each job.
             one_generation_at_a_time (bool): Whether to submit one full generation at a time.
             dic_additional_commands_per_gen (dict[int, str], optional): Additional commands per
                 generation.
@@ -516,15 +758,19 @@ class SubmitScan:
             dic_copy_back_per_gen (Optional[dict[int, dict[str, bool]]], optional): A dictionary
                 containing the files to copy back per generation.
             name_config (str, optional): The name of the configuration file for the study.
+            n_jobs_per_pack (int, optional): The maximum number of sibling jobs packed in a single
+                scheduler job. Defaults to 1.
+            n_cores_per_pack (int, optional): The number of jobs of a pack run at the same time.
+                Defaults to 1.
         """
         # Collect dict of list of unfinished jobs for every tree branch and every gen
         dic_to_submit_by_gen = {}
         dic_summary_by_gen = {}
-        dependency_graph = DependencyGraph(dic_tree, dic_all_jobs)
+        dependency_graph = self.get_dependency_graph(dic_all_jobs, dic_status)
         for job in dic_all_jobs:
             dic_to_submit_by_gen, dic_summary_by_gen = self._check_job_submit_status(
                 job,
-                dic_tree,
+                dic_status,
                 dic_all_jobs,
                 dic_to_submit_by_gen,
                 dic_summary_by_gen,
@@ -543,6 +789,11 @@ class SubmitScan:
         # Convert dic_to_submit_by_gen to contain all requested information
         l_jobs_to_submit = [job for dic_gen in dic_to_submit_by_gen.values() for job in dic_gen]
 
+        # Submit first the jobs unblocking the most work, according to the scheduling policy
+        l_jobs_to_submit = dependency_graph.sort_jobs_by_priority(
+            l_jobs_to_submit, self.scheduling_policy
+        )
+
         # Generate run files for the jobs to submit
         # ! Run files are generated at submit and not at configuration as the configuration
         # ! files are created at the end of each generation
@@ -564,6 +815,12 @@ class SubmitScan:
             dic_tree,
             path_submission_file,
             self.abs_path,
+            array_jobs=self.array_jobs,
+            n_jobs_per_pack=n_jobs_per_pack,
+            n_cores_per_pack=n_cores_per_pack,
+            n_workers_local=self.n_workers_local,
+            memory_limit_local=self.memory_limit_local,
+            max_jobs_in_flight=self.max_jobs_in_flight,
         )
 
         # Write and submit the submission files
@@ -612,7 +869,7 @@ class SubmitScan:
     @staticmethod
     def _check_job_submit_status(
         job: str,
-        dic_tree: dict[str, Any],
+        dic_status: dict[str, Optional[str]],
         dic_all_jobs: dict[str, dict[str, Any]],
         dic_to_submit_by_gen: dict[int, list[str]],
         dic_summary_by_gen: dict[int, dict[str, int]],
@@ -624,7 +881,7 @@ class SubmitScan:
 
         Args:
             job (str): The job identifier.
-            dic_tree (dict[str, Any]): The dictionary tree structure.
+            dic_status (dict[str, Optional[str]]): The status of each job.
             dic_all_jobs (dict[str, dict[str,Any]]): A dictionary containing all jobs.
             dic_to_submit_by_gen (dict[int, list[str]]): A dictionary where keys are generation
                 numbers and values are lists of jobs to submit for each generation.
@@ -665,11 +922,11 @@ class SubmitScan:
         # Job dependencies are ok
         elif len(l_dep) == 0:
             # But job has failed already
-            if nested_get(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"]) == "failed":
+            if dic_status[job] == "failed":
                 dic_summary_by_gen[gen]["failed"] += 1
 
             # Or job has finished already
-            elif nested_get(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"]) == "finished":
+            elif dic_status[job] == "finished":
                 dic_summary_by_gen[gen]["finished"] += 1
 
             # Else everything is ok, added to the submit dict
@@ -691,10 +948,19 @@ class SubmitScan:
         dic_copy_back_per_gen: Optional[dict[int, dict[str, bool]]] = None,
         name_config: str = "config.yaml",
         force_submit: bool = False,
+        n_jobs_per_pack: int = 1,
+        n_cores_per_pack: int = 1,
+        watch: bool = False,
     ) -> None:
         """
         Keeps submitting jobs until all jobs are finished or failed.
 
+        By default, the status of the jobs is checked every wait_time minutes. In watch mode, the
+        submission runs as a long-running watcher: it waits for the tags of the jobs that are not
+        over yet (with inotify if available, polling the job folders with an adaptive interval
+        otherwise), and submits again as soon as a job is over, such that the children of a
+        finished job are submitted within seconds.
+
         The following arguments are only used for HTC jobs submission:
         - dic_additional_commands_per_gen
         - dic_dependencies_per_gen
@@ -719,7 +985,16 @@ class SubmitScan:
                 Defaults to "config.yaml".
             force_submit (bool, optional): If True, jobs are resubmitted even though they failed.
                 Defaults to False.
-
+            n_jobs_per_pack (int, optional): The maximum number of sibling jobs (same generation
+                and parent folder) packed in a single scheduler job. Useful for many short jobs,
+                for which the scheduler overhead dominates. Each job is still tagged individually.
+                Defaults to 1 (no packing).
+            n_cores_per_pack (int, optional): The number of jobs of a pack run at the same time.
+                Defaults to 1 (jobs run sequentially).
+            watch (bool, optional): If True, submit again as soon as a job is over, instead of
+                every wait_time minutes. The wait_time is then the maximum time between two
+                submissions, and only the submissions after which no job got over within
+                wait_time count as tries. Defaults to False.
 
         Returns:
             None
@@ -735,6 +1010,9 @@ class SubmitScan:
             logging.warning("Setting wait time to 10 seconds.")
             wait_time = 10 / 60
 
+        # Watcher of the job folders, only used in watch mode
+        job_watcher = JobWatcher(self.abs_path) if watch else None
+
         # I don't need to lock the tree here since the status cheking is read only and
         # the lock is acquired in the submit method for the submission
         while (
@@ -745,14 +1023,65 @@ class SubmitScan:
                 dic_copy_back_per_gen,
                 name_config,
                 force_submit=force_submit,
+                n_jobs_per_pack=n_jobs_per_pack,
+                n_cores_per_pack=n_cores_per_pack,
             )
             not in ["finished", "finished with issues"]
             and max_try > 0
         ):
+            if job_watcher is not None:
+                # Wait for a job to be over, the tries are only used if nothing happens
+                if not self.wait_for_jobs(job_watcher, wait_time * 60):
+                    max_try -= 1
+                continue
+
             # Wait for a certain amount of time before checking again
             logging.info(f"Waiting {wait_time} minutes before checking again.")
             time.sleep(wait_time * 60)
             max_try -= 1
 
+        if job_watcher is not None:
+            job_watcher.close()
+
         if max_try == 0:
             print("Maximum number of tries reached. Stopping submission.")
+
+    def wait_for_jobs(
+        self,
+        job_watcher: JobWatcher,
+        max_wait: float,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+    ) -> bool:
+        """
+        Waits until at least one of the jobs that are not over yet (as of the last status check)
+        is over. The folders of the jobs are watched with inotify if available, and scanned for
+        tags with an interval doubling every time nothing happens (adaptive backoff, up to
+        max_interval), as the tags written from other machines are not seen by inotify. Only the
+        job folders are read, not the tree.
+
+        Args:
+            job_watcher (JobWatcher): The watcher of the job folders.
+            max_wait (float): The maximum waiting time, in seconds.
+            min_interval (float, optional): The initial interval between two scans of the job
+                folders, in seconds. Defaults to MIN_POLL_INTERVAL.
+            max_interval (float, optional): The maximum interval between two scans of the job
+                folders, in seconds. Defaults to MAX_POLL_INTERVAL.
+
+        Returns:
+            bool: True if at least one job is over, False if the maximum waiting time was reached.
+        """
+        job_watcher.watch(self.l_jobs_to_finish)
+        interval = min_interval
+        time_start = time.time()
+        while (remaining_time := max_wait - (time.time() - time_start)) > 0:
+            set_jobs_event = job_watcher.wait(min(interval, remaining_time))
+            dic_status = self.status_scanner.scan(self.l_jobs_to_finish)
+            l_jobs_over = [job for job, status in dic_status.items() if status is not None]
+            if l_jobs_over:
+                logging.info(f"{len(l_jobs_over)} job(s) over, submitting again.")
+                return True
+            # Events without tag can happen (e.g. a tag removed), keep the interval short then
+            interval = min_interval if set_jobs_event else min(2 * interval, max_interval)
+
+        return False
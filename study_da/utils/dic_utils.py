@@ -4,10 +4,19 @@ This module provides utility functions for handling nested dictionaries and YAML
 Functions:
     load_dic_from_path(path: str, ryaml: ruamel.yaml.YAML | None = None)
         -> tuple[dict, ruamel.yaml.YAML]:
-        Load a dictionary from a YAML file.
+        Load a dictionary from a YAML (or JSON lines) file.
 
     write_dic_to_path(dic: dict, path: str, ryaml: ruamel.yaml.YAML | None = None) -> None:
-        Write a dictionary to a YAML file.
+        Write a dictionary to a YAML (or JSON lines) file.
+
+    get_dic_records(dic: dict, l_keys: list | None = None) -> Iterator[dict]:
+        Flatten a nested dictionary into records, one per node containing non-dictionary values.
+
+    load_dic_from_jsonl(path: str) -> dict:
+        Load a nested dictionary from a JSON lines file.
+
+    write_dic_to_jsonl(dic: dict, path: str) -> None:
+        Write a nested dictionary to a JSON lines file.
 
     nested_get(dic: dict, keys: list) -> Any:
         Get the value from a nested dictionary using a list of keys.
@@ -30,8 +39,9 @@ Functions:
 # ==================================================================================================
 
 # Import standard library modules
+import json
 import os
-from typing import Any
+from typing import Any, Iterator
 
 # Import third-party modules
 import numpy as np
@@ -48,7 +58,8 @@ import ruamel.yaml
 def load_dic_from_path(
     path: str, ryaml: ruamel.yaml.YAML | None = None
 ) -> tuple[dict, ruamel.yaml.YAML]:
-    """Load a dictionary from a yaml file.
+    """Load a dictionary from a yaml file. Files with a .jsonl extension are read as JSON lines
+    (see write_dic_to_jsonl).
 
     Args:
         path (str): The path to the yaml file.
@@ -63,6 +74,10 @@ def load_dic_from_path(
         # Initialize yaml reader
         ryaml = ruamel.yaml.YAML()
 
+    # Load dic from JSON lines
+    if path.endswith(".jsonl"):
+        return load_dic_from_jsonl(path), ryaml
+
     # Load dic
     with open(path, "r") as fid:
         dic = ryaml.load(fid)
@@ -71,7 +86,8 @@ def load_dic_from_path(
 
 
 def write_dic_to_path(dic: dict, path: str, ryaml: ruamel.yaml.YAML | None = None) -> None:
-    """Write a dictionary to a yaml file.
+    """Write a dictionary to a yaml file. Files with a .jsonl extension are written as JSON lines
+    (see write_dic_to_jsonl).
 
     Args:
         dic (dict): The dictionary to write.
@@ -83,6 +99,11 @@ def write_dic_to_path(dic: dict, path: str, ryaml: ruamel.yaml.YAML | None = Non
 
     """
 
+    # Write dic to JSON lines
+    if path.endswith(".jsonl"):
+        write_dic_to_jsonl(dic, path)
+        return
+
     if ryaml is None:
         # Initialize yaml reader
         ryaml = ruamel.yaml.YAML()
@@ -95,6 +116,76 @@ def write_dic_to_path(dic: dict, path: str, ryaml: ruamel.yaml.YAML | None = Non
         os.fsync(fid.fileno())
 
 
+def get_dic_records(dic: dict, l_keys: list | None = None) -> Iterator[dict]:
+    """Flatten a nested dictionary into records. Each node of the dictionary containing values
+    that are not dictionaries yields a record {"l_keys": keys to the node, "values": {key: value}}.
+    Records are yielded in the order of the dictionary (depth first).
+
+    Args:
+        dic (dict): The nested dictionary.
+        l_keys (list | None): The keys leading to the current node. Defaults to None.
+
+    Yields:
+        dict: The records of the dictionary.
+
+    """
+    if l_keys is None:
+        l_keys = []
+
+    dic_values = {key: value for key, value in dic.items() if not isinstance(value, dict)}
+    if dic_values or not dic:
+        yield {"l_keys": l_keys, "values": dic_values}
+    for key, value in dic.items():
+        if isinstance(value, dict):
+            yield from get_dic_records(value, l_keys + [key])
+
+
+def load_dic_from_jsonl(path: str) -> dict:
+    """Load a nested dictionary from a JSON lines file, in which each line is a record as
+    produced by get_dic_records.
+
+    Args:
+        path (str): The path to the JSON lines file.
+
+    Returns:
+        dict: The nested dictionary.
+
+    """
+    dic = {}
+    with open(path, "r") as fid:
+        for line in fid:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            node = dic
+            for key in record["l_keys"]:
+                node = node.setdefault(key, {})
+            node.update(record["values"])
+
+    return dic
+
+
+def write_dic_to_jsonl(dic: dict, path: str) -> None:
+    """Write a nested dictionary to a JSON lines file, with one line per record (see
+    get_dic_records). This format is more compact and much faster to read and write than YAML for
+    large trees.
+
+    Args:
+        dic (dict): The dictionary to write.
+        path (str): The path to the JSON lines file.
+
+    Returns:
+        None
+
+    """
+    with open(path, "w") as fid:
+        for record in get_dic_records(dic):
+            fid.write(json.dumps(record) + "\n")
+        # Force os to write to disk now, to avoid race conditions
+        fid.flush()
+        os.fsync(fid.fileno())
+
+
 def nested_get(dic: dict, keys: list) -> Any:
     # Adapted from https://stackoverflow.com/questions/14692690/access-nested-dictionary-items-via-a-list-of-keys
     """Get the value from a nested dictionary using a list of keys.
@@ -0,0 +1,83 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import copy
+import os
+
+# Import user-defined modules
+from study_da.generate import MadCollider
+from study_da.generate.master_classes.collider_cache import ColliderCache
+from study_da.utils import load_dic_from_path
+
+# ==================================================================================================
+# --- Test the cache of the colliders
+# ==================================================================================================
+
+
+def test_collider_cache(tmp_path):
+    # Three colliders of 1 kB, in a cache of 2.5 kB
+    collider_cache = ColliderCache(str(tmp_path / "cache"), max_size=2.5e3 / 1024**3)
+    for idx in range(3):
+        path_collider = tmp_path / f"build_{idx}" / "collider.json"
+        path_collider.parent.mkdir()
+        path_collider.write_bytes(bytes([idx]) * 1000)
+        collider_cache.put(f"key_{idx}", str(path_collider))
+        os.utime(tmp_path / "cache" / f"key_{idx}", (idx, idx))
+
+        # The first collider is used again before the third one is added
+        if idx == 1:
+            assert collider_cache.get("key_0", str(tmp_path / "job" / "collider.json"))
+            assert (tmp_path / "job" / "collider.json").read_bytes() == bytes([0]) * 1000
+
+            # Rewriting the retrieved collider doesn't modify the cached one
+            with open(tmp_path / "job" / "collider.json", "r+b") as fid:
+                fid.write(bytes([9]) * 10)
+            path_cached = tmp_path / "cache" / "key_0" / "collider.json"
+            assert path_cached.read_bytes() == bytes([0]) * 1000
+
+    # The least recently used collider has been evicted
+    assert collider_cache.get("key_0", str(tmp_path / "job_0" / "collider.json"))
+    assert not collider_cache.get("key_1", str(tmp_path / "job_1" / "collider.json"))
+    assert collider_cache.get("key_2", str(tmp_path / "job_2" / "collider.json"))
+    assert not collider_cache.get("key_2", str(tmp_path / "job_2" / "collider.json.zip"))
+
+
+def test_mad_collider_cache_key(tmp_path):
+    path_config = os.path.join(
+        os.path.dirname(__file__), "../../study_da/assets/configurations/config_hllhc16.yaml"
+    )
+    config_mad = load_dic_from_path(path_config)[0]["config_mad"]
+    path_acc_models = tmp_path / "acc-models-lhc"
+    path_acc_models.mkdir()
+    (path_acc_models / "optics.madx").write_text("on_x1 = 250;\n")
+    (path_acc_models / "lhc.seq").write_text("mb: sbend, l = 14.3;\n")
+    config_mad["links"] = {"acc-models-lhc": str(path_acc_models)}
+    config_mad["optics_file"] = "acc-models-lhc/optics.madx"
+    key = MadCollider(config_mad).get_cache_key()
+
+    # Sanity checks, link targets and hidden files (e.g. .git) don't change the collider
+    config_mad_checks = copy.deepcopy(config_mad)
+    config_mad_checks["sanity_checks"] = not config_mad["sanity_checks"]
+    config_mad_checks["links"] = {"acc-models-lhc": f"{path_acc_models}/"}
+    (path_acc_models / ".git").mkdir()
+    (path_acc_models / ".git" / "HEAD").write_text("ref: refs/heads/master\n")
+    assert MadCollider(config_mad_checks).get_cache_key() == key
+
+    # The memoized hashes give the same key
+    config_mad_cached = copy.deepcopy(config_mad)
+    config_mad_cached["path_collider_cache"] = str(tmp_path / "cache")
+    assert MadCollider(config_mad_cached).get_cache_key() == key
+    assert MadCollider(config_mad_cached).get_cache_key() == key
+
+    # But the beam energy, the optics and the sequence do, even if updated in place
+    config_mad_energy = copy.deepcopy(config_mad)
+    config_mad_energy["beam_config"]["lhcb1"]["beam_energy_tot"] = 6800
+    assert MadCollider(config_mad_energy).get_cache_key() != key
+    (path_acc_models / "lhc.seq").write_text("mb: sbend, l = 14.4;\n")
+    key_sequence = MadCollider(config_mad).get_cache_key()
+    assert key_sequence != key
+    assert MadCollider(config_mad_cached).get_cache_key() == key_sequence
+    (path_acc_models / "optics.madx").write_text("on_x1 = 160;\n")
+    assert MadCollider(config_mad).get_cache_key() not in [key, key_sequence]
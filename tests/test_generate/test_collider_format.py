@@ -0,0 +1,106 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import os
+import pickle
+
+# Import third-party modules
+import pytest
+import xtrack as xt
+
+# Import user-defined modules
+from study_da.generate import XsuiteCollider
+from study_da.generate.master_classes.collider_cache import ColliderCache
+from study_da.generate.master_classes.utils import (
+    compress_and_write,
+    load_collider_binary,
+    write_collider_binary,
+)
+from study_da.utils import load_dic_from_path
+
+# ==================================================================================================
+# --- Test the binary collider format
+# ==================================================================================================
+
+
+def get_collider():
+    # Two small lines, one of them depending on a knob
+    collider = xt.Environment()
+    collider.vars["kq"] = 2e-3
+    for beam in [1, 2]:
+        collider.new(f"mq.b{beam}", xt.Multipole, knl=[0, 1e-3 * beam])
+        collider.new_line(
+            name=f"lhcb{beam}",
+            components=[collider.new(f"drift.b{beam}", xt.Drift, length=1.0), f"mq.b{beam}"],
+        )
+    collider["mq.b1"].knl[1] = "kq"
+    collider.metadata = {"study": "test"}
+    return collider
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_collider_format(tmp_path, monkeypatch, compress):
+    monkeypatch.chdir(tmp_path)
+    collider = get_collider()
+
+    # The JSON file is loaded if there is no binary file
+    collider.to_json("collider.json")
+    if compress:
+        compress_and_write("collider.json")
+    collider_json = XsuiteCollider._load_collider("collider.json")
+
+    # The binary file is then loaded in priority (even without the JSON file)
+    path_binary = write_collider_binary(collider, "collider.json", compress)
+    assert path_binary == ("collider.pkl.gz" if compress else "collider.pkl")
+    os.remove("collider.json.zip" if compress else "collider.json")
+    collider_binary = XsuiteCollider._load_collider("collider.json")
+
+    for collider_loaded in [collider_json, collider_binary]:
+        assert collider_loaded.metadata == {"study": "test"}
+        collider_loaded.vars["kq"] = 5e-3
+        assert collider_loaded["lhcb1"]["mq.b1"].knl[1] == 5e-3
+        assert collider_loaded["lhcb2"]["mq.b2"].knl[1] == 2e-3
+        assert collider_loaded["lhcb1"].element_names == collider["lhcb1"].element_names
+
+
+def test_collider_format_stale_binary(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    collider = get_collider()
+    write_collider_binary(collider, "collider.json", compress=False)
+
+    # A JSON file written after the binary file is loaded in priority
+    collider.metadata = {"study": "regenerated"}
+    collider.to_json("collider.json")
+    os.utime("collider.pkl", (0, 0))
+    assert XsuiteCollider._load_collider("collider.json").metadata == {"study": "regenerated"}
+
+
+def test_collider_format_restricted(tmp_path):
+    # Binary collider files can only contain plain containers and arrays
+    with open(tmp_path / "collider.pkl", "wb") as fid:
+        pickle.dump({"lines": os.getcwd}, fid)
+    with pytest.raises(pickle.UnpicklingError):
+        load_collider_binary(str(tmp_path / "collider.pkl"))
+
+
+def test_collider_node_cache(tmp_path, monkeypatch):
+    path_config = os.path.join(
+        os.path.dirname(__file__), "../../study_da/assets/configurations/config_hllhc16.yaml"
+    )
+    config_collider = load_dic_from_path(path_config)[0]["config_collider"]
+    monkeypatch.chdir(tmp_path)
+    get_collider().to_json("collider.json")
+    compress_and_write("collider.json")
+    config_collider["path_node_cache"] = str(tmp_path / "node_cache")
+
+    # The first job stages the collider in the cache, the next ones load it from there
+    xc = XsuiteCollider(config_collider, "collider.json", 1.6, None, False)
+    for _ in range(2):
+        collider = xc.load_collider()
+        assert collider["lhcb1"]["mq.b1"].knl[1] == 2e-3
+    node_cache = ColliderCache(str(tmp_path / "node_cache"))
+    key = node_cache.get_hash_file("collider.json.zip")
+    assert node_cache.get_path(key, "collider.pkl") is not None
+    assert len(os.listdir(tmp_path / "node_cache" / ".hashes")) == 1
@@ -0,0 +1,128 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import os
+
+# Import third-party modules
+import pytest
+from black import FileMode, format_str
+
+# Import user-defined modules
+from study_da import GenerateScan
+from study_da.utils import load_dic_from_path, write_dic_to_path
+
+# ==================================================================================================
+# --- Test the creation of a study
+# ==================================================================================================
+
+PATH_CUSTOM_FILES = os.path.join(
+    os.path.dirname(__file__),
+    "../../examples/in_docs_tutorials/concepts_generation_submission/custom_files",
+)
+
+
+def get_dic_scan(l_x):
+    return {
+        "name": "study",
+        "dependencies": {"main_configuration": f"{PATH_CUSTOM_FILES}/config_dummy.yaml"},
+        "structure": {
+            "generation_1": {
+                "executable": f"{PATH_CUSTOM_FILES}/generation_1_dummy.py",
+                "scans": {"x": {"list": l_x}},
+            },
+            "generation_2": {
+                "executable": f"{PATH_CUSTOM_FILES}/generation_2_dummy.py",
+                "scans": {"y": {"list": [1, 2]}},
+            },
+        },
+    }
+
+
+def test_create_study_incremental(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    GenerateScan(dic_scan=get_dic_scan([1, 2])).create_study()
+
+    # The first jobs are run, and one of their files is modified
+    dic_tree = load_dic_from_path("study/tree.yaml")[0]
+    dic_tree["x_1"]["generation_1"]["status"] = "finished"
+    dic_tree["x_1"]["y_2"]["generation_2"]["status"] = "failed"
+    write_dic_to_path(dic_tree, "study/tree.yaml")
+    with open("study/x_1/generation_1.py", "a") as fid:
+        fid.write("# Edited\n")
+
+    # Regenerate the study with one more value
+    generate_scan = GenerateScan(dic_scan=get_dic_scan([1, 2, 3]))
+    generate_scan.create_study(incremental=True)
+    dic_tree = load_dic_from_path("study/tree.yaml")[0]
+    assert set(dic_tree) == {"x_1", "x_2", "x_3"}
+    assert dic_tree["x_1"]["generation_1"]["status"] == "finished"
+    assert dic_tree["x_1"]["y_2"]["generation_2"]["status"] == "failed"
+    assert "status" not in dic_tree["x_3"]["generation_1"]
+    assert sorted(generate_scan.dic_incremental_report["added"]) == [
+        "study/x_3/generation_1.py",
+        "study/x_3/y_1/generation_2.py",
+        "study/x_3/y_2/generation_2.py",
+    ]
+    assert len(generate_scan.dic_incremental_report["unchanged"]) == 6
+    assert generate_scan.dic_incremental_report["removed"] == []
+    assert os.path.exists("study/x_3/y_2/generation_2.py")
+
+    # The existing files are not rendered again
+    with open("study/x_1/generation_1.py") as fid:
+        assert fid.read().endswith("# Edited\n")
+
+    # The prefixes of the folder names would change with the parameter space
+    with pytest.raises(ValueError):
+        GenerateScan(dic_scan=get_dic_scan([1, 2, 3])).create_study(
+            incremental=True, add_prefix_to_folder_names=True
+        )
+
+
+def test_create_study_formatting_strategy(tmp_path, monkeypatch):
+    # Formatting the templates only once gives the same files as formatting every file
+    dic_files = {}
+    for formatting_strategy in ["black", "template"]:
+        monkeypatch.chdir(tmp_path)
+        os.mkdir(formatting_strategy)
+        monkeypatch.chdir(tmp_path / formatting_strategy)
+        GenerateScan(dic_scan=get_dic_scan([1, 2.5])).create_study(
+            formatting_strategy=formatting_strategy
+        )
+        dic_files[formatting_strategy] = {}
+        for folder, _, l_files in os.walk("study"):
+            for name_file in l_files:
+                if name_file.endswith(".py"):
+                    with open(f"{folder}/{name_file}") as fid:
+                        dic_files[formatting_strategy][f"{folder}/{name_file}"] = fid.read()
+
+    assert len(dic_files["black"]) == 6
+    assert dic_files["template"] == dic_files["black"]
+
+
+def test_create_study_formatting_strategy_parameters(tmp_path, monkeypatch):
+    # Parameters that black would write differently than their representation
+    monkeypatch.chdir(tmp_path)
+    dic_mutated_parameters = {
+        "name": 'a "quoted" name',
+        "num_particles_per_bunch": {"lhcb1": 2.2e11, "lhcb2": 1e20},
+        "l_values": [1.5, "b"],
+    }
+    dic_files = {}
+    for formatting_strategy in ["black", "template"]:
+        generate_scan = GenerateScan(dic_scan=get_dic_scan([1]))
+        generate_scan.formatting_strategy = formatting_strategy
+        generate_scan.generate_render_write(
+            "generation_1",
+            f"{formatting_strategy}/",
+            f"{PATH_CUSTOM_FILES}/generation_1_dummy.py",
+            1,
+            dic_mutated_parameters,
+        )
+        with open(f"{formatting_strategy}/generation_1.py") as fid:
+            dic_files[formatting_strategy] = fid.read()
+
+    # The file written with the template strategy is left unchanged by black
+    assert format_str(dic_files["template"], mode=FileMode()) == dic_files["template"]
+    assert dic_files["template"] == dic_files["black"]
@@ -0,0 +1,60 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import itertools
+
+# Import third-party modules
+import fastparquet
+import numpy as np
+import pandas as pd
+
+# Import user-defined modules
+from study_da.generate import ParticlesDistribution
+
+# ==================================================================================================
+# --- Test the particles distribution
+# ==================================================================================================
+
+
+def get_configuration(tmp_path, **kwargs):
+    configuration = {
+        "r_min": 4.0,
+        "r_max": 8.0,
+        "n_r": 64,
+        "n_angles": 5,
+        "n_split": 3,
+        "path_distribution_folder_output": str(tmp_path / "particles"),
+    }
+    configuration.update(kwargs)
+    return configuration
+
+
+def test_distribution_grid(tmp_path):
+    distr = ParticlesDistribution(get_configuration(tmp_path))
+    l_particles = distr.return_distribution_as_list()
+
+    # Same distribution as the cartesian product of the angular and radial lists
+    array_reference = np.array(
+        [
+            (particle_id, r, angle)
+            for particle_id, (angle, r) in enumerate(
+                itertools.product(distr.get_angular_list(), distr.get_radial_list())
+            )
+        ]
+    )
+    assert len(l_particles) == 3
+    assert np.array_equal(np.concatenate(l_particles), array_reference)
+
+    # The parts are written as separate files, or as the row groups of a single file
+    l_path_files = distr.write_particle_distribution_to_disk(l_particles)
+    path_file = distr.write_particle_distribution_to_disk(l_particles, single_file=True)[0]
+    parquet_file = fastparquet.ParquetFile(path_file)
+    assert len(parquet_file.row_groups) == 3
+    for idx, path_file_part in enumerate(l_path_files):
+        df_part = pd.read_parquet(path_file_part)
+        df_row_group = parquet_file[idx].to_pandas()
+        assert np.array_equal(df_part.values, l_particles[idx])
+        assert np.array_equal(df_row_group.values, l_particles[idx])
+        assert df_row_group.columns.tolist() == df_part.columns.tolist()
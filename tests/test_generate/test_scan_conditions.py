@@ -0,0 +1,67 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import itertools
+
+# Import third-party modules
+import numpy as np
+import pytest
+
+# Import user-defined modules
+from study_da import GenerateScan
+
+# ==================================================================================================
+# --- Test the sparse evaluation of the scan conditions
+# ==================================================================================================
+
+
+def get_indices_to_keep_dense(l_conditions, dic_parameter_lists, ll_concomitant_parameters):
+    # Reference implementation, building the dense grid of all parameters
+    meshgrid = np.meshgrid(*dic_parameter_lists.values(), indexing="ij")
+    dic_param_mesh = dict(zip(dic_parameter_lists.keys(), meshgrid))
+    array_conditions = np.ones_like(meshgrid[0], dtype=bool)
+    for condition in l_conditions:
+        array_conditions = array_conditions & eval(condition, dic_param_mesh)
+
+    # Only keep the diagonal of the concomitant parameters
+    dic_dimension_indices = {parameter: idx for idx, parameter in enumerate(dic_parameter_lists)}
+    for concomitant_parameters in ll_concomitant_parameters:
+        l_idx = [dic_dimension_indices[parameter] for parameter in concomitant_parameters]
+        for idx, _ in np.ndenumerate(array_conditions):
+            if any(idx[i] != idx[j] for i, j in itertools.combinations(l_idx, 2)):
+                array_conditions[idx] = False
+    return np.argwhere(array_conditions)
+
+
+@pytest.mark.parametrize(
+    "l_conditions, ll_concomitant_parameters",
+    [
+        ([], []),
+        (["qy >= qx - 0.01"], []),
+        (["qy >= qx - 0.01", "i_oct > 100"], []),
+        ([], [["qx", "qy"]]),
+        (["i_oct * chroma > 1000"], [["qx", "qy"]]),
+        (["chroma < 15"], [["qx", "qy"], ["qy", "emittance"]]),
+    ],
+)
+def test_get_indices_to_keep(l_conditions, ll_concomitant_parameters) -> None:
+    dic_parameter_lists = {
+        "qx": np.round(np.linspace(62.30, 62.32, 5), 8),
+        "i_oct": np.array([50, 100, 200, 300]),
+        "qy": np.round(np.linspace(62.31, 62.33, 5), 8),
+        "chroma": np.array([5, 10, 15]),
+        "emittance": np.round(np.linspace(2.0, 3.0, 5), 8),
+    }
+
+    array_idx_dense = get_indices_to_keep_dense(
+        l_conditions, dic_parameter_lists, ll_concomitant_parameters
+    )
+
+    # Use a small chunk size to ensure chunks are properly concatenated
+    array_idx_sparse = GenerateScan.get_indices_to_keep(
+        l_conditions, dic_parameter_lists, ll_concomitant_parameters, chunk_size=7
+    )
+
+    assert np.array_equal(array_idx_dense, array_idx_sparse)
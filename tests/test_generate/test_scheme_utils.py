@@ -0,0 +1,58 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import json
+import os
+
+# Import third-party modules
+import numpy as np
+import pytest
+
+# Import user-defined modules
+from study_da.generate.master_classes.scheme_utils import (
+    _compute_LR_per_bunch,
+    compute_LR_per_bunch_both_beams,
+)
+
+# ==================================================================================================
+# --- Test the computation of the long-range encounters
+# ==================================================================================================
+
+
+def get_filling_schemes():
+    path_filling_scheme = os.path.join(
+        os.path.dirname(__file__),
+        "../../study_da/assets/filling_schemes/"
+        "25ns_2464b_2452_1842_1821_236bpi_12inj_hybrid_converted.json",
+    )
+    with open(path_filling_scheme) as fid:
+        filling_scheme = json.load(fid)
+
+    # An LHC filling scheme, and a random one (with bunches close to the wrap around)
+    rng = np.random.default_rng(0)
+    return [
+        (np.array(filling_scheme["beam1"]), np.array(filling_scheme["beam2"])),
+        tuple((rng.random(3564) < 0.5).astype(int) for _ in range(2)),
+    ]
+
+
+@pytest.mark.parametrize("number_of_LR_to_consider", [26, [20, 25, 30]])
+def test_compute_LR_per_bunch_both_beams(number_of_LR_to_consider):
+    for array_b1, array_b2 in get_filling_schemes():
+        B1_bunches_index = np.flatnonzero(array_b1)
+        B2_bunches_index = np.flatnonzero(array_b2)
+        array_LR_b1, array_LR_b2 = compute_LR_per_bunch_both_beams(
+            array_b1, array_b2, number_of_LR_to_consider
+        )
+        for beam, array_LR in [("beam_1", array_LR_b1), ("beam_2", array_LR_b2)]:
+            l_LR_reference = _compute_LR_per_bunch(
+                array_b1,
+                array_b2,
+                B1_bunches_index,
+                B2_bunches_index,
+                number_of_LR_to_consider,
+                beam=beam,
+            )
+            assert np.array_equal(array_LR, l_LR_reference)
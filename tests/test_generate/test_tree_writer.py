@@ -0,0 +1,40 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import third-party modules
+import pytest
+
+# Import user-defined modules
+from study_da.generate.tree_writer import StreamingTreeWriter
+from study_da.utils import load_dic_from_path
+from study_da.utils.dic_utils import get_dic_records
+
+# ==================================================================================================
+# --- Test the streaming of the tree
+# ==================================================================================================
+
+DIC_TREE = {
+    "generation_1": {
+        "generation_1": {"file": "study/generation_1/generation_1.py"},
+        "qx_62.31_true": {
+            "generation_2": {"file": "study/generation_1/qx_62.31_true/generation_2.py"},
+        },
+        "on_x1_[1, 2]": {
+            "generation_2": {"file": "study/generation_1/on_x1_[1, 2]/generation_2.py"},
+        },
+    },
+    "null": {"generation_1": {"file": "study/null: #/generation_1.py"}},
+}
+
+
+@pytest.mark.parametrize("tree_format", ["yaml", "jsonl"])
+def test_streaming_tree_writer(tmp_path, tree_format):
+    path_tree = str(tmp_path / f"tree.{tree_format}")
+    with StreamingTreeWriter(path_tree, tree_format) as tree_writer:
+        for record in get_dic_records(DIC_TREE):
+            tree_writer.write_node(record["l_keys"], record["values"])
+
+    dic_tree, _ = load_dic_from_path(path_tree)
+    assert dic_tree == DIC_TREE
+    assert list(get_dic_records(dic_tree)) == list(get_dic_records(DIC_TREE))
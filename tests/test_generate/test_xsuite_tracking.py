@@ -0,0 +1,210 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import os
+
+# Import third-party modules
+import numpy as np
+import pytest
+import xtrack as xt
+
+# Import user-defined modules
+from study_da.generate import ParticlesDistribution, XsuiteTracking
+
+# ==================================================================================================
+# --- Test the tracking by chunks
+# ==================================================================================================
+
+
+def get_line():
+    # One-turn map with a sextupole and an aperture, such that some particles are lost
+    line = xt.Line(
+        elements=[
+            xt.LineSegmentMap(qx=0.31, qy=0.32, betx=1.0, bety=1.0),
+            xt.Multipole(knl=[0, 0, 50.0]),
+            xt.LimitRect(min_x=-0.02, max_x=0.02, min_y=-0.02, max_y=0.02),
+        ]
+    )
+    line.particle_ref = xt.Particles(p0c=7e12)
+    line.build_tracker()
+    return line
+
+
+def get_particles(line):
+    r = np.linspace(1e-3, 1.5e-2, 20)
+    return line.build_particles(x=r, y=r / 2, delta=0)
+
+
+def get_configuration(**kwargs):
+    configuration = {
+        "context": "cpu",
+        "device_number": None,
+        "beam": "lhcb1",
+        "distribution_file": "00.parquet",
+        "path_distribution_folder_input": ".",
+        "delta_max": 0.0,
+        "n_turns": 60,
+    }
+    configuration.update(kwargs)
+    return configuration
+
+
+def sort_by_parent(dic_particles):
+    idx_sort = np.argsort(dic_particles["parent_particle_id"])
+    return {
+        key: np.asarray(value)[idx_sort]
+        for key, value in dic_particles.items()
+        if np.ndim(value) == 1
+    }
+
+
+def test_track_by_chunks(tmp_path):
+    line = get_line()
+    xst = XsuiteTracking(get_configuration(), 1e-6, 1e-6)
+    dic_reference = sort_by_parent(xst.track({"lhcb1": line}, get_particles(line)))
+    assert 0 < np.sum(dic_reference["state"] > 0) < 20
+
+    # A job interrupted after 40 turns, restarted to track the 60 turns
+    path_checkpoint = str(tmp_path / "checkpoint.npz")
+    for n_turns in [40, 60]:
+        xst = XsuiteTracking(
+            get_configuration(
+                n_turns=n_turns, n_turns_per_chunk=20, path_checkpoint=path_checkpoint
+            ),
+            1e-6,
+            1e-6,
+        )
+        particles = get_particles(line)
+        hash_particles = xst._get_hash_particles(particles)
+        dic_particles = sort_by_parent(xst.track({"lhcb1": line}, particles))
+    assert xst._load_checkpoint(path_checkpoint, hash_particles)[1] == 60
+
+    # The tracked particles are the same as without chunks
+    for key in ["x", "px", "y", "py", "zeta", "delta", "state", "at_turn", "at_element"]:
+        assert np.array_equal(dic_particles[key], dic_reference[key])
+
+    xst.remove_checkpoint()
+    assert not (tmp_path / "checkpoint.npz").exists()
+
+
+def test_track_in_processes(tmp_path):
+    line = get_line()
+    xst = XsuiteTracking(get_configuration(), 1e-6, 1e-6)
+    dic_reference = sort_by_parent(xst.track({"lhcb1": line}, get_particles(line)))
+
+    # The particles are split in 3 processes (with checkpoints), and merged back in order
+    xst = XsuiteTracking(
+        get_configuration(
+            n_processes=3, n_turns_per_chunk=30, path_checkpoint=str(tmp_path / "checkpoint.npz")
+        ),
+        1e-6,
+        1e-6,
+    )
+    dic_particles = xst.track({"lhcb1": line}, get_particles(line))
+    assert np.all(np.diff(dic_particles["parent_particle_id"]) > 0)
+    for key in ["x", "px", "y", "py", "zeta", "delta", "state", "at_turn", "at_element"]:
+        assert np.array_equal(dic_particles[key], dic_reference[key])
+
+    assert len(list(tmp_path.glob("checkpoint_*.npz"))) == 3
+    xst.remove_checkpoint()
+    assert not list(tmp_path.glob("checkpoint*"))
+
+
+def test_track_stop_if_all_lost(caplog):
+    line = get_line()
+    xst = XsuiteTracking(get_configuration(n_turns=1000), 1e-6, 1e-6)
+    r = np.linspace(1.2e-2, 1.9e-2, 8)
+    particles = line.build_particles(x=r, y=r / 2, delta=0)
+    dic_reference = sort_by_parent(xst.track({"lhcb1": line}, particles))
+    assert np.all(dic_reference["state"] <= 0)
+    assert xst.n_turns_tracked == 1000
+
+    # The tracking stops after the first chunk in which all the particles are lost
+    caplog.set_level("INFO")
+    xst = XsuiteTracking(
+        get_configuration(n_turns=1000, n_turns_per_chunk=10, stop_if_all_lost=True), 1e-6, 1e-6
+    )
+    particles = line.build_particles(x=r, y=r / 2, delta=0)
+    dic_particles = sort_by_parent(xst.track({"lhcb1": line}, particles))
+    assert xst.n_turns_tracked == 10 * int(np.ceil((dic_reference["at_turn"].max() + 1) / 10))
+    for key in ["x", "px", "y", "py", "state", "at_turn", "at_element"]:
+        assert np.array_equal(dic_particles[key], dic_reference[key])
+    assert "particles.turns/s" in caplog.text
+
+    # The implicit chunks (without n_turns_per_chunk) are not logged
+    caplog.clear()
+    xst = XsuiteTracking(get_configuration(n_turns=1000, stop_if_all_lost=True), 1e-6, 1e-6)
+    particles = line.build_particles(x=r, y=r / 2, delta=0)
+    xst.track({"lhcb1": line}, particles)
+    assert xst.n_turns_tracked == 1000
+    assert "particles.turns/s" not in caplog.text
+
+
+@pytest.mark.parametrize("n_processes", [1, 4])
+def test_track_adaptive(tmp_path, n_processes):
+    line = get_line()
+    line.twiss_default["method"] = "4d"
+
+    # Same distribution tracked on the full grid, and adaptively from a coarse grid
+    dic_da = {}
+    for distribution_mode in ["grid", "adaptive"]:
+        distr = ParticlesDistribution(
+            {
+                "r_min": 100,
+                "r_max": 2000,
+                "n_r": 128,
+                "n_angles": 2,
+                "n_split": 1,
+                "path_distribution_folder_output": str(tmp_path / distribution_mode),
+                "distribution_mode": distribution_mode,
+                "n_r_coarse": 8,
+            }
+        )
+        path_file = distr.write_particle_distribution_to_disk(distr.return_distribution_as_list())[
+            0
+        ]
+        xst = XsuiteTracking(
+            get_configuration(
+                n_turns=200,
+                n_processes=n_processes,
+                path_distribution_folder_input=os.path.dirname(path_file),
+                distribution_file=os.path.basename(path_file),
+            ),
+            1e-6,
+            1e-6,
+        )
+        if distribution_mode == "grid":
+            particles, particle_id, r_vect, theta_vect = (
+                xst.prepare_particle_distribution_for_tracking({"lhcb1": line})
+            )
+            state = sort_by_parent(xst.track({"lhcb1": line}, particles))["state"]
+        else:
+            dic_particles, particle_id, r_vect, theta_vect = xst.track_adaptive(
+                {"lhcb1": line}, distr
+            )
+            state = dic_particles["state"]
+            assert np.all(np.diff(particle_id) > 0)
+            assert len(particle_id) < 256 / 5
+
+        # DA as the smallest amplitude of the lost particles, for each angle
+        dic_da[distribution_mode] = [
+            r_vect[(state <= 0) & (theta_vect == theta)].min() for theta in np.unique(theta_vect)
+        ]
+
+    assert dic_da["adaptive"] == dic_da["grid"]
+
+
+def test_track_in_processes_few_particles():
+    line = get_line()
+    xst = XsuiteTracking(get_configuration(), 1e-6, 1e-6)
+    dic_reference = sort_by_parent(
+        xst.track({"lhcb1": line}, line.build_particles(x=[1e-3, 1.5e-2], y=0, delta=0))
+    )
+
+    # Fewer particles than processes: no empty shard
+    xst = XsuiteTracking(get_configuration(n_processes=4), 1e-6, 1e-6)
+    dic_particles = xst.track({"lhcb1": line}, line.build_particles(x=[1e-3, 1.5e-2], y=0, delta=0))
+    for key in ["x", "px", "y", "py", "state", "at_turn"]:
+        assert np.array_equal(dic_particles[key], dic_reference[key])
@@ -0,0 +1,113 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import third-party modules
+import numpy as np
+
+# Import user-defined modules
+from study_da.submit.config_jobs import ConfigJobs
+from study_da.submit.dependency_graph import DependencyGraph
+from study_da.utils import nested_get
+
+# ==================================================================================================
+# --- Test the dependency graph
+# ==================================================================================================
+
+
+def get_dependencies_reference(dic_tree, dic_all_jobs, job):
+    # Reference implementation, browsing the parent folders of the job in the tree
+    set_l_keys = {tuple(dic_all_jobs[job]["l_keys"][:-1]) for job in dic_all_jobs}
+    l_keys = dic_all_jobs[job]["l_keys"]
+    set_dependencies = set()
+    for i in range(len(l_keys) - 1):
+        if tuple(l_keys[:i]) in set_l_keys:
+            for sub_dict in nested_get(dic_tree, l_keys[:i]).values():
+                if isinstance(sub_dict, dict) and "file" in sub_dict:
+                    set_dependencies.add(sub_dict["file"])
+    return set_dependencies
+
+
+def get_random_tree(rng):
+    # Three generations, with a varying number of children and random statuses
+    l_status = ["finished", "failed", "to_submit", "unsubmittable"]
+    dic_tree = {"gen_1": {}}
+    for i in range(3):
+        dic_gen_1 = {"gen_1": {"file": f"s/g1_{i}/gen_1.py", "status": rng.choice(l_status)}}
+        for j in range(rng.integers(0, 4)):
+            dic_gen_2 = {
+                "gen_2": {"file": f"s/g1_{i}/{j}/gen_2.py", "status": rng.choice(l_status)}
+            }
+            for k in range(rng.integers(0, 3)):
+                dic_gen_2[f"{k}"] = {
+                    "gen_3": {"file": f"s/g1_{i}/{j}/{k}/gen_3.py", "status": rng.choice(l_status)}
+                }
+            dic_gen_1[f"{j}"] = dic_gen_2
+        dic_tree[f"g1_{i}"] = dic_gen_1
+    dic_tree["status"] = "to_finish"
+    return dic_tree
+
+
+def test_dependency_graph():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        dic_tree = get_random_tree(rng)
+        dic_all_jobs = ConfigJobs(dic_tree).find_all_jobs()
+        dependency_graph = DependencyGraph(dic_tree, dic_all_jobs)
+        dic_graph = dependency_graph.build_full_dependency_graph()
+        for job in dic_all_jobs:
+            set_dependencies = get_dependencies_reference(dic_tree, dic_all_jobs, job)
+            dic_status = {
+                dep: nested_get(dic_tree, dic_all_jobs[dep]["l_keys"] + ["status"])
+                for dep in set_dependencies
+            }
+            assert dic_graph[job] == set_dependencies
+            assert set(dependency_graph.get_failed_dependency(job)) == {
+                dep for dep, status in dic_status.items() if status == "failed"
+            }
+            assert set(dependency_graph.get_unfinished_dependency(job)) == {
+                dep for dep, status in dic_status.items() if status not in ["finished", "failed"]
+            }
+
+
+def test_downstream_work():
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        dic_tree = get_random_tree(rng)
+        dic_all_jobs = ConfigJobs(dic_tree).find_all_jobs()
+        dependency_graph = DependencyGraph(dic_tree, dic_all_jobs)
+        dic_graph = dependency_graph.build_full_dependency_graph()
+
+        # Reference implementation, browsing the unfinished jobs depending on each job
+        def is_unfinished(job):
+            return nested_get(dic_tree, dic_all_jobs[job]["l_keys"] + ["status"]) not in [
+                "finished",
+                "failed",
+            ]
+
+        dic_descendants = {
+            job: [
+                other for other in dic_all_jobs if job in dic_graph[other] and is_unfinished(other)
+            ]
+            for job in dic_all_jobs
+        }
+        dic_critical_path = {}
+
+        def get_critical_path(job):
+            if job not in dic_critical_path:
+                dic_critical_path[job] = max(
+                    [1 + get_critical_path(other) for other in dic_descendants[job]], default=0
+                )
+            return dic_critical_path[job]
+
+        array_critical_path, array_n_descendants = dependency_graph.get_downstream_work()
+        for job, idx in dependency_graph.dic_job_to_id.items():
+            assert array_n_descendants[idx] == len(dic_descendants[job])
+            assert array_critical_path[idx] == get_critical_path(job)
+
+        # Jobs unblocking the most work come first, ties keep the order of the tree
+        l_jobs = list(dic_all_jobs)
+        l_sorted = dependency_graph.sort_jobs_by_priority(l_jobs, "descendants")
+        l_n_descendants = [len(dic_descendants[job]) for job in l_sorted]
+        assert l_n_descendants == sorted(l_n_descendants, reverse=True)
+        assert dependency_graph.sort_jobs_by_priority(l_jobs, "tree") == l_jobs
@@ -0,0 +1,124 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import user-defined modules
+from study_da import SubmitScan
+from study_da.submit.config_jobs import ConfigJobs
+from study_da.submit.job_store import JobStore
+from study_da.utils import write_dic_to_path
+
+# ==================================================================================================
+# --- Test the SQLite job store
+# ==================================================================================================
+
+DIC_TREE = {
+    "generation_1": {
+        "generation_1": {"file": "study/generation_1/generation_1.py", "status": "finished"},
+        "qx_62.31": {
+            "generation_2": {
+                "file": "study/generation_1/qx_62.31/generation_2.py",
+                "status": "to_submit",
+                "submission_type": "local_pc",
+            },
+        },
+        "qx_62.32": {
+            "generation_2": {
+                "file": "study/generation_1/qx_62.32/generation_2.py",
+                "status": "to_submit",
+                "submission_type": "local_pc",
+            },
+        },
+    },
+    "status": "to_finish",
+    "configured": True,
+}
+
+
+def test_job_store(tmp_path):
+    dic_all_jobs = ConfigJobs(DIC_TREE).find_all_jobs()
+    job_store = JobStore(str(tmp_path / "tree.sqlite"))
+    job_store.import_tree(DIC_TREE, dic_all_jobs)
+
+    # The tree and the jobs are unchanged by the store
+    assert job_store.load_tree() == DIC_TREE
+    assert job_store.get_all_jobs() == dic_all_jobs
+
+    # Batched status updates
+    job_2 = "study/generation_1/qx_62.32/generation_2.py"
+    job_store.update_jobs_status({job_2: "failed"})
+    job_store.set_tree_values({"status": "finished with issues"})
+    assert job_store.get_jobs_status(["finished", "failed"]) == {
+        "study/generation_1/qx_62.31/generation_2.py": "to_submit"
+    }
+    dic_tree = job_store.load_tree()
+    assert dic_tree["generation_1"]["qx_62.32"]["generation_2"]["status"] == "failed"
+    assert dic_tree["status"] == "finished with issues"
+    assert job_store.load_tree(["finished", "failed"])["generation_1"] == {
+        "qx_62.31": DIC_TREE["generation_1"]["qx_62.31"]
+    }
+
+    # Writing a modified tree only changes the corresponding job
+    dic_tree["generation_1"]["qx_62.31"]["generation_2"]["path_run"] = "run.sh"
+    job_store.write_tree(dic_tree, dic_all_jobs)
+    assert job_store.load_tree() == dic_tree
+
+    # Writing a partial tree only changes the given jobs
+    job_1 = "study/generation_1/qx_62.31/generation_2.py"
+    dic_tree_pending = job_store.load_tree(["finished", "failed"])
+    dic_tree_pending["generation_1"]["qx_62.31"]["generation_2"]["path_run"] = "run_1.sh"
+    job_store.write_jobs(dic_tree_pending, {job_1: dic_all_jobs[job_1]})
+    assert job_store.load_tree()["generation_1"]["qx_62.31"]["generation_2"]["path_run"] == (
+        "run_1.sh"
+    )
+    assert job_store.load_tree()["generation_1"]["qx_62.32"] == dic_tree["generation_1"]["qx_62.32"]
+
+    # The position of the jobs follows the order of the tree
+    dic_tree["generation_1"] = {
+        key: dic_tree["generation_1"][key] for key in ["qx_62.32", "qx_62.31", "generation_1"]
+    }
+    job_store.write_tree(dic_tree, dic_all_jobs)
+    assert list(job_store.get_all_jobs()) == [
+        job_2,
+        job_1,
+        "study/generation_1/generation_1.py",
+    ]
+
+
+def test_submit_scan_job_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "study").mkdir()
+    write_dic_to_path(DIC_TREE, "study/tree.yaml")
+    submit_scan = SubmitScan("study/tree.yaml", "venv", job_store="sqlite")
+
+    # Record the reads of the status of the jobs
+    l_status_excluded_read = []
+    get_jobs_status = submit_scan.job_store.get_jobs_status
+
+    def get_jobs_status_recorded(l_status_excluded=None):
+        l_status_excluded_read.append(l_status_excluded)
+        return get_jobs_status(l_status_excluded)
+
+    monkeypatch.setattr(submit_scan.job_store, "get_jobs_status", get_jobs_status_recorded)
+
+    # The status of all jobs is read on the first check only
+    job_1 = "study/generation_1/qx_62.31/generation_2.py"
+    job_2 = "study/generation_1/qx_62.32/generation_2.py"
+    (tmp_path / "study" / "generation_1" / "qx_62.31").mkdir(parents=True)
+    (tmp_path / "study" / "generation_1" / "qx_62.31" / ".finished").touch()
+    assert submit_scan.check_and_update_all_jobs_status()[1] == "to_finish"
+    assert submit_scan.check_and_update_all_jobs_status()[1] == "to_finish"
+    assert l_status_excluded_read == [
+        ["finished", "failed", "unsubmittable"],
+        None,
+        ["finished", "failed", "unsubmittable"],
+    ]
+    assert submit_scan.job_store.get_jobs_status() == {
+        "study/generation_1/generation_1.py": "finished",
+        job_1: "finished",
+        job_2: "to_submit",
+    }
+
+    # A job over in the store (e.g. updated by another process) is found
+    submit_scan.job_store.update_jobs_status({job_2: "failed"})
+    assert submit_scan.check_and_update_all_jobs_status()[1] == "finished with issues"
@@ -0,0 +1,74 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import threading
+import time
+from types import SimpleNamespace
+
+# Import third-party modules
+import pytest
+
+# Import user-defined modules
+from study_da import SubmitScan
+from study_da.submit.job_watcher import JobWatcher
+from study_da.submit.status_scanner import StatusScanner
+
+# ==================================================================================================
+# --- Test the watcher of the job folders
+# ==================================================================================================
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_job_watcher(tmp_path, use_inotify):
+    l_jobs = [f"study/gen_1/{folder}/gen_2.py" for folder in ["a", "b"]]
+    for job in l_jobs:
+        (tmp_path / job).parent.mkdir(parents=True)
+
+    job_watcher = JobWatcher(str(tmp_path), use_inotify=use_inotify)
+    if use_inotify and not job_watcher.use_inotify:
+        pytest.skip("inotify is not available")
+    job_watcher.watch(l_jobs)
+
+    # Tag the second job from another thread
+    timer = threading.Timer(0.2, (tmp_path / "study/gen_1/b/.finished").touch)
+    timer.start()
+    time_start = time.time()
+    set_jobs = job_watcher.wait(2.0)
+    duration = time.time() - time_start
+    timer.join()
+    job_watcher.close()
+
+    if use_inotify:
+        # The watcher wakes up as soon as the tag is created
+        assert set_jobs == {l_jobs[1]}
+        assert duration < 1.0
+    else:
+        # The watcher only sleeps, the folders must be polled
+        assert set_jobs == set()
+        assert duration >= 2.0
+
+
+def test_wait_for_jobs_without_event(tmp_path):
+    # Without inotify events (e.g. tags written from another machine), the job folders are polled
+    # with an interval that doesn't grow beyond the maximum interval
+    job = "study/gen_1/a/gen_2.py"
+    (tmp_path / job).parent.mkdir(parents=True)
+    submit_scan = SimpleNamespace(
+        l_jobs_to_finish=[job], status_scanner=StatusScanner(str(tmp_path))
+    )
+    job_watcher = JobWatcher(str(tmp_path), use_inotify=False)
+
+    timer = threading.Timer(1.6, (tmp_path / "study/gen_1/a/.finished").touch)
+    timer.start()
+    time_start = time.time()
+    assert SubmitScan.wait_for_jobs(
+        submit_scan, job_watcher, max_wait=30.0, min_interval=0.05, max_interval=0.2
+    )
+    duration = time.time() - time_start
+    timer.join()
+    job_watcher.close()
+
+    # Without the maximum interval, the next scan would only happen after 3.15 s
+    assert 1.6 <= duration < 2.5
@@ -0,0 +1,113 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import os
+import time
+
+# Import user-defined modules
+from study_da.submit.cluster_submission.local_executor import (
+    LocalExecutor,
+    get_pid_dispatcher,
+    get_pid_job,
+    is_job_queued_detached,
+)
+
+# ==================================================================================================
+# --- Test the local executor
+# ==================================================================================================
+
+
+def get_jobs(tmp_path, n_jobs, idx_failed=None, name="job"):
+    l_abs_path_jobs = []
+    for idx in range(n_jobs):
+        path_job = tmp_path / f"{name}_{idx}"
+        path_job.mkdir()
+        tag = ".failed" if idx == idx_failed else ".finished"
+        exit_code = 1 if idx == idx_failed else 0
+        (path_job / "run.sh").write_text(
+            f"#!/bin/bash\ndate +%s.%N > {path_job}/time_start\nsleep 0.5\n"
+            f"date +%s.%N > {path_job}/time_end\ntouch {path_job}/{tag}\nexit {exit_code}\n"
+        )
+        l_abs_path_jobs.append(str(path_job))
+    return l_abs_path_jobs
+
+
+def test_local_executor(tmp_path):
+    l_abs_path_jobs = get_jobs(tmp_path, 4, idx_failed=3)
+
+    # Only two jobs run at the same time, the others are queuing
+    local_executor = LocalExecutor(n_workers=2, path_dispatcher=str(tmp_path / "dispatcher"))
+    l_started = local_executor.submit(l_abs_path_jobs)
+    assert l_started == l_abs_path_jobs[:2]
+    assert local_executor.get_queuing_jobs() == l_abs_path_jobs[2:]
+    assert all(get_pid_job(abs_path_job) is not None for abs_path_job in l_started)
+    assert get_pid_job(l_abs_path_jobs[2]) is None
+
+    # Submitting the same jobs again has no effect
+    assert local_executor.submit(l_abs_path_jobs) == []
+
+    # The queued jobs are started in the background
+    time_start = time.time()
+    while local_executor.get_stats()["completed"] < 4 and time.time() - time_start < 20:
+        time.sleep(0.2)
+
+    dic_stats = local_executor.get_stats()
+    assert dic_stats["started"] == 4
+    assert dic_stats["completed"] == 4
+    assert dic_stats["failed"] == 1
+    assert dic_stats["running"] == dic_stats["queuing"] == 0
+    assert dic_stats["mean_duration"] >= 0.5
+    assert all(get_pid_job(abs_path_job) is None for abs_path_job in l_abs_path_jobs)
+
+
+def test_local_executor_detach(tmp_path):
+    l_abs_path_jobs = get_jobs(tmp_path, 3)
+    local_executor = LocalExecutor(n_workers=1, path_dispatcher=str(tmp_path / "dispatcher"))
+    local_executor.submit(l_abs_path_jobs)
+
+    # The queued jobs are handed over to the detached dispatcher
+    assert local_executor.detach() is not None
+    assert local_executor.get_queuing_jobs() == []
+    assert all(is_job_queued_detached(abs_path_job) for abs_path_job in l_abs_path_jobs[1:])
+
+    # The dispatcher runs them, one at a time, after the job already running
+    time_start = time.time()
+    while time.time() - time_start < 30 and not all(
+        os.path.exists(f"{abs_path_job}/.finished") for abs_path_job in l_abs_path_jobs
+    ):
+        time.sleep(0.2)
+    assert all(os.path.exists(f"{abs_path_job}/.finished") for abs_path_job in l_abs_path_jobs)
+    assert not any(is_job_queued_detached(abs_path_job) for abs_path_job in l_abs_path_jobs)
+
+
+def test_local_executor_shared_dispatcher(tmp_path):
+    path_dispatcher = str(tmp_path / "dispatcher")
+    l_abs_path_jobs_1 = get_jobs(tmp_path, 3, name="job_1")
+    local_executor_1 = LocalExecutor(n_workers=1, path_dispatcher=path_dispatcher)
+    local_executor_1.submit(l_abs_path_jobs_1)
+    pid_dispatcher = local_executor_1.detach()
+    assert get_pid_dispatcher(path_dispatcher) == pid_dispatcher
+
+    # A new executor hands its jobs over to the live dispatcher instead of starting them
+    l_abs_path_jobs_2 = get_jobs(tmp_path, 2, name="job_2")
+    local_executor_2 = LocalExecutor(n_workers=1, path_dispatcher=path_dispatcher)
+    assert local_executor_2.submit(l_abs_path_jobs_2) == []
+    assert local_executor_2.get_queuing_jobs() == []
+    assert all(is_job_queued_detached(abs_path_job) for abs_path_job in l_abs_path_jobs_2)
+
+    # All the jobs run one at a time, and the dispatcher stops once they are over
+    l_abs_path_jobs = l_abs_path_jobs_1 + l_abs_path_jobs_2
+    time_start = time.time()
+    while time.time() - time_start < 30 and get_pid_dispatcher(path_dispatcher) is not None:
+        time.sleep(0.2)
+    assert all(os.path.exists(f"{abs_path_job}/.finished") for abs_path_job in l_abs_path_jobs)
+    l_intervals = []
+    for abs_path_job in l_abs_path_jobs:
+        with open(f"{abs_path_job}/time_start") as fid_start, open(
+            f"{abs_path_job}/time_end"
+        ) as fid_end:
+            l_intervals.append((float(fid_start.read()), float(fid_end.read())))
+    l_intervals.sort()
+    assert all(end <= start for (_, end), (start, _) in zip(l_intervals, l_intervals[1:]))
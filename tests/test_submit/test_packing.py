@@ -0,0 +1,93 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import os
+import subprocess
+
+# Import user-defined modules
+from study_da.submit.cluster_submission import ClusterSubmission
+from study_da.submit.cluster_submission.scheduler_queue import clear_queue_cache
+
+# ==================================================================================================
+# --- Test the packing of sibling jobs in a single scheduler job
+# ==================================================================================================
+
+
+def test_packing(tmp_path, monkeypatch):
+    # Fake HTCondor, running nothing and reporting the first cluster as running
+    for name, output in [
+        ("condor_submit", "1 job(s) submitted to cluster 400.\n1 job(s) submitted to cluster 401."),
+        ("condor_q", "400 0 2 pack/run.sh\n401 0 1 c/run.sh"),
+    ]:
+        path_executable = tmp_path / name
+        path_executable.write_text(f"#!/bin/sh\necho '{output}'\n")
+        path_executable.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    clear_queue_cache()
+
+    # Three sibling jobs, the second one failing without tagging itself
+    l_folders = ["a", "b", "c"]
+    l_jobs = [f"study/gen_1/{folder}/gen_2.py" for folder in l_folders]
+    for folder in l_folders:
+        path_job = tmp_path / "study" / "gen_1" / folder
+        path_job.mkdir(parents=True)
+        tag = "exit 1" if folder == "b" else f"touch {path_job}/.finished"
+        (path_job / "run.sh").write_text(f"#!/bin/bash\n{tag}\n")
+    dic_all_jobs = {
+        job: {"gen": 2, "l_keys": ["gen_1", folder, "gen_2"]}
+        for job, folder in zip(l_jobs, l_folders)
+    }
+    dic_tree = {
+        "gen_1": {
+            folder: {
+                "gen_2": {
+                    "file": job,
+                    "submission_type": "htc",
+                    "htc_flavor": "espresso",
+                    "status": "to_submit",
+                }
+            }
+            for folder, job in zip(l_folders, l_jobs)
+        }
+    }
+    cluster_submission = ClusterSubmission(
+        "study",
+        l_jobs,
+        dic_all_jobs,
+        dic_tree,
+        f"{tmp_path}/study/submission/submission_file.sub",
+        str(tmp_path),
+        n_jobs_per_pack=2,
+        n_cores_per_pack=2,
+    )
+
+    # The first two jobs are packed together
+    dic_summary_by_gen = {
+        2: {"submitted_now": 0, "running_or_queuing": 0},
+    }
+    dic_submission_files = cluster_submission.write_sub_files(dic_summary_by_gen)
+    list_of_jobs, l_submission_filenames = dic_submission_files["htc"]
+    assert list_of_jobs == [l_jobs[0], l_jobs[2]]
+    assert dic_summary_by_gen[2]["submitted_now"] == 3
+    with open(l_submission_filenames[0]) as fid:
+        content = fid.read()
+    assert f"{tmp_path}/study/gen_1/a/pack/run.sh" in content
+    assert f"{tmp_path}/study/gen_1/c/run.sh" in content
+
+    # Each job of the pack is tagged individually
+    subprocess.run(["bash", f"{tmp_path}/study/gen_1/a/pack/run.sh"], check=True)
+    assert os.path.exists(f"{tmp_path}/study/gen_1/a/.finished")
+    assert os.path.exists(f"{tmp_path}/study/gen_1/b/.failed")
+
+    # The packed jobs share the id of their pack
+    cluster_submission.submit(list_of_jobs, l_submission_filenames, "htc")
+    assert cluster_submission.dic_id_to_path_job == {
+        400: "study/gen_1/a/pack/",
+        401: "study/gen_1/c/",
+    }
+    assert dic_tree["gen_1"]["b"]["gen_2"]["id_sub"] == 400
+    running_jobs, queuing_jobs = cluster_submission._get_state_jobs(verbose=False)
+    assert not cluster_submission._test_job(l_jobs[1], "study/gen_1/b/", running_jobs, queuing_jobs)
+    clear_queue_cache()
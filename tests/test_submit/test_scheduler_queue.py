@@ -0,0 +1,190 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import os
+
+# Import third-party modules
+import pytest
+
+# Import user-defined modules
+from study_da.submit.cluster_submission import ClusterSubmission
+from study_da.submit.cluster_submission.scheduler_queue import clear_queue_cache, get_queue_state
+
+# ==================================================================================================
+# --- Test the polling of the scheduler queues against fake schedulers
+# ==================================================================================================
+
+CONDOR_OUTPUT = """\
+101 0 2 /afs/user/study/gen_1/a/run.sh
+102 0 1 /afs/user/study/gen_1/b/run.sh
+103 0 5 /afs/user/study/gen_1/c/run.sh
+104 0 1 /afs/user/another/d/run.sh
+104 1 2 /afs/user/another/d/run.sh
+"""
+
+SLURM_OUTPUT = """\
+201 RUNNING /home/user/study/gen_1/a/run.sh
+202 PENDING /home/user/study/gen_1/b/run.sh
+203_1 PENDING /home/user/study/gen_1/c/run.sh
+"""
+
+
+@pytest.fixture
+def fake_schedulers(tmp_path, monkeypatch):
+    # Each fake scheduler prints a canned output and counts its calls
+    for name, output in [("condor_q", CONDOR_OUTPUT), ("squeue", SLURM_OUTPUT)]:
+        path_output = tmp_path / f"{name}.txt"
+        path_output.write_text(output)
+        path_executable = tmp_path / name
+        path_executable.write_text(
+            f"#!/bin/sh\necho x >> {tmp_path}/{name}.calls\ncat {path_output}\n"
+        )
+        path_executable.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    clear_queue_cache()
+    yield tmp_path
+    clear_queue_cache()
+
+
+def count_calls(tmp_path, name):
+    path_calls = tmp_path / f"{name}.calls"
+    return len(path_calls.read_text().splitlines()) if path_calls.exists() else 0
+
+
+def test_get_queue_state(fake_schedulers):
+    dic_condor = get_queue_state("htc")
+    assert {jobid: dic_job["state"] for jobid, dic_job in dic_condor.items()} == {
+        101: "running",
+        102: "queuing",
+        103: "held",
+        104: "running",
+    }
+    dic_slurm = get_queue_state("slurm")
+    assert {jobid: dic_job["state"] for jobid, dic_job in dic_slurm.items()} == {
+        201: "running",
+        202: "queuing",
+        203: "queuing",
+    }
+
+    # The cached state is reused within the TTL
+    get_queue_state("htc")
+    get_queue_state("slurm")
+    assert count_calls(fake_schedulers, "condor_q") == 1
+    assert count_calls(fake_schedulers, "squeue") == 1
+    get_queue_state("htc", ttl=0)
+    assert count_calls(fake_schedulers, "condor_q") == 2
+
+
+@pytest.mark.parametrize("submission_type", ["htc", "slurm"])
+def test_cluster_submission_jobs(fake_schedulers, submission_type):
+    l_jobs = [f"study/gen_1/{folder}/gen_2.py" for folder in ["a", "b", "c"]]
+    dic_all_jobs = {
+        job: {"gen": 2, "l_keys": ["gen_1", job.split("/")[2], "gen_2"]} for job in l_jobs
+    }
+    dic_tree = {
+        "gen_1": {
+            folder: {"gen_2": {"file": job, "submission_type": submission_type}}
+            for folder, job in zip(["a", "b", "c"], l_jobs)
+        }
+    }
+    cluster_submission = ClusterSubmission(
+        "study", l_jobs, dic_all_jobs, dic_tree, "study/submission_file.sub", "/abs"
+    )
+
+    # Without id-job file, the paths can be obtained from the commands of the jobs
+    running_jobs = cluster_submission.querying_jobs(
+        False, submission_type == "htc", submission_type == "slurm", status="running"
+    )
+    assert running_jobs == []
+    func_get_jobs = (
+        cluster_submission._get_condor_jobs
+        if submission_type == "htc"
+        else cluster_submission._get_slurm_jobs
+    )
+    assert func_get_jobs("running", force_query_individually=True) == ["study/gen_1/a/"]
+
+    # With the id-job file
+    offset = 100 if submission_type == "htc" else 200
+    cluster_submission.dic_id_to_path_job = {
+        offset + idx + 1: f"study/gen_1/{folder}/" for idx, folder in enumerate(["a", "b", "c"])
+    }
+    running_jobs, queuing_jobs = cluster_submission._get_state_jobs(verbose=False)
+    assert running_jobs == ["study/gen_1/a/"]
+    assert queuing_jobs == (
+        ["study/gen_1/b/"] if submission_type == "htc" else ["study/gen_1/b/", "study/gen_1/c/"]
+    )
+    assert count_calls(fake_schedulers, "condor_q" if submission_type == "htc" else "squeue") == 1
+
+
+@pytest.mark.parametrize("submission_type", ["htc", "slurm"])
+def test_cluster_submission_array_jobs(fake_schedulers, submission_type):
+    # Fake submission commands, returning the id of the array
+    for name, output in [
+        ("condor_submit", "3 job(s) submitted to cluster 300."),
+        ("sbatch", "Submitted batch job 300"),
+    ]:
+        path_executable = fake_schedulers / name
+        path_executable.write_text(
+            f"#!/bin/sh\necho x >> {fake_schedulers}/{name}.calls\necho '{output}'\n"
+        )
+        path_executable.chmod(0o755)
+
+    l_folders = ["a", "b", "c"]
+    l_jobs = [f"study/gen_1/{folder}/gen_2.py" for folder in l_folders]
+    dic_all_jobs = {
+        job: {"gen": 2, "l_keys": ["gen_1", folder, "gen_2"]}
+        for job, folder in zip(l_jobs, l_folders)
+    }
+    dic_tree = {
+        "gen_1": {
+            folder: {
+                "gen_2": {
+                    "file": job,
+                    "submission_type": submission_type,
+                    "htc_flavor": "espresso",
+                    "status": "to_submit",
+                }
+            }
+            for folder, job in zip(l_folders, l_jobs)
+        }
+    }
+    cluster_submission = ClusterSubmission(
+        "study",
+        l_jobs,
+        dic_all_jobs,
+        dic_tree,
+        f"{fake_schedulers}/submission/submission_file.sub",
+        str(fake_schedulers),
+        array_jobs=True,
+    )
+
+    # A single submission file for the whole generation
+    dic_submission_files = cluster_submission.write_sub_files()
+    list_of_jobs, l_submission_filenames = dic_submission_files[submission_type]
+    assert list_of_jobs == l_jobs
+    assert len(l_submission_filenames) == 1
+    with open(l_submission_filenames[0]) as fid:
+        content = fid.read()
+    for folder in l_folders:
+        assert f"{fake_schedulers}/study/gen_1/{folder}" in content
+    if submission_type == "htc":
+        assert "queue path_job from (" in content
+    else:
+        assert "#SBATCH --array=0-2" in content
+
+    # A single scheduler call, each job being identified by the array id and its index
+    (fake_schedulers / "condor_q.txt").write_text("300 0 2 a/run.sh\n300 1 1 b/run.sh\n300 2 1 c\n")
+    (fake_schedulers / "squeue.txt").write_text("300_0 RUNNING x\n300_[1-2%1] PENDING x\n")
+    cluster_submission.submit(list_of_jobs, l_submission_filenames, submission_type)
+    name_submit = "condor_submit" if submission_type == "htc" else "sbatch"
+    assert count_calls(fake_schedulers, name_submit) == 1
+    assert cluster_submission.dic_id_to_path_job == {
+        f"300.{idx}": f"study/gen_1/{folder}/" for idx, folder in enumerate(l_folders)
+    }
+
+    # The state of each job is followed through its array task
+    running_jobs, queuing_jobs = cluster_submission._get_state_jobs(verbose=False)
+    assert running_jobs == ["study/gen_1/a/"]
+    assert queuing_jobs == ["study/gen_1/b/", "study/gen_1/c/"]
@@ -0,0 +1,57 @@
+# ==================================================================================================
+# --- Imports
+# ==================================================================================================
+
+# Import standard library modules
+import os
+
+# Import third-party modules
+import pytest
+
+# Import user-defined modules
+from study_da.submit.status_scanner import StatusScanner
+
+# ==================================================================================================
+# --- Test the scan of the job folders
+# ==================================================================================================
+
+
+@pytest.mark.parametrize("n_threads", [1, 4])
+def test_status_scanner(tmp_path, n_threads):
+    dic_tags = {
+        "gen_1/a": ".finished",
+        "gen_1/b": ".failed",
+        "gen_1/c": None,
+        "gen_2/d": ".finished",
+    }
+    for folder, tag in dic_tags.items():
+        (tmp_path / "study" / folder).mkdir(parents=True)
+        if tag is not None:
+            (tmp_path / "study" / folder / tag).touch()
+    l_jobs = [f"study/{folder}/job.py" for folder in dic_tags]
+
+    status_scanner = StatusScanner(str(tmp_path), n_threads=n_threads)
+    dic_status = status_scanner.scan(l_jobs)
+    assert dic_status == dict(zip(l_jobs, ["finished", "failed", None, "finished"]))
+
+    # Jobs that are over are not scanned again, until they are forgotten
+    (tmp_path / "study/gen_1/b/.failed").unlink()
+    assert status_scanner.scan(l_jobs) == dic_status
+    status_scanner.forget("study/gen_1/b/job.py")
+    assert status_scanner.scan(l_jobs)["study/gen_1/b/job.py"] is None
+
+
+def test_status_scanner_unmodified_folders(tmp_path):
+    (tmp_path / "study/gen_1/a").mkdir(parents=True)
+    os.utime(tmp_path / "study/gen_1/a", (0, 0))
+    status_scanner = StatusScanner(str(tmp_path))
+    assert status_scanner.scan(["study/gen_1/a/job.py"]) == {"study/gen_1/a/job.py": None}
+
+    # The folder is not listed again if it was not modified since the last scan
+    (tmp_path / "study/gen_1/a/.finished").touch()
+    os.utime(tmp_path / "study/gen_1/a", (0, 0))
+    assert status_scanner.scan(["study/gen_1/a/job.py"]) == {"study/gen_1/a/job.py": None}
+
+    # Writing the tag modifies the folder
+    os.utime(tmp_path / "study/gen_1/a")
+    assert status_scanner.scan(["study/gen_1/a/job.py"]) == {"study/gen_1/a/job.py": "finished"}